@@ -1,10 +1,17 @@
-import re
-from pathlib import Path
+from collections.abc import Iterable
 
-import yaml
+from url_builder import build_url_from_parts, split_english_path
 
 
 class URLBuilder:
+    """Resolve the URLs of English paths once per run.
+
+    The URL of each (english_path, language) pair is resolved once and shared
+    by the matrix and detail exporters. The part of the resolution that does
+    not depend on the language, parsing the path and reading its front matter,
+    is done once per English path.
+    """
+
     def __init__(
         self,
         existing_urls: set[str],
@@ -13,15 +20,62 @@ class URLBuilder:
         """Initialize the URLBuilder with a base URL and a set of existing URLs."""
         self.existing_urls = existing_urls
         self.base_url = base_url
-        self._allowed_extensions = {".html", ".md"}
+        self._parts: dict[str, tuple[str, ...] | None] = {}
+        self._urls: dict[tuple[str, str], str | None] = {}
 
-    def build_url(self, english_path: str, lang: str) -> str | None:
-        """Build URL for a given English path and language."""
-        path = Path(english_path)
-        if not path.is_relative_to(Path("content/en")):
-            return None
+    def build_table(self, english_paths: Iterable[str], languages: list[str]) -> None:
+        """Resolve the URLs of every English path for every language in bulk.
 
-        if path.suffix not in self._allowed_extensions:
-            return None
+        Args:
+        ----
+            english_paths (Iterable[str]): The English paths to resolve.
+            languages (list[str]): The language codes, including "en" for the
+                                   English URLs.
+
+        """
+        for english_path in english_paths:
+            parts = self._get_parts(english_path)
+            for language in languages:
+                key = (english_path, language)
+                if key not in self._urls:
+                    self._urls[key] = self._resolve(english_path, parts, language)
+
+    def build_url(self, english_path: str, language: str) -> str | None:
+        """Build URL for a given English path and language.
 
-        lang_prefix = lang if lang != "en" else ""
+        Args:
+        ----
+            english_path (str): Path to the English markdown file.
+            language (str): Language code (e.g., 'en', 'fr').
+
+        Returns:
+        -------
+            str | None: The same URL as url_builder.build_url.
+
+        """
+        key = (english_path, language)
+        try:
+            return self._urls[key]
+        except KeyError:
+            url = self._resolve(english_path, self._get_parts(english_path), language)
+            self._urls[key] = url
+            return url
+
+    def _get_parts(self, english_path: str) -> tuple[str, ...] | None:
+        """Get the language-independent parts of an English path."""
+        try:
+            return self._parts[english_path]
+        except KeyError:
+            parts = split_english_path(english_path)
+            self._parts[english_path] = parts
+            return parts
+
+    def _resolve(
+        self, english_path: str, parts: tuple[str, ...] | None, language: str
+    ) -> str | None:
+        """Resolve the URL of a pair from the parts of its English path."""
+        if parts is None:
+            return None
+        return build_url_from_parts(
+            english_path, parts, language, self.existing_urls, self.base_url
+        )
@@ -0,0 +1,155 @@
+"""Regression benchmark for exporter.create_matrix_data.
+
+The matrix is built from synthetic results for every language. Page views are
+not read, since the benchmark measures grouping rather than CSV parsing. The
+original implementation, which looked up the category of each article by
+scanning every result, is kept in build_legacy_matrix and compared on a
+smaller result set because it is quadratic.
+
+Run from scripts/python:
+
+    python -m benchmarks.bench_exporter --articles 10000
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from typing import Any
+
+from _url_builder import URLBuilder
+from benchmarks.synthetic import generate_results
+from const import LANGUAGE_CODES
+from exporter import (
+    build_category_name,
+    create_matrix_data,
+    extract_blog_date_from_en_path,
+)
+from page_view import PageView
+from translation_status import TranslationStatusResult
+from url_builder import build_url
+from utils import timestamp_to_datetime
+
+
+def build_legacy_matrix(
+    results: dict[str, TranslationStatusResult], existing_urls: set[str]
+) -> dict[str, dict[str, Any]]:
+    """Build the matrix articles the way create_matrix_data originally did.
+
+    Args:
+    ----
+        results (dict[str, TranslationStatusResult]): The results to group.
+        existing_urls (set[str]): The URLs that exist on the site.
+
+    Returns:
+    -------
+        dict[str, dict[str, Any]]: The articles grouped by category.
+
+    """
+    matrix_data = defaultdict(lambda: {"articles": []})
+    articles_by_english_path = defaultdict(dict)
+
+    for result in results.values():
+        english_path = result["english_path"]
+        language = result["language"]
+        build_url(english_path, "en", existing_urls)
+        translation_url = build_url(english_path, language, existing_urls)
+        page_view = PageView(views=0, new_users=0, average_session_duration=0.0)
+        articles_by_english_path[english_path][language] = {
+            "status": result["status"],
+            "severity": result["severity"],
+            "days_behind": result["days_behind"],
+            "commits_behind": result["commits_behind"],
+            "total_change_lines": result["total_change_lines"],
+            "target_latest_date": timestamp_to_datetime(result["target_latest_date"]),
+            "english_latest_date": timestamp_to_datetime(result["english_latest_date"]),
+            "translation_url": translation_url,
+            "views": page_view.views,
+            "new_users": page_view.new_users,
+            "average_session_duration": page_view.average_session_duration,
+            "issues": [],
+            "prs": [],
+        }
+
+    for english_path, translations in articles_by_english_path.items():
+        original_category = next(
+            result["category"]
+            for result in results.values()
+            if result["english_path"] == english_path
+        )
+        category_name = build_category_name(original_category, english_path)
+        matrix_data[category_name]["articles"].append(
+            {
+                "english_path": english_path,
+                "english_url": build_url(english_path, "en", existing_urls),
+                "translations": translations,
+            }
+        )
+
+    for category, data in matrix_data.items():
+        if category == "blog":
+            data["articles"].sort(
+                key=lambda x: extract_blog_date_from_en_path(x["english_path"]),
+                reverse=True,
+            )
+
+    return dict(matrix_data)
+
+
+def time_matrix(
+    results: dict[str, TranslationStatusResult],
+) -> tuple[float, dict[str, dict[str, Any]]]:
+    """Time create_matrix_data without page views, issues or pull requests."""
+    started_at = time.perf_counter()
+    matrix_data = create_matrix_data(results, {}, {}, URLBuilder(set()), {})
+    return time.perf_counter() - started_at, matrix_data
+
+
+def main() -> None:
+    """Time the matrix building and compare it with the original."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--legacy-articles", type=int, default=1_000)
+    args = parser.parse_args()
+
+    results = generate_results(args.articles)
+    seconds, matrix_data = time_matrix(results)
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "articles": args.articles,
+                "languages": len(LANGUAGE_CODES),
+                "results": len(results),
+                "categories": len(matrix_data),
+                "seconds": round(seconds, 3),
+            }
+        )
+    )
+
+    small_results = generate_results(args.legacy_articles)
+    seconds, matrix_data = time_matrix(small_results)
+    started_at = time.perf_counter()
+    legacy_matrix = build_legacy_matrix(small_results, set())
+    legacy_seconds = time.perf_counter() - started_at
+
+    # 記事の並びと内容が元の実装と一致することを確かめる
+    for category, data in legacy_matrix.items():
+        if data["articles"] != matrix_data[category]["articles"]:
+            msg = f"The articles of {category} differ from the original"
+            raise AssertionError(msg)
+
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "articles": args.legacy_articles,
+                "results": len(small_results),
+                "seconds": round(seconds, 3),
+                "legacy_seconds": round(legacy_seconds, 3),
+                "speedup": round(legacy_seconds / seconds, 1),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
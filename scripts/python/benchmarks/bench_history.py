@@ -0,0 +1,143 @@
+"""Compare GitFileHistoryTracker construction with the original algorithm.
+
+The original construction sorted every commit by date, walked them twice to
+collect renames and revisions, searched each file for its oldest revision and
+swept every file again to mark deletions. LegacyTracker reproduces those
+passes on top of the current Commit and FileRevision rows, so that only the
+construction algorithm differs between the two timings.
+
+Run from scripts/python:
+
+    python -m benchmarks.bench_history --commits 200000
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable, Iterable
+
+from benchmarks.synthetic import generate_commits, generate_english_paths
+from history import (
+    Commit,
+    FileRevision,
+    GitFileHistoryTracker,
+    RenameEvent,
+    parse_git_date,
+)
+from models import GitCommitDict, GitCommitRecordDict
+
+
+class LegacyTracker(GitFileHistoryTracker):
+    """A GitFileHistoryTracker built with the original multi-pass algorithm."""
+
+    def _build_from_commits(self, commits: Iterable[GitCommitRecordDict]) -> set[str]:
+        sorted_commits = sorted(
+            ((parse_git_date(commit["date"]), commit) for commit in commits),
+            key=lambda x: x[0],
+        )
+
+        # Pass 1: リネームイベントを時系列で収集
+        rename_events = [
+            RenameEvent(
+                commit["hash"], timestamp, file_change["old_path"], file_change["path"]
+            )
+            for timestamp, commit in sorted_commits
+            for file_change in commit.get("files", [])
+            if "old_path" in file_change
+        ]
+
+        # Pass 2: ファイル変更履歴を構築
+        for timestamp, commit in sorted_commits:
+            commit_row = Commit(
+                commit["hash"], timestamp, commit["author"], commit["message"]
+            )
+            for file_change in commit.get("files", []):
+                old_path = file_change.get("old_path")
+                self.file_changes[file_change["path"]].append(
+                    FileRevision(
+                        commit_row,
+                        file_change["path"],
+                        file_change["insertions"],
+                        file_change["deletions"],
+                        "renamed" if old_path else "modified",
+                        old_path,
+                    )
+                )
+
+        # Pass 3: 各ファイルの最古のコミットをaddedに変更
+        for entries in self.file_changes.values():
+            oldest_entry = min(entries, key=lambda x: x.date)
+            if oldest_entry.operation == "modified":
+                oldest_entry.operation = "added"
+
+        # 削除判定
+        for path, entries in self.file_changes.items():
+            if path not in self.current_files:
+                for entry in entries:
+                    if entry.operation == "modified":
+                        entry.operation = "deleted"
+
+        self._add_rename_events(rename_events)
+        return set(self.file_changes)
+
+
+def build_legacy(commits: list[GitCommitDict], current_files: set[str]) -> None:
+    """Build a LegacyTracker from the commits."""
+    LegacyTracker(commits, current_files)
+
+
+def build_tracker(commits: list[GitCommitDict], current_files: set[str]) -> None:
+    """Build a GitFileHistoryTracker from the commits."""
+    GitFileHistoryTracker(commits, current_files)
+
+
+def best_of(
+    builder: Callable[[list[GitCommitDict], set[str]], None],
+    commits: list[GitCommitDict],
+    current_files: set[str],
+    repeat: int,
+) -> float:
+    """Return the fastest of several construction times in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        builder(commits, current_files)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def main() -> None:
+    """Time both constructions on git log order and date order input."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=200_000)
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    english_paths = generate_english_paths(args.files)
+    # git log の順序 (新しい順)
+    commits = list(generate_commits(args.commits, english_paths))
+    current_files = {
+        file_change["path"] for commit in commits for file_change in commit["files"]
+    }
+    # 一部のファイルは削除済みとして扱う
+    current_files = set(sorted(current_files)[::10]) ^ current_files
+
+    for order, records in (("git log", commits), ("date", commits[::-1])):
+        legacy = best_of(build_legacy, records, current_files, args.repeat)
+        tracker = best_of(build_tracker, records, current_files, args.repeat)
+        print(  # noqa: T201
+            json.dumps(
+                {
+                    "order": order,
+                    "commits": args.commits,
+                    "legacy_seconds": round(legacy, 3),
+                    "tracker_seconds": round(tracker, 3),
+                    "speedup": round(legacy / tracker, 2),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
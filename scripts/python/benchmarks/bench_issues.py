@@ -0,0 +1,208 @@
+"""Benchmark matching issue titles to existing paths.
+
+Originally, issue.guess_path generated hundreds of candidate paths per issue
+from common prefixes, suffixes and shortened tails, and probed them in set
+order. The benchmark times that against issue.PathIndex on the same synthetic
+issues, checks that every issue matched originally is still matched, and
+reports how often both pick the same path.
+
+Run from scripts/python:
+
+    python -m benchmarks.bench_issues --issues 1000 --files 2000
+"""
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import (
+    generate_english_paths,
+    generate_existing_paths,
+    generate_issues,
+)
+from issue import (
+    LANGUAGE_ABBR_IN_TITLE,
+    GitHubIssue,
+    PathIndex,
+    extract_path_like_string,
+    guess_language,
+    guess_path,
+)
+
+
+def gen_legacy_path_candidates(path: str, language: str) -> list[str]:  # noqa: C901, PLR0915
+    """Generate the path candidates the way issue.gen_path_candidates did."""
+    path = path.strip().lower()
+
+    language_pattern = (
+        r"\b(" + "|".join(re.escape(lang) for lang in LANGUAGE_ABBR_IN_TITLE) + r")\b"
+    )
+    path = re.sub(language_pattern, language, path)
+
+    if path.startswith("k8s.io/"):
+        path = path.lstrip("k8s.io/")
+
+    hyphenated_parts = []
+    for part in path.split("/"):
+        if not part:
+            continue
+        if part.startswith("_"):
+            hyphenated_parts.append(part)
+        else:
+            hyphenated_parts.append(part.replace("_", "-"))
+    hyphenated_path = "/".join(hyphenated_parts)
+
+    common_path_prefixes = [
+        "",
+        "content/",
+        f"content/{language}/",
+        f"content/{language}/docs/",
+        f"content/{language}/docs/concepts/",
+        f"content/{language}/docs/contribute/",
+        f"content/{language}/docs/doc-contributor-tools/",
+        f"content/{language}/docs/home/",
+        f"content/{language}/docs/images/",
+        f"content/{language}/docs/reference/",
+        f"content/{language}/docs/setup/",
+        f"content/{language}/docs/tasks/",
+        f"content/{language}/docs/tutorials/",
+        f"content/{language}/blog/",
+        f"content/{language}/blog/_posts/",
+        f"content/{language}/careers/",
+        f"content/{language}/case-studies/",
+        f"content/{language}/community/",
+        f"content/{language}/examples/",
+        f"content/{language}/includes/",
+        f"content/{language}/partners/",
+        f"content/{language}/releases/",
+        f"content/{language}/training/",
+    ]
+
+    candidates = set()
+
+    # prefix + path
+    for prefix in common_path_prefixes:
+        base = str(Path(prefix).joinpath(path))
+        candidates.add(base)
+        if not base.endswith((".md", ".html")):
+            candidates.add(base + ".md")
+            candidates.add(base + "/index.md")
+            candidates.add(base + "/_index.md")
+            candidates.add(base + ".html")
+            candidates.add(base + "/index.html")
+            candidates.add(base + "/_index.html")
+
+        base2 = str(Path(prefix).joinpath(hyphenated_path))
+        candidates.add(base2)
+        if not base2.endswith((".md", ".html")):
+            candidates.add(base2 + ".md")
+            candidates.add(base2 + "/index.md")
+            candidates.add(base2 + "/_index.md")
+            candidates.add(base2 + ".html")
+            candidates.add(base2 + "/index.html")
+            candidates.add(base2 + "/_index.html")
+
+    # shorten path
+    parts = path.split("/")
+    for i in range(1, len(parts)):
+        base = "/".join(parts[i:])
+        candidates.add(base)
+        if not base.endswith((".md", ".html")):
+            candidates.add(base + ".md")
+            candidates.add(base + "/index.md")
+            candidates.add(base + "/_index.md")
+            candidates.add(base + ".html")
+            candidates.add(base + "/index.html")
+            candidates.add(base + "/_index.html")
+
+    parts2 = hyphenated_path.split("/")
+    for i in range(1, len(parts2)):
+        base = "/".join(parts2[i:])
+        candidates.add(base)
+        if not base.endswith((".md", ".html")):
+            candidates.add(base + ".md")
+            candidates.add(base + "/index.md")
+            candidates.add(base + "/_index.md")
+            candidates.add(base + ".html")
+            candidates.add(base + "/index.html")
+            candidates.add(base + "/_index.html")
+
+    return list(candidates)
+
+
+def guess_legacy_path(
+    github_issue: GitHubIssue, language: str, all_paths: set[str]
+) -> str | None:
+    """Guess the path by probing the generated candidates."""
+    path_like_string = extract_path_like_string(github_issue.title)
+
+    if not path_like_string:
+        return None
+
+    for candidate in gen_legacy_path_candidates(path_like_string, language):
+        if candidate in all_paths:
+            return candidate
+    return None
+
+
+def main() -> None:
+    """Time the candidate and indexed matching and compare their results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=1_000)
+    parser.add_argument("--files", type=int, default=2_000)
+    args = parser.parse_args()
+
+    english_paths = generate_english_paths(args.files)
+    existing_paths = generate_existing_paths(english_paths)
+    issues = [
+        (github_issue, language)
+        for github_issue in generate_issues(args.issues, english_paths)
+        if (language := guess_language(github_issue))
+    ]
+
+    started_at = time.perf_counter()
+    all_paths = {
+        path.replace("content/en/", f"content/{lang}/")
+        for lang in LANGUAGE_ABBR_IN_TITLE
+        for path in existing_paths
+    }
+    expected = [guess_legacy_path(*args, all_paths) for args in issues]
+    legacy_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    path_index = PathIndex(existing_paths)
+    index_seconds = time.perf_counter() - started_at
+    guessed = [guess_path(*args, path_index) for args in issues]
+    seconds = time.perf_counter() - started_at
+
+    for (github_issue, _), legacy_path, path in zip(
+        issues, expected, guessed, strict=True
+    ):
+        if legacy_path is not None and path is None:
+            msg = f"Issue #{github_issue.number} is no longer matched"
+            raise AssertionError(msg)
+
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "issues": args.issues,
+                "existing_paths": len(existing_paths),
+                "legacy_matched": sum(path is not None for path in expected),
+                "matched": sum(path is not None for path in guessed),
+                "same_path": sum(
+                    legacy_path is not None and legacy_path == path
+                    for legacy_path, path in zip(expected, guessed, strict=True)
+                ),
+                "legacy_seconds": round(legacy_seconds, 3),
+                "index_seconds": round(index_seconds, 3),
+                "seconds": round(seconds, 3),
+                "speedup": round(legacy_seconds / seconds, 1),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compare list-based and streaming construction of GitFileHistoryTracker.
+
+Run from scripts/python:
+
+    python -m benchmarks.bench_loader --commits 1000000
+
+Each mode runs in its own process so that peak RSS is measured separately.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import main as pipeline
+from benchmarks.synthetic import write_git_history
+from history import GitFileHistoryTracker
+from main import iter_json_records, load_json_records
+from utils import get_peak_rss_mib
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent / ".data"
+MODES = ("list", "stream")
+
+
+def run_mode(mode: str, filepath: Path) -> dict[str, float | str]:
+    """Build a tracker from the file and measure time and peak memory.
+
+    Args:
+    ----
+        mode (str): "list" to load every record first, "stream" to feed the
+                    tracker from the generator.
+        filepath (Path): The synthetic git_history.jsonl file.
+
+    Returns:
+    -------
+        dict[str, float | str]: The measurements.
+
+    """
+    started_at = time.perf_counter()
+    if mode == "list":
+        records = load_json_records(filepath)
+        loaded_at = time.perf_counter()
+        GitFileHistoryTracker(records, current_files=set())
+    else:
+        loaded_at = started_at
+        GitFileHistoryTracker(iter_json_records(filepath), current_files=set())
+    finished_at = time.perf_counter()
+
+    return {
+        "mode": mode,
+        "decoder": (
+            "msgspec" if pipeline.msgspec else "orjson" if pipeline.orjson else "json"
+        ),
+        "load_seconds": round(loaded_at - started_at, 3),
+        "total_seconds": round(finished_at - started_at, 3),
+        "peak_rss_mib": round(get_peak_rss_mib(), 1),
+    }
+
+
+def main() -> None:
+    """Generate the input if needed and compare the loading modes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=1_000_000)
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    filepath = args.data_dir / f"git_history_{args.commits}_{args.files}.jsonl"
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, filepath)))  # noqa: T201
+        return
+
+    if not filepath.exists():
+        print(f"Generating {filepath} ...")  # noqa: T201
+        write_git_history(filepath, args.commits, args.files)
+
+    for mode in MODES:
+        completed = subprocess.run(  # noqa: S603
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_loader",
+                "--commits",
+                str(args.commits),
+                "--files",
+                str(args.files),
+                "--data-dir",
+                str(args.data_dir),
+                "--mode",
+                mode,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        print(completed.stdout.strip().splitlines()[-1])  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Time every stage of a pipeline run on a synthetic kubernetes/website.
+
+benchmarks.synthetic.write_site writes the inputs at the requested scale:
+git_history.jsonl with renames and bulk localization commits, all_files.csv,
+the English content files with their front matter, the sitemaps and the
+page view exports. The stages then run in the order of main.main, each
+timed on its own, with the network replaced by local stand-ins: the
+sitemaps are served by benchmarks.sitemap_server and the pull requests by
+benchmarks.github_stand_in. The issues are generated in process.
+
+The peak RSS is recorded after every stage. The results are written as JSON,
+and a previous results file can be passed with --baseline to print the
+ratio of each stage.
+
+Run from scripts/python:
+
+    python -m benchmarks.bench_pipeline --files 5000 --commits 100000 \
+        --output bench_pipeline.json
+"""
+
+import argparse
+import json
+import platform
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+import url_builder
+from _url_builder import URLBuilder
+from benchmarks.github_stand_in import GraphQLStandIn
+from benchmarks.sitemap_server import serve_sitemaps
+from benchmarks.synthetic import generate_issues, generate_pull_requests, write_site
+from const import LANGUAGE_CODES
+from exporter import process_translation_results
+from history import GitFileHistoryTracker
+from issue import group_issues_by_file
+from main import load_json_records
+from page_view import summarize_view
+from publish import staged_output
+from pull_requests import fetch_pull_requests, group_prs_by_file
+from sitemap import load_sitemap_urls
+from translation_status import TranslationStatusTracker
+from utils import get_peak_rss_mib
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """Run stages one at a time and record their timings and peak RSS."""
+
+    def __init__(self) -> None:
+        """Start with no stages."""
+        self.stages: dict[str, dict[str, float]] = {}
+
+    def run(self, name: str, func: Callable[[], T]) -> T:
+        """Run a stage and record it under name."""
+        started_at = time.perf_counter()
+        result = func()
+        self.stages[name] = {
+            "seconds": round(time.perf_counter() - started_at, 3),
+            "peak_rss_mib": round(get_peak_rss_mib(), 1),
+        }
+        print(f"{name}: {self.stages[name]['seconds']:.3f} s")  # noqa: T201
+        return result
+
+
+def run_pipeline(args: argparse.Namespace, root_dir: Path) -> dict[str, Any]:
+    """Generate the inputs and run the stages on them.
+
+    Args:
+    ----
+        args (argparse.Namespace): The parsed command line.
+        root_dir (Path): A scratch directory for the inputs and the output.
+
+    Returns:
+    -------
+        dict[str, Any]: The parameters, stage timings and output size.
+
+    """
+    timer = StageTimer()
+    site = timer.run(
+        "generate_inputs",
+        lambda: write_site(
+            root_dir,
+            args.files,
+            args.commits,
+            args.page_view_rows,
+            n_page_view_files=args.page_view_files,
+        ),
+    )
+    # URL の組み立てが読むフロントマターを生成したサイトに向ける
+    url_builder.FRONT_MATTER_INDEX = url_builder.FrontMatterIndex(site.site_dir)
+
+    existing_paths = set(site.all_files_file.read_text(encoding="utf-8").split())
+
+    with serve_sitemaps(site.sitemaps, args.latency) as server:
+        existing_urls = timer.run(
+            "load_sitemap_urls",
+            lambda: load_sitemap_urls(
+                LANGUAGE_CODES, root_dir / "sitemaps", base_url=server.base_url
+            ),
+        )
+
+    transport = GraphQLStandIn(
+        generate_pull_requests(args.pull_requests, site.english_paths),
+        args.latency,
+    )
+    issues = generate_issues(args.issues, site.english_paths)
+    issues_by_file, prs_by_file = timer.run(
+        "github_mappings",
+        lambda: (
+            group_issues_by_file(issues, existing_paths),
+            group_prs_by_file(fetch_pull_requests(transport)),
+        ),
+    )
+
+    page_views = timer.run(
+        "summarize_view",
+        lambda: summarize_view(site.page_view_files, existing_urls),
+    )
+
+    records = timer.run(
+        "load_json_records", lambda: load_json_records(site.history_file)
+    )
+    history_tracker = timer.run(
+        "build_history", lambda: GitFileHistoryTracker(records, existing_paths)
+    )
+
+    results = timer.run(
+        "analyze",
+        lambda: TranslationStatusTracker(history_tracker, existing_paths).analyze(
+            workers=args.workers
+        ),
+    )
+
+    builder = URLBuilder(existing_urls)
+    timer.run(
+        "build_urls",
+        lambda: builder.build_table(
+            dict.fromkeys(result["english_path"] for result in results.values()),
+            ["en", *LANGUAGE_CODES],
+        ),
+    )
+
+    output_dir = root_dir / "output"
+
+    def export() -> None:
+        with staged_output(output_dir) as staging_dir:
+            process_translation_results(
+                results,
+                existing_urls,
+                issues_by_file,
+                prs_by_file,
+                page_views,
+                output_dir=staging_dir,
+                compact=args.compact,
+                commit_table=args.commit_table,
+                matrix_shard_size=args.matrix_shard_size,
+            )
+
+    timer.run("process_translation_results", export)
+
+    return {
+        "parameters": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in {"output", "baseline"}
+        },
+        "python": platform.python_version(),
+        "counts": {
+            "english_files": len(site.english_paths),
+            "existing_paths": len(existing_paths),
+            "existing_urls": len(existing_urls),
+            "results": len(results),
+        },
+        "stages": timer.stages,
+        "total_seconds": round(
+            sum(
+                stage["seconds"]
+                for name, stage in timer.stages.items()
+                if name != "generate_inputs"
+            ),
+            3,
+        ),
+        "output_bytes": sum(
+            path.stat().st_size for path in output_dir.rglob("*") if path.is_file()
+        ),
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any]) -> None:
+    """Print the time of each stage relative to a previous run."""
+    for name, stage in report["stages"].items():
+        previous = baseline["stages"].get(name)
+        if previous and previous["seconds"]:
+            ratio = stage["seconds"] / previous["seconds"]
+            print(  # noqa: T201
+                f"{name}: {previous['seconds']:.3f} s -> {stage['seconds']:.3f} s "
+                f"({ratio:.2f}x)"
+            )
+
+
+def main() -> None:
+    """Run the pipeline benchmark and save the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2_000)
+    parser.add_argument("--commits", type=int, default=50_000)
+    parser.add_argument("--page-view-rows", type=int, default=200_000)
+    parser.add_argument("--page-view-files", type=int, default=1)
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--pull-requests", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--commit-table", action="store_true")
+    parser.add_argument("--matrix-shard-size", type=int, default=None)
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="a previous results file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run_pipeline(args, Path(tmp))
+
+    print(json.dumps(report, indent=2))  # noqa: T201
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.baseline:
+        compare(report, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
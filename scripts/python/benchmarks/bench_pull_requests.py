@@ -0,0 +1,74 @@
+"""Benchmark fetching pull requests against the GraphQL stand-in.
+
+The pull requests are generated and served by benchmarks.github_stand_in with
+a fixed latency per request. The benchmark checks that the fetched pull
+requests are exactly the localization pull requests with a signed CLA, and
+compares the number of requests with the REST calls the original PyGithub
+loop made: a list page per 30 pull requests, and for every open pull request
+a totalCount call, a call for the commit count and a page per 30 files.
+
+Run from scripts/python:
+
+    python -m benchmarks.bench_pull_requests --pull-requests 600 --latency 0.05
+"""
+
+import argparse
+import json
+import math
+import time
+
+from benchmarks.github_stand_in import GraphQLStandIn
+from benchmarks.synthetic import generate_english_paths, generate_pull_requests
+from pull_requests import LOCALIZATION_LABELS, fetch_pull_requests
+
+REST_PAGE_SIZE = 30
+
+
+def main() -> None:
+    """Fetch the pull requests and report the requests made."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pull-requests", type=int, default=600)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    recorded = generate_pull_requests(args.pull_requests, generate_english_paths(2000))
+    transport = GraphQLStandIn(recorded, args.latency)
+
+    started_at = time.perf_counter()
+    pull_requests = fetch_pull_requests(transport)
+    seconds = time.perf_counter() - started_at
+
+    expected = [
+        pr["number"]
+        for pr in sorted(recorded, key=lambda pr: pr["number"], reverse=True)
+        if set(LOCALIZATION_LABELS) <= set(pr["labels"])
+    ]
+    if [pr.number for pr in pull_requests] != expected:
+        msg = "The fetched pull requests differ from the recorded ones"
+        raise AssertionError(msg)
+    recorded_files = {pr["number"]: pr["files"] for pr in recorded}
+    for pr in pull_requests:
+        if pr.files != recorded_files[pr.number]:
+            msg = f"The files of #{pr.number} differ from the recorded ones"
+            raise AssertionError(msg)
+
+    rest_calls = math.ceil(len(recorded) / REST_PAGE_SIZE) + sum(
+        2 + math.ceil(len(pr["files"]) / REST_PAGE_SIZE) for pr in recorded
+    )
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "open_pull_requests": len(recorded),
+                "localization_pull_requests": len(pull_requests),
+                "graphql_requests": transport.requests,
+                "estimated_rest_calls": rest_calls,
+                "latency": args.latency,
+                "seconds": round(seconds, 3),
+                "estimated_rest_seconds": round(rest_calls * args.latency, 3),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
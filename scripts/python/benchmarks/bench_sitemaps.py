@@ -0,0 +1,84 @@
+"""Benchmark sitemap loading against a local stand-in server.
+
+Three runs are timed on the same fixture sitemaps: the original sequential
+fetch and parse, a cold concurrent fetch with an empty cache, and a warm
+concurrent fetch in which every sitemap is answered with 304 Not Modified.
+
+Run from scripts/python:
+
+    python -m benchmarks.bench_sitemaps --pages 2000 --latency 0.2
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import requests
+from benchmarks.sitemap_server import generate_sitemaps, serve_sitemaps
+from const import LANGUAGE_CODES
+from sitemap import load_sitemap_urls
+
+
+def load_sequentially(languages: list[str], base_url: str) -> set[str]:
+    """Load the sitemaps the way main.load_existing_urls originally did."""
+    urls: set[str] = set()
+    for lang in languages:
+        response = requests.get(f"{base_url}/{lang}/sitemap.xml", timeout=10)
+        response.raise_for_status()
+        root = ET.fromstring(response.content)  # noqa: S314
+        for loc in root.findall(".//{http://www.sitemaps.org/schemas/sitemap/0.9}loc"):
+            if loc.text:
+                urls.add(loc.text.strip())
+    return urls
+
+
+def main() -> None:
+    """Time sequential, cold concurrent and warm concurrent loading."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2_000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    languages = list(LANGUAGE_CODES)
+    sitemaps = generate_sitemaps(languages, args.pages)
+
+    with (
+        serve_sitemaps(sitemaps, args.latency) as server,
+        tempfile.TemporaryDirectory() as cache_dir,
+    ):
+        started_at = time.perf_counter()
+        expected = load_sequentially(languages, server.base_url)
+        sequential_seconds = time.perf_counter() - started_at
+
+        timings: dict[str, float] = {}
+        for run in ("cold", "warm"):
+            started_at = time.perf_counter()
+            urls = load_sitemap_urls(
+                languages, Path(cache_dir), server.base_url, args.workers
+            )
+            timings[run] = time.perf_counter() - started_at
+            if urls != expected:
+                msg = f"The {run} URLs differ from the sequential URLs"
+                raise AssertionError(msg)
+
+        print(  # noqa: T201
+            json.dumps(
+                {
+                    "sitemaps": len(languages),
+                    "urls": len(expected),
+                    "latency": args.latency,
+                    "sequential_seconds": round(sequential_seconds, 3),
+                    "cold_seconds": round(timings["cold"], 3),
+                    "warm_seconds": round(timings["warm"], 3),
+                    "not_modified": server.requests_by_status.get(304, 0),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare the pair-by-pair and NumPy batch paths of TranslationStatusTracker.
+
+The histories are looked up once before timing, so the timings cover the
+per-pair computation that the batch path replaces: commits behind, changed
+lines, days_behind and severity.
+
+Run from scripts/python:
+
+    python -m benchmarks.bench_status --commits 200000 --files 5000
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.synthetic import generate_commits, generate_english_paths
+from history import GitFileHistoryTracker
+from translation_status import TranslationStatusTracker
+
+
+def main() -> None:
+    """Time both paths on the same synthetic history."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=200_000)
+    parser.add_argument("--files", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    english_paths = generate_english_paths(args.files)
+    commits = list(generate_commits(args.commits, english_paths))
+    current_files = {
+        file_change["path"] for commit in commits for file_change in commit["files"]
+    } | set(english_paths)
+
+    tracker = TranslationStatusTracker(
+        GitFileHistoryTracker(commits, current_files), current_files
+    )
+    # 履歴のキャッシュを作ってから計測する
+    expected = tracker.analyze(vectorized=False)
+
+    timings: dict[str, float] = {}
+    for vectorized in (False, True):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started_at = time.perf_counter()
+            results = tracker.analyze(vectorized=vectorized)
+            best = min(best, time.perf_counter() - started_at)
+        if results != expected:
+            msg = "The batch results differ from the pair-by-pair results"
+            raise AssertionError(msg)
+        timings["batch" if vectorized else "pairwise"] = best
+
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "pairs": len(expected),
+                "commits": args.commits,
+                "pairwise_seconds": round(timings["pairwise"], 3),
+                "batch_seconds": round(timings["batch"], 3),
+                "speedup": round(timings["pairwise"] / timings["batch"], 2),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""An in-process stand-in for the GitHub GraphQL API.
+
+GraphQLStandIn is a pull_requests.GraphQLTransport that answers the queries of
+pull_requests.fetch_pull_requests from recorded pull requests instead of the
+network. It paginates with opaque cursors, filters the search by the label:
+qualifiers of the query like GitHub does, and counts the requests it serves.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+from pull_requests import PULL_REQUEST_FILES_QUERY, PULL_REQUESTS_QUERY
+
+LABEL_PATTERN = re.compile(r'label:"([^"]+)"')
+
+
+class GraphQLStandIn:
+    """Serve recorded pull requests through the GraphQL queries.
+
+    Each recorded pull request is a dict with number, title, url, labels,
+    commits and files.
+    """
+
+    def __init__(
+        self, pull_requests: list[dict[str, Any]], latency: float = 0.0
+    ) -> None:
+        """Serve the pull requests, newest first."""
+        self.pull_requests = sorted(
+            pull_requests, key=lambda pr: pr["number"], reverse=True
+        )
+        self.latency = latency
+        self.requests = 0
+
+    @classmethod
+    def from_file(cls, filepath: Path, latency: float = 0.0) -> "GraphQLStandIn":
+        """Load recorded pull requests from a JSON file."""
+        return cls(json.loads(filepath.read_text(encoding="utf-8")), latency)
+
+    def __call__(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Answer a query the way api.github.com would."""
+        self.requests += 1
+        time.sleep(self.latency)
+
+        if query == PULL_REQUESTS_QUERY:
+            return self._search(variables)
+        if query == PULL_REQUEST_FILES_QUERY:
+            return self._files(variables)
+        msg = "Unknown query"
+        raise ValueError(msg)
+
+    def _search(self, variables: dict[str, Any]) -> dict[str, Any]:
+        labels = set(LABEL_PATTERN.findall(variables["query"]))
+        matched = [pr for pr in self.pull_requests if labels <= set(pr["labels"])]
+        nodes, page_info = _page(matched, variables["first"], variables["after"])
+        return {
+            "search": {
+                "pageInfo": page_info,
+                "nodes": [
+                    {
+                        "number": pr["number"],
+                        "title": pr["title"],
+                        "url": pr["url"],
+                        "changedFiles": len(pr["files"]),
+                        "commits": {"totalCount": pr["commits"]},
+                        "files": _files_connection(pr, variables["files"], None),
+                    }
+                    for pr in nodes
+                ],
+            }
+        }
+
+    def _files(self, variables: dict[str, Any]) -> dict[str, Any]:
+        pr = next(
+            pr for pr in self.pull_requests if pr["number"] == variables["number"]
+        )
+        return {
+            "repository": {
+                "pullRequest": {
+                    "files": _files_connection(
+                        pr, variables["first"], variables["after"]
+                    )
+                }
+            }
+        }
+
+
+def _page(
+    items: list[Any], first: int, after: str | None
+) -> tuple[list[Any], dict[str, Any]]:
+    """Slice a page of items after an opaque cursor."""
+    start = int(after) if after else 0
+    end = start + first
+    return items[start:end], {
+        "hasNextPage": end < len(items),
+        "endCursor": str(min(end, len(items))),
+    }
+
+
+def _files_connection(
+    pr: dict[str, Any], first: int, after: str | None
+) -> dict[str, Any]:
+    """Build a page of the files connection of a pull request."""
+    files, page_info = _page(pr["files"], first, after)
+    return {"pageInfo": page_info, "nodes": [{"path": path} for path in files]}
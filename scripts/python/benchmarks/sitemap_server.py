@@ -0,0 +1,125 @@
+"""A local HTTP stand-in for the kubernetes.io sitemaps.
+
+Each language is served at /{lang}/sitemap.xml with a fixed ETag and
+Last-Modified, after a configurable latency. Conditional requests whose
+validators match are answered with 304 Not Modified.
+"""
+
+import hashlib
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SITEMAP_TEMPLATE = (
+    '<?xml version="1.0" encoding="utf-8" standalone="yes"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n{entries}</urlset>\n'
+)
+ENTRY_TEMPLATE = (
+    "  <url>\n"
+    "    <loc>{url}</loc>\n"
+    "    <lastmod>2025-01-01T00:00:00+00:00</lastmod>\n"
+    '    <xhtml:link rel="alternate" hreflang="en" href="{url}"/>\n'
+    "  </url>\n"
+)
+
+
+def build_sitemap(urls: Iterable[str]) -> bytes:
+    """Build a sitemap.xml body listing the given URLs."""
+    entries = "".join(ENTRY_TEMPLATE.format(url=url) for url in urls)
+    return SITEMAP_TEMPLATE.format(entries=entries).encode()
+
+
+def generate_sitemaps(
+    languages: Iterable[str], n_pages: int, base_url: str = "https://kubernetes.io"
+) -> dict[str, bytes]:
+    """Generate a sitemap with n_pages URLs for every language."""
+    return {
+        lang: build_sitemap(
+            f"{base_url}/{lang}/docs/page-{i:05d}/" for i in range(n_pages)
+        )
+        for lang in languages
+    }
+
+
+class SitemapServer(ThreadingHTTPServer):
+    """Serve fixture sitemaps with latency and conditional-GET support."""
+
+    daemon_threads = True
+
+    def __init__(self, sitemaps: dict[str, bytes], latency: float = 0.0) -> None:
+        """Listen on a free local port."""
+        super().__init__(("127.0.0.1", 0), SitemapHandler)
+        self.sitemaps = sitemaps
+        self.latency = latency
+        self.last_modified = formatdate(usegmt=True)
+        self.requests_by_status: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """The URL to pass as base_url to sitemap.load_sitemap_urls."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, status: int) -> None:
+        """Count a response by status code."""
+        with self._lock:
+            self.requests_by_status[status] = self.requests_by_status.get(status, 0) + 1
+
+
+class SitemapHandler(BaseHTTPRequestHandler):
+    """Answer GET /{lang}/sitemap.xml."""
+
+    server: SitemapServer
+
+    def do_GET(self) -> None:
+        """Send the sitemap, or 304 if the client's copy is current."""
+        time.sleep(self.server.latency)
+
+        lang, _, name = self.path.strip("/").partition("/")
+        body = self.server.sitemaps.get(lang)
+        if body is None or name != "sitemap.xml":
+            self.server.count(HTTPStatus.NOT_FOUND)
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.count(HTTPStatus.NOT_MODIFIED)
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.server.count(HTTPStatus.OK)
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.server.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Keep the benchmark output quiet."""
+
+
+@contextmanager
+def serve_sitemaps(
+    sitemaps: dict[str, bytes], latency: float = 0.0
+) -> Iterator[SitemapServer]:
+    """Run a SitemapServer in a background thread."""
+    server = SitemapServer(sitemaps, latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
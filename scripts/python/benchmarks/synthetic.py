@@ -0,0 +1,527 @@
+import csv
+import json
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmarks.sitemap_server import build_sitemap
+from const import LANGUAGE_CODES
+from issue import LANGUAGE_ABBR_IN_TITLE, GitHubIssue
+from models import GitCommitDict, GitFileChangeDict
+from translation_status import (
+    SEVERITY_BINS,
+    SEVERITY_LEVELS,
+    TranslationStatus,
+    TranslationStatusResult,
+)
+
+SECTIONS = [
+    "docs/concepts",
+    "docs/tasks",
+    "docs/reference",
+    "docs/setup",
+    "docs/tutorials",
+    "blog/_posts",
+    "community",
+    "case-studies",
+]
+TIMEZONES = [timezone(timedelta(hours=hours)) for hours in (-8, -5, 0, 1, 8, 9)]
+
+
+def generate_english_paths(n_files: int, seed: int = 0) -> list[str]:
+    """Generate English content paths shaped like kubernetes/website.
+
+    Args:
+    ----
+        n_files (int): The number of paths to generate.
+        seed (int): The random seed.
+
+    Returns:
+    -------
+        list[str]: Paths such as content/en/docs/concepts/topic-12/page-345.md.
+
+    """
+    rnd = random.Random(seed)  # noqa: S311
+    paths = []
+    for i in range(n_files):
+        section = rnd.choice(SECTIONS)
+        if section == "blog/_posts":
+            date = datetime(2015, 1, 1) + timedelta(days=rnd.randrange(3650))  # noqa: DTZ001
+            paths.append(f"content/en/{section}/{date:%Y-%m-%d}-post-{i}.md")
+        else:
+            paths.append(f"content/en/{section}/topic-{i % 97}/page-{i}.md")
+    return paths
+
+
+def generate_commits(
+    n_commits: int,
+    english_paths: list[str],
+    seed: int = 0,
+    rename_rate: float = 0.02,
+    bulk_rate: float = 0.001,
+) -> Iterator[GitCommitDict]:
+    """Generate Git commits in `git log` order (newest first).
+
+    Most commits change a few files of one language. A few rename files, and
+    a few are bulk localization commits that change hundreds of files.
+
+    Args:
+    ----
+        n_commits (int): The number of commits to generate.
+        english_paths (list[str]): The English paths the commits change.
+        seed (int): The random seed.
+        rename_rate (float): The probability that a file change is a rename.
+        bulk_rate (float): The probability that a commit is a bulk commit.
+
+    Yields:
+    ------
+        GitCommitDict: The generated commits.
+
+    """
+    rnd = random.Random(seed)  # noqa: S311
+    languages = [code for code in LANGUAGE_CODES if code != "en"]
+    start = datetime(2016, 1, 1, tzinfo=timezone.utc)  # noqa: UP017
+    minutes_per_commit = 10 * 365 * 24 * 60 // max(n_commits, 1)
+
+    for index in reversed(range(n_commits)):
+        committed_at = start + timedelta(
+            minutes=index * minutes_per_commit + rnd.randrange(minutes_per_commit + 1)
+        )
+        language = rnd.choice(["en", "en", *languages])
+        if rnd.random() < bulk_rate:
+            n_changed = rnd.randint(200, 2000)
+            message = f"[{language}] Sync localization with upstream ({index})"
+        else:
+            n_changed = rnd.randint(1, 5)
+            message = f"Update page {rnd.randrange(10_000)}"
+
+        files: list[GitFileChangeDict] = []
+        for english_path in rnd.sample(
+            english_paths, min(n_changed, len(english_paths))
+        ):
+            path = english_path.replace("content/en/", f"content/{language}/", 1)
+            file_change = GitFileChangeDict(
+                path=path,
+                insertions=rnd.randint(0, 200),
+                deletions=rnd.randint(0, 100),
+            )
+            if rnd.random() < rename_rate:
+                file_change["old_path"] = path.replace(".md", f"-v{index}.md")
+            files.append(file_change)
+
+        total_insertions = sum(f["insertions"] for f in files)
+        total_deletions = sum(f["deletions"] for f in files)
+        yield GitCommitDict(
+            hash=f"{rnd.getrandbits(160):040x}",
+            author=f"contributor-{rnd.randrange(500)}",
+            date=committed_at.astimezone(rnd.choice(TIMEZONES)).strftime(
+                "%Y-%m-%d %H:%M:%S %z"
+            ),
+            message=message,
+            files=files,
+            summary={
+                "total_files": len(files),
+                "total_insertions": total_insertions,
+                "total_deletions": total_deletions,
+                "total_changes": total_insertions + total_deletions,
+            },
+        )
+
+
+def write_git_history(
+    filepath: Path, n_commits: int, n_files: int, seed: int = 0
+) -> list[str]:
+    """Write a synthetic git_history.jsonl file.
+
+    Args:
+    ----
+        filepath (Path): The path of the JSONL file to write.
+        n_commits (int): The number of commits to generate.
+        n_files (int): The number of English files the commits change.
+        seed (int): The random seed.
+
+    Returns:
+    -------
+        list[str]: The English paths used by the commits.
+
+    """
+    english_paths = generate_english_paths(n_files, seed)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with filepath.open("w", encoding="utf-8") as f:
+        for commit in generate_commits(n_commits, english_paths, seed):
+            f.write(json.dumps(commit, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+    return english_paths
+
+
+def generate_results(
+    n_articles: int, seed: int = 0
+) -> dict[str, TranslationStatusResult]:
+    """Generate translation status results for every language.
+
+    Args:
+    ----
+        n_articles (int): The number of English articles.
+        seed (int): The random seed.
+
+    Returns:
+    -------
+        dict[str, TranslationStatusResult]: n_articles x len(LANGUAGE_CODES)
+                                            results keyed by target path.
+
+    """
+    rnd = random.Random(seed)  # noqa: S311
+    now = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp())  # noqa: UP017
+    results: dict[str, TranslationStatusResult] = {}
+
+    for english_path in generate_english_paths(n_articles, seed):
+        english_date = now - rnd.randrange(5 * 365 * 86400)
+        category = english_path.split("/")[2]
+        for language in LANGUAGE_CODES:
+            target_path = english_path.replace("content/en/", f"content/{language}/")
+            status = rnd.choice(list(TranslationStatus)[:3])
+            target_date = (
+                None
+                if status == TranslationStatus.NOT_TRANSLATED
+                else english_date - rnd.randrange(365 * 86400)
+            )
+            insertions = rnd.randrange(400)
+            deletions = rnd.randrange(200)
+            results[target_path] = TranslationStatusResult(
+                target_path=target_path,
+                english_path=english_path,
+                target_latest_date=target_date,
+                english_latest_date=english_date,
+                language=language,
+                category=category,
+                days_behind=rnd.randrange(1000),
+                commits_behind=rnd.randrange(20),
+                total_change_lines=insertions + deletions,
+                insertions_behind_lines=insertions,
+                deletions_behind_lines=deletions,
+                status=status,
+                severity=SEVERITY_LEVELS[
+                    sum(insertions + deletions >= bound for bound in SEVERITY_BINS)
+                ],
+                missing_commits=[],
+            )
+
+    return results
+
+
+def generate_existing_paths(
+    english_paths: list[str], seed: int = 0, translated_rate: float = 0.5
+) -> list[str]:
+    """Generate the lines of all_files.csv for the given English paths.
+
+    Args:
+    ----
+        english_paths (list[str]): The English paths.
+        seed (int): The random seed.
+        translated_rate (float): The probability that a page is translated into
+                                 a given language.
+
+    Returns:
+    -------
+        list[str]: The English paths and their translations, per language.
+
+    """
+    rnd = random.Random(seed)  # noqa: S311
+    return [
+        english_path.replace("content/en/", f"content/{language}/")
+        for language in LANGUAGE_CODES
+        for english_path in english_paths
+        if language == "en" or rnd.random() < translated_rate
+    ]
+
+
+def generate_issues(
+    n_issues: int, english_paths: list[str], seed: int = 0
+) -> list[GitHubIssue]:
+    """Generate issues whose titles mention pages the way kubernetes/website's do.
+
+    Args:
+    ----
+        n_issues (int): The number of issues to generate.
+        english_paths (list[str]): The English paths the titles mention.
+        seed (int): The random seed.
+
+    Returns:
+    -------
+        list[GitHubIssue]: Issues with language labels or [xx] title prefixes,
+                           some of which mention no path at all.
+
+    """
+    rnd = random.Random(seed)  # noqa: S311
+    languages = [lang for lang in LANGUAGE_ABBR_IN_TITLE if lang not in {"en", "zh"}]
+    issues = []
+    for number in range(1, n_issues + 1):
+        language = rnd.choice(languages)
+        page = rnd.choice(english_paths).removeprefix("content/en/")
+        page = page.removesuffix(".md")
+        title = rnd.choice(
+            [
+                f"[{language}] Update content/{language}/{page}.md",
+                f"[{language}] Localize /{language}/{page}/",
+                f"[{language}] {page.rsplit('/', 1)[-1]}.md is outdated",
+                f"[{language}] Fix typo in {page.replace('-', '_')}",
+                f"[{language}] Improve the wording of the page",
+            ]
+        )
+        labels = [f"language/{language}"] if rnd.random() < 0.5 else []
+        issues.append(
+            GitHubIssue(
+                number=number,
+                title=title,
+                url=f"https://github.com/kubernetes/website/issues/{number}",
+                labels=labels,
+            )
+        )
+    return issues
+
+
+def generate_pull_requests(
+    n_pull_requests: int, english_paths: list[str], seed: int = 0
+) -> list[dict[str, Any]]:
+    """Generate open pull requests as benchmarks.github_stand_in records them.
+
+    Args:
+    ----
+        n_pull_requests (int): The number of pull requests to generate.
+        english_paths (list[str]): The English paths the pull requests change.
+        seed (int): The random seed.
+
+    Returns:
+    -------
+        list[dict[str, Any]]: Pull requests of which about half are localization
+                              pull requests. A few change hundreds of files.
+
+    """
+    rnd = random.Random(seed)  # noqa: S311
+    languages = [code for code in LANGUAGE_CODES if code != "en"]
+    pull_requests = []
+    for number in range(1, n_pull_requests + 1):
+        localization = rnd.random() < 0.5
+        language = rnd.choice(languages) if localization else "en"
+        labels = ["cncf-cla: yes"] if rnd.random() < 0.9 else ["cncf-cla: no"]
+        if localization:
+            labels += ["area/localization", f"language/{language}"]
+        n_files = rnd.randint(150, 400) if rnd.random() < 0.02 else rnd.randint(1, 5)
+        n_files = min(n_files, len(english_paths))
+        pull_requests.append(
+            {
+                "number": number,
+                "title": f"[{language}] Update pages ({number})",
+                "url": f"https://github.com/kubernetes/website/pull/{number}",
+                "labels": labels,
+                "commits": rnd.randint(1, 10),
+                "files": [
+                    path.replace("content/en/", f"content/{language}/")
+                    for path in rnd.sample(english_paths, n_files)
+                ],
+            }
+        )
+    return pull_requests
+
+
+def write_content_files(
+    site_dir: Path, english_paths: list[str], seed: int = 0, unlisted_rate: float = 0.02
+) -> dict[str, str]:
+    """Write English content files with the front matter that decides URLs.
+
+    Blog posts get a date, and half of them a slug that differs from the file
+    name. A few pages are not rendered (_build.render: never).
+
+    Args:
+    ----
+        site_dir (Path): The directory standing in for the website checkout.
+        english_paths (list[str]): The English paths to write.
+        seed (int): The random seed.
+        unlisted_rate (float): The probability that a page is not rendered.
+
+    Returns:
+    -------
+        dict[str, str]: The URL path below the language prefix, such as
+                        docs/concepts/topic-1/page-1, of each rendered page.
+
+    """
+    rnd = random.Random(seed)  # noqa: S311
+    url_paths = {}
+    for english_path in english_paths:
+        lines = [f"title: Page {english_path.rsplit('/', 1)[-1]}"]
+        parts = english_path.removeprefix("content/en/").removesuffix(".md")
+        parts = parts.split("/")
+
+        if parts[0] == "blog":
+            name = parts[-1]
+            date, title = name[:10], name[11:]
+            lines.append(f"date: {date}")
+            if rnd.random() < 0.5:
+                title = f"{title}-slug"
+                lines.append(f"slug: {title}")
+            url_path = f"blog/{date.replace('-', '/')}/{title}"
+        elif parts[0] == "case-studies":
+            url_path = "/".join(parts[:-1])
+        else:
+            url_path = "/".join(parts)
+
+        if rnd.random() < unlisted_rate:
+            lines.append("_build:\n  render: never")
+        else:
+            url_paths[english_path] = url_path
+
+        filepath = site_dir / english_path
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(
+            "---\n" + "\n".join(lines) + "\n---\n\nBody.\n", encoding="utf-8"
+        )
+    return url_paths
+
+
+def write_page_view_csv(
+    filepath: Path, page_paths: list[str], n_rows: int, seed: int = 0
+) -> None:
+    """Write a page view export like the Looker Studio one.
+
+    Paths appear with and without a trailing slash, in other cases and with
+    query strings, and a tenth of the rows are pages that do not exist.
+
+    Args:
+    ----
+        filepath (Path): The CSV file to write.
+        page_paths (list[str]): Page paths such as /ja/docs/home/.
+        n_rows (int): The number of rows.
+        seed (int): The random seed.
+
+    """
+    rnd = random.Random(seed)  # noqa: S311
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with filepath.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Page path", "Views", "New users", "Average session duration"])
+        for _ in range(n_rows):
+            variant = rnd.random()
+            if variant < 0.1:
+                path = f"/search/?q={rnd.randrange(10**6)}"
+            else:
+                path = rnd.choice(page_paths)
+                if variant < 0.2:
+                    path = path.rstrip("/")
+                elif variant < 0.25:
+                    path = path.upper()
+                elif variant < 0.3:
+                    path = f"{path}?utm_source=slack"
+            views = rnd.randint(1, 200)
+            writer.writerow(
+                [path, views, rnd.randint(0, views), f"{rnd.uniform(5, 600):.2f}"]
+            )
+
+
+@dataclass
+class SyntheticSite:
+    """The inputs of a pipeline run written by write_site.
+
+    Attributes
+    ----------
+        site_dir (Path): The website checkout with the English content files.
+        history_file (Path): git_history.jsonl.
+        all_files_file (Path): all_files.csv.
+        page_view_files (list[Path]): The page view exports, one per window.
+        sitemaps (dict[str, bytes]): The sitemap.xml body of each language.
+        english_paths (list[str]): The English content paths.
+
+    """
+
+    site_dir: Path
+    history_file: Path
+    all_files_file: Path
+    page_view_files: list[Path]
+    sitemaps: dict[str, bytes]
+    english_paths: list[str]
+
+
+def write_site(  # noqa: PLR0913
+    root_dir: Path,
+    n_files: int,
+    n_commits: int,
+    n_page_view_rows: int,
+    *,
+    n_page_view_files: int = 1,
+    seed: int = 0,
+) -> SyntheticSite:
+    """Write kubernetes/website-shaped inputs for a whole pipeline run.
+
+    The history has renames and bulk localization commits. all_files.csv
+    lists the files the history leaves behind, the sitemaps list the URLs
+    of the rendered pages in the languages they exist in, and the page view
+    exports count views of those URLs.
+
+    Args:
+    ----
+        root_dir (Path): The directory to write into.
+        n_files (int): The number of English pages.
+        n_commits (int): The number of commits.
+        n_page_view_rows (int): The number of rows of each page view export.
+        n_page_view_files (int): The number of page view exports.
+        seed (int): The random seed.
+
+    Returns:
+    -------
+        SyntheticSite: The paths and sitemaps that were written.
+
+    """
+    english_paths = generate_english_paths(n_files, seed)
+    history_file = root_dir / "git_history.jsonl"
+    existing_paths = set(english_paths)
+    renamed_paths = set()
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with history_file.open("w", encoding="utf-8") as f:
+        for commit in generate_commits(n_commits, english_paths, seed):
+            for file_change in commit["files"]:
+                existing_paths.add(file_change["path"])
+                if "old_path" in file_change:
+                    renamed_paths.add(file_change["old_path"])
+            f.write(json.dumps(commit, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+    existing_paths -= renamed_paths
+
+    all_files_file = root_dir / "all_files.csv"
+    all_files_file.write_text(
+        "".join(f"{path}\n" for path in sorted(existing_paths)), encoding="utf-8"
+    )
+
+    site_dir = root_dir / "website"
+    url_paths = write_content_files(site_dir, english_paths, seed)
+
+    page_paths_by_language: dict[str, list[str]] = {}
+    for language in LANGUAGE_CODES:
+        prefix = "" if language == "en" else f"{language}/"
+        page_paths_by_language[language] = [
+            f"/{prefix}{url_path}/"
+            for english_path, url_path in url_paths.items()
+            if english_path.replace("content/en/", f"content/{language}/", 1)
+            in existing_paths
+        ]
+    sitemaps = {
+        language: build_sitemap(f"https://kubernetes.io{path}" for path in paths)
+        for language, paths in page_paths_by_language.items()
+    }
+
+    page_paths = [path for paths in page_paths_by_language.values() for path in paths]
+    page_view_files = [
+        root_dir / f"page_view_{i}.csv" for i in range(n_page_view_files)
+    ]
+    for i, page_view_file in enumerate(page_view_files):
+        write_page_view_csv(page_view_file, page_paths, n_page_view_rows, seed + i)
+
+    return SyntheticSite(
+        site_dir=site_dir,
+        history_file=history_file,
+        all_files_file=all_files_file,
+        page_view_files=page_view_files,
+        sitemaps=sitemaps,
+        english_paths=english_paths,
+    )
@@ -1,16 +1,20 @@
-import json
 import re
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path, PurePosixPath
 from typing import Any
 
-from issue import GitHubIssue, get_issues_by_file
-from page_view import PageView, summarize_view
-from pull_requests import GitHubPullRequest, get_prs_by_file
+from _url_builder import URLBuilder
+from history import Commit, FileRevision
+from issue import GitHubIssue
+from json_writer import JSONStreamWriter
+from page_view import PageView
+from pull_requests import GitHubPullRequest
 from translation_status import TranslationStatusResult
-from url_builder import build_url
-from utils import convert_keys_to_camel_case, serialize_datetime
+from utils import timestamp_to_datetime
+
+COMMIT_TABLE_FILE_NAME = "_commits.json"
+MATRIX_INDEX_FILE_NAME = "index.json"
 
 
 def should_process(result: TranslationStatusResult) -> bool:
@@ -113,11 +117,90 @@ def build_category_name(original_category: str, english_path: str) -> str:
     return original_category
 
 
+def export_commits(commits: list[FileRevision]) -> list[dict[str, Any]]:
+    """Convert commits to GitFileRevision-shaped dictionaries for export.
+
+    Args:
+    ----
+        commits (list[FileRevision]): The commits to export.
+
+    Returns:
+    -------
+        list[dict[str, Any]]: The commits as dictionaries, with datetime dates.
+
+    """
+    return [
+        {**commit.as_dict(), "date": timestamp_to_datetime(commit.date)}
+        for commit in commits
+    ]
+
+
+class CommitTable:
+    """The commits referred to by the detail files of a language.
+
+    Each commit is stored once with its hash, date, author and message, and the
+    missing commits of the detail entries refer to it by its index.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self.commits: list[dict[str, Any]] = []
+        self._indices: dict[str, int] = {}
+
+    def index(self, commit: Commit) -> int:
+        """Get the index of a commit, adding it to the table if needed."""
+        try:
+            return self._indices[commit.hash]
+        except KeyError:
+            index = len(self.commits)
+            self._indices[commit.hash] = index
+            self.commits.append(
+                {
+                    "hash": commit.hash,
+                    "date": timestamp_to_datetime(commit.date),
+                    "author": commit.author,
+                    "message": commit.message,
+                }
+            )
+            return index
+
+
+def export_commit_references(
+    commits: list[FileRevision], commit_table: CommitTable
+) -> list[dict[str, Any]]:
+    """Convert commits to file changes that refer to a commit table.
+
+    Args:
+    ----
+        commits (list[FileRevision]): The commits to export.
+        commit_table (CommitTable): The table the commits are added to.
+
+    Returns:
+    -------
+        list[dict[str, Any]]: The file changes with the index of their commit.
+
+    """
+    references = []
+    for revision in commits:
+        reference = {
+            "commit": commit_table.index(revision.commit),
+            "path": revision.path,
+            "insertions": revision.insertions,
+            "deletions": revision.deletions,
+            "operation": revision.operation,
+        }
+        if revision.old_path:
+            reference["old_path"] = revision.old_path
+        references.append(reference)
+    return references
+
+
 def create_matrix_data(
     results: dict[str, TranslationStatusResult],
     issues_by_file: dict[str, list[GitHubIssue]],
     prs_by_file: dict[str, list[GitHubPullRequest]],
-    existing_urls: set[str],
+    url_builder: URLBuilder,
+    page_views: dict[str, PageView],
 ) -> dict[str, dict[str, Any]]:
     """Create matrix data grouped by category."""
     matrix_data = defaultdict(
@@ -126,31 +209,42 @@ def create_matrix_data(
             "articles": [],
         }
     )
-    page_views = summarize_view("../../data/master/page_view.csv", existing_urls)
 
-    articles_by_english_path = defaultdict(dict)
+    # 英語パスごとに、カテゴリと英語 URL を最初の結果から一度だけ求める
+    articles_by_english_path: dict[str, dict[str, Any]] = {}
+    category_by_english_path: dict[str, str] = {}
 
     for result in results.values():
         english_path = result["english_path"]
         language = result["language"]
-        target_path = result["english_path"].replace(
-            "content/en/", f"content/{language}/"
-        )
-        english_url = build_url(english_path, "en", existing_urls)
-        translation_url = build_url(english_path, language, existing_urls)
+
+        article = articles_by_english_path.get(english_path)
+        if article is None:
+            article = {
+                "english_path": english_path,
+                "english_url": url_builder.build_url(english_path, "en"),
+                "translations": {},
+            }
+            articles_by_english_path[english_path] = article
+            category_by_english_path[english_path] = build_category_name(
+                result["category"], english_path
+            )
+
+        target_path = english_path.replace("content/en/", f"content/{language}/")
+        translation_url = url_builder.build_url(english_path, language)
         page_view = page_views.get(
             translation_url,
             PageView(views=0, new_users=0, average_session_duration=0.0),
         )
 
-        translation_data = {
+        article["translations"][language] = {
             "status": result["status"],
             "severity": result["severity"],
             "days_behind": result["days_behind"],
             "commits_behind": result["commits_behind"],
             "total_change_lines": result["total_change_lines"],
-            "target_latest_date": result["target_latest_date"],
-            "english_latest_date": result["english_latest_date"],
+            "target_latest_date": timestamp_to_datetime(result["target_latest_date"]),
+            "english_latest_date": timestamp_to_datetime(result["english_latest_date"]),
             "translation_url": translation_url,
             "views": page_view.views,
             "new_users": page_view.new_users,
@@ -159,24 +253,9 @@ def create_matrix_data(
             "prs": prs_by_file.get(target_path, []),
         }
 
-        articles_by_english_path[english_path][language] = translation_data
-
-    for english_path, translations in articles_by_english_path.items():
-        original_category = next(
-            result["category"]
-            for result in results.values()
-            if result["english_path"] == english_path
-        )
-
-        category_name = build_category_name(original_category, english_path)
-        english_url = build_url(english_path, "en", existing_urls)
-
-        article_data = {
-            "english_path": english_path,
-            "english_url": english_url,
-            "translations": translations,
-        }
-        matrix_data[category_name]["articles"].append(article_data)
+    for english_path, article in articles_by_english_path.items():
+        category_name = category_by_english_path[english_path]
+        matrix_data[category_name]["articles"].append(article)
 
     # Sort blog articles by date
     for category, data in matrix_data.items():
@@ -191,25 +270,30 @@ def create_matrix_data(
 
 def create_detail_data(
     result: TranslationStatusResult,
-    existing_urls: set[str],
+    url_builder: URLBuilder,
     issues_by_file: dict[str, list[GitHubIssue]],
     prs_by_file: dict[str, Any],
+    commit_table: CommitTable | None = None,
 ) -> dict[str, Any]:
-    """Create detail data for a single translation result."""
+    """Create detail data for a single translation result.
+
+    If commit_table is given, the missing commits refer to it instead of
+    embedding the commits.
+    """
     english_path = result["english_path"]
     language = result["language"]
 
     # Generate URLs
-    english_url = build_url(english_path, "en", existing_urls)
-    translation_url = build_url(english_path, language, existing_urls)
+    english_url = url_builder.build_url(english_path, "en")
+    translation_url = url_builder.build_url(english_path, language)
 
     return {
         "target_path": result["target_path"],
         "english_path": result["english_path"],
         "english_url": english_url,
         "translation_url": translation_url,
-        "target_latest_date": result["target_latest_date"],
-        "english_latest_date": result["english_latest_date"],
+        "target_latest_date": timestamp_to_datetime(result["target_latest_date"]),
+        "english_latest_date": timestamp_to_datetime(result["english_latest_date"]),
         "days_behind": result["days_behind"],
         "commits_behind": result["commits_behind"],
         "total_change_lines": result["total_change_lines"],
@@ -217,46 +301,175 @@ def create_detail_data(
         "deletions_behind_lines": result["deletions_behind_lines"],
         "status": result["status"],
         "severity": result["severity"],
-        "missing_commits": result["missing_commits"],
+        "missing_commits": (
+            export_commits(result["missing_commits"])
+            if commit_table is None
+            else export_commit_references(result["missing_commits"], commit_table)
+        ),
         "issues": issues_by_file.get(result["target_path"], []),
         "prs": prs_by_file.get(result["target_path"], []),
     }
 
 
 def save_matrix_files(
-    matrix_data: dict[str, dict[str, Any]], output_dir: str = "data"
+    matrix_data: dict[str, dict[str, Any]],
+    output_dir: str | Path = "data",
+    *,
+    compact: bool = False,
 ) -> None:
-    """Save matrix data to category-specific JSON files."""
+    """Save matrix data to category-specific JSON files.
+
+    Args:
+    ----
+        matrix_data (dict[str, dict[str, Any]]): The matrix data by category.
+        output_dir (str | Path): The directory where matrix files will be saved.
+        compact (bool): Write the JSON without indentation.
+
+    """
     matrix_dir = Path(output_dir) / "matrix"
     matrix_dir.mkdir(parents=True, exist_ok=True)
 
     for category, data in matrix_data.items():
         file_path = matrix_dir / f"{category}.json"
         with file_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                convert_keys_to_camel_case(data),
-                f,
-                indent=2,
-                default=serialize_datetime,
+            # 記事ごとに書き出す
+            JSONStreamWriter(f, compact=compact).write(data, stream_depth=2)
+
+
+def _write_matrix_shards(  # noqa: PLR0913
+    data: dict[str, Any],
+    articles: list[dict[str, Any]],
+    shard_dir: Path,
+    output_dir: Path,
+    shard_size: int,
+    *,
+    compact: bool,
+) -> list[str]:
+    """Write articles to files of at most shard_size articles each.
+
+    Returns
+    -------
+        list[str]: The paths of the shards relative to output_dir.
+
+    """
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    shard_paths = []
+    for shard_number, start in enumerate(range(0, len(articles), shard_size)):
+        file_path = shard_dir / f"{shard_number:03d}.json"
+        with file_path.open("w", encoding="utf-8") as f:
+            JSONStreamWriter(f, compact=compact).write(
+                {
+                    "last_updated": data["last_updated"],
+                    "articles": articles[start : start + shard_size],
+                },
+                stream_depth=2,
             )
+        shard_paths.append(file_path.relative_to(output_dir).as_posix())
+    return shard_paths
+
+
+def save_matrix_shards(
+    matrix_data: dict[str, dict[str, Any]],
+    output_dir: str | Path = "data",
+    shard_size: int = 200,
+    *,
+    compact: bool = False,
+) -> None:
+    """Save matrix data split into shards, with an index of the shards.
+
+    Each category is split into matrix/<category>/<n>.json, and its articles
+    are also sliced by language into matrix/<category>/<lang>/<n>.json with
+    only that language in translations. A shard has the same shape as a
+    whole category file, so a client can fetch the shard it shows instead of
+    every category. matrix/index.json lists the shards and the number of
+    articles of each category and language.
 
+    Args:
+    ----
+        matrix_data (dict[str, dict[str, Any]]): The matrix data by category.
+        output_dir (str | Path): The directory where matrix files will be saved.
+        shard_size (int): The maximum number of articles in a shard.
+        compact (bool): Write the JSON without indentation.
+
+    """
+    output_dir = Path(output_dir)
+    matrix_dir = output_dir / "matrix"
+    matrix_dir.mkdir(parents=True, exist_ok=True)
 
-def save_detail_files(
+    categories = []
+    for category, data in matrix_data.items():
+        articles_by_language: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for article in data["articles"]:
+            for language, translation in article["translations"].items():
+                articles_by_language[language].append(
+                    {**article, "translations": {language: translation}}
+                )
+
+        category_dir = matrix_dir / category
+        categories.append(
+            {
+                "category": category,
+                "articles": len(data["articles"]),
+                "languages": {
+                    language: len(articles)
+                    for language, articles in articles_by_language.items()
+                },
+                "shards": _write_matrix_shards(
+                    data,
+                    data["articles"],
+                    category_dir,
+                    output_dir,
+                    shard_size,
+                    compact=compact,
+                ),
+                "language_shards": {
+                    language: _write_matrix_shards(
+                        data,
+                        articles,
+                        category_dir / language,
+                        output_dir,
+                        shard_size,
+                        compact=compact,
+                    )
+                    for language, articles in articles_by_language.items()
+                },
+            }
+        )
+
+    with (matrix_dir / MATRIX_INDEX_FILE_NAME).open("w", encoding="utf-8") as f:
+        JSONStreamWriter(f, compact=compact).write(
+            {"shard_size": shard_size, "categories": categories}
+        )
+
+
+def save_detail_files(  # noqa: PLR0913
     results: dict[str, TranslationStatusResult],
     issues_by_file: dict[str, list[GitHubIssue]],
     prs_by_file: dict[str, list[GitHubPullRequest]],
-    existing_urls: set[str],
-    output_dir: str = "data",
+    url_builder: URLBuilder,
+    output_dir: str | Path = "data",
+    *,
+    compact: bool = False,
+    commit_table: bool = False,
 ) -> None:
     """Save detail data grouped by language and category.
 
+    The detail data of each file is created while the file is written, so only
+    one entry is held in memory at a time. With commit_table, the commits of
+    each language are written once to details/<lang>/_commits.json and the
+    entries refer to them by index.
+
     Args:
     ----
         results (dict[str, TranslationStatusResult]): The translation status results.
+        issues_by_file (dict[str, list[GitHubIssue]]): A mapping of file paths to
+                                                       their associated issues.
         prs_by_file (dict[str, list[GitHubPullRequest]]): A mapping of file paths to
                                                           their associated PRs.
-        existing_urls (set[str]): A set of existing file paths to check against.
-        output_dir (str): The directory where detail files will be saved.
+        url_builder (URLBuilder): The URL resolver shared with the matrix export.
+        output_dir (str | Path): The directory where detail files will be saved.
+        compact (bool): Write the JSON without indentation.
+        commit_table (bool): Write the commits to a table per language.
 
     Returns:
     -------
@@ -266,7 +479,7 @@ def save_detail_files(
     details_dir = Path(output_dir) / "details"
     details_dir.mkdir(parents=True, exist_ok=True)
 
-    details_by_language_category = defaultdict(lambda: defaultdict(dict))
+    results_by_language_category = defaultdict(lambda: defaultdict(dict))
 
     for result in results.values():
         language = result["language"]
@@ -274,36 +487,48 @@ def save_detail_files(
         original_category = result["category"]
 
         category_name = build_category_name(original_category, english_path)
+        results_by_language_category[language][category_name][english_path] = result
 
-        detail_data = create_detail_data(
-            result,
-            existing_urls,
-            issues_by_file,
-            prs_by_file,
-        )
-        details_by_language_category[language][category_name][english_path] = (
-            detail_data
-        )
-
-    for language, categories in details_by_language_category.items():
+    for language, categories in results_by_language_category.items():
         lang_dir = details_dir / language
         lang_dir.mkdir(exist_ok=True)
+        language_commits = CommitTable() if commit_table else None
 
-        for category, details in categories.items():
+        for category, category_results in categories.items():
             file_path = lang_dir / f"{category}.json"
             with file_path.open("w", encoding="utf-8") as f:
-                json.dump(
-                    convert_keys_to_camel_case(details),
-                    f,
-                    indent=2,
-                    default=serialize_datetime,
+                JSONStreamWriter(f, compact=compact).write_object(
+                    (
+                        english_path,
+                        create_detail_data(
+                            result,
+                            url_builder,
+                            issues_by_file,
+                            prs_by_file,
+                            language_commits,
+                        ),
+                    )
+                    for english_path, result in category_results.items()
+                )
+
+        if language_commits is not None:
+            with (lang_dir / COMMIT_TABLE_FILE_NAME).open("w", encoding="utf-8") as f:
+                JSONStreamWriter(f, compact=compact).write(
+                    {"commits": language_commits.commits}, stream_depth=2
                 )
 
 
-def process_translation_results(
+def process_translation_results(  # noqa: PLR0913, PLR0917
     results: dict[str, TranslationStatusResult],
     existing_urls: set[str],
-    output_dir: str = "data",
+    issues_by_file: dict[str, list[GitHubIssue]],
+    prs_by_file: dict[str, list[GitHubPullRequest]],
+    page_views: dict[str, PageView],
+    output_dir: str | Path = "data",
+    *,
+    compact: bool = False,
+    commit_table: bool = False,
+    matrix_shard_size: int | None = None,
 ) -> None:
     """Process translation results and save them to JSON files.
 
@@ -311,7 +536,18 @@ def process_translation_results(
     ----
         results (dict[str, TranslationStatusResult]): The translation status results.
         existing_urls (set[str]): A set of existing urls to check against.
-        output_dir (str): The directory where output files will be saved.
+        issues_by_file (dict[str, list[GitHubIssue]]): The open issues keyed by
+                                                       the file they refer to.
+        prs_by_file (dict[str, list[GitHubPullRequest]]): The open pull requests
+                                                          keyed by changed file.
+        page_views (dict[str, PageView]): The page views keyed by URL.
+        output_dir (str | Path): The directory where output files will be saved.
+        compact (bool): Write the JSON files without indentation.
+        commit_table (bool): Write the missing commits of the detail files to a
+                             commit table per language.
+        matrix_shard_size (int | None): If given, save the matrix split into
+                                        shards of this many articles instead
+                                        of one file per category.
 
     Returns:
     -------
@@ -326,26 +562,36 @@ def process_translation_results(
         if should_process(result)
     }
 
-    # issues
-    issues_by_file = get_issues_by_file()
-
-    # prs
-    prs_by_file = get_prs_by_file()
+    # URL はマトリクスと詳細で共有する
+    url_builder = URLBuilder(existing_urls)
+    url_builder.build_table(
+        dict.fromkeys(result["english_path"] for result in filtered_results.values()),
+        [
+            "en",
+            *dict.fromkeys(result["language"] for result in filtered_results.values()),
+        ],
+    )
 
     # Create matrix data from results
     matrix_data = create_matrix_data(
         filtered_results,
         issues_by_file,
         prs_by_file,
-        existing_urls,
+        url_builder,
+        page_views,
     )
-    save_matrix_files(matrix_data, output_dir)
+    if matrix_shard_size is None:
+        save_matrix_files(matrix_data, output_dir, compact=compact)
+    else:
+        save_matrix_shards(matrix_data, output_dir, matrix_shard_size, compact=compact)
 
     # Save detailed translation results
     save_detail_files(
         filtered_results,
         issues_by_file,
         prs_by_file,
-        existing_urls,
+        url_builder,
         output_dir,
+        compact=compact,
+        commit_table=commit_table,
     )
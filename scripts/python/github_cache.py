@@ -0,0 +1,230 @@
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import requests
+from issue import GitHubIssue
+from log import logger
+from pull_requests import (
+    LOCALIZATION_LABELS,
+    GitHubPullRequest,
+    GraphQLTransport,
+    fetch_pull_requests,
+)
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_CACHE_VERSION = 1
+ISSUES_PAGE_SIZE = 100
+
+
+@dataclass
+class GitHubCache:
+    """Open issues and localization pull requests as of the last sync.
+
+    Attributes
+    ----------
+        since (str | None): The newest updated_at seen so far. The next sync
+                            only lists the items updated at or after it.
+        pages (dict[str, dict[str, str | None]]): The ETag and next page URL of
+                                                  each page of the last listing.
+        issues (dict[int, GitHubIssue]): The open issues by number.
+        pull_requests (dict[int, GitHubPullRequest]): The open localization pull
+                                                      requests by number.
+
+    """
+
+    since: str | None = None
+    pages: dict[str, dict[str, str | None]] = field(default_factory=dict)
+    issues: dict[int, GitHubIssue] = field(default_factory=dict)
+    pull_requests: dict[int, GitHubPullRequest] = field(default_factory=dict)
+
+    def open_issues(self) -> list[GitHubIssue]:
+        """Get the open issues, newest first."""
+        return [self.issues[number] for number in sorted(self.issues, reverse=True)]
+
+    def open_pull_requests(self) -> list[GitHubPullRequest]:
+        """Get the open localization pull requests, newest first."""
+        return [
+            self.pull_requests[number]
+            for number in sorted(self.pull_requests, reverse=True)
+        ]
+
+
+def load_github_cache(filepath: Path) -> GitHubCache:
+    """Load the cache saved by save_github_cache.
+
+    Args:
+    ----
+        filepath (Path): The path of the cache file.
+
+    Returns:
+    -------
+        GitHubCache: The cache, or an empty cache if it is missing or was saved
+                     in another format.
+
+    """
+    if not filepath.exists():
+        return GitHubCache()
+
+    data = json.loads(filepath.read_text(encoding="utf-8"))
+    if data.get("version") != GITHUB_CACHE_VERSION:
+        logger.info("Ignoring the GitHub cache saved in another format")
+        return GitHubCache()
+
+    return GitHubCache(
+        since=data["since"],
+        pages=data["pages"],
+        issues={issue["number"]: GitHubIssue(**issue) for issue in data["issues"]},
+        pull_requests={
+            pr["number"]: GitHubPullRequest(**pr) for pr in data["pull_requests"]
+        },
+    )
+
+
+def save_github_cache(cache: GitHubCache, filepath: Path) -> None:
+    """Save the cache atomically.
+
+    Args:
+    ----
+        cache (GitHubCache): The cache to save.
+        filepath (Path): The path of the cache file.
+
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = filepath.with_suffix(".tmp")
+    tmp_path.write_text(
+        json.dumps(
+            {
+                "version": GITHUB_CACHE_VERSION,
+                "since": cache.since,
+                "pages": cache.pages,
+                "issues": [asdict(issue) for issue in cache.open_issues()],
+                "pull_requests": [asdict(pr) for pr in cache.open_pull_requests()],
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    tmp_path.replace(filepath)
+
+
+def _list_updated_items(
+    cache: GitHubCache,
+    session: requests.Session,
+    url: str | None,
+) -> list[dict[str, Any]]:
+    """List the issues and pull requests updated since the last sync.
+
+    Every page is requested with the ETag of the last sync. A page answered
+    with 304 Not Modified holds items that were already applied to the cache,
+    so it is skipped and the listing continues from its recorded next page.
+    """
+    items: list[dict[str, Any]] = []
+    pages: dict[str, dict[str, str | None]] = {}
+
+    while url:
+        cached_page = cache.pages.get(url)
+        headers = {}
+        if cached_page and cached_page["etag"]:
+            headers["If-None-Match"] = cached_page["etag"]
+
+        response = session.get(url, headers=headers, timeout=30)
+        if response.status_code == requests.codes.not_modified:
+            pages[url] = cached_page
+            url = cached_page["next"]
+            continue
+
+        response.raise_for_status()
+        items.extend(response.json())
+        next_url = response.links.get("next", {}).get("url")
+        pages[url] = {"etag": response.headers.get("ETag"), "next": next_url}
+        url = next_url
+
+    cache.pages = pages
+    return items
+
+
+def sync_github_cache(
+    cache: GitHubCache,
+    session: requests.Session,
+    transport: GraphQLTransport,
+    repo_name: str = "kubernetes/website",
+    api_url: str = GITHUB_API_URL,
+) -> None:
+    """Bring the cache up to date with the repository.
+
+    The issues endpoint lists the issues and pull requests updated since the
+    last sync, including the ones that were closed or relabeled, in the order
+    of updated_at. Only the localization pull requests among them have their
+    files fetched again. The first sync lists every open item instead.
+
+    Args:
+    ----
+        cache (GitHubCache): The cache to update in place.
+        session (requests.Session): An authenticated session for the REST API.
+        transport (GraphQLTransport): The transport to fetch pull requests with.
+        repo_name (str): The repository to sync.
+        api_url (str): Base URL of the REST API.
+
+    """
+    params: dict[str, Any] = {
+        "state": "all" if cache.since else "open",
+        "sort": "updated",
+        "direction": "asc",
+        "per_page": ISSUES_PAGE_SIZE,
+    }
+    if cache.since:
+        params["since"] = cache.since
+    url = (
+        requests.Request("GET", f"{api_url}/repos/{repo_name}/issues", params=params)
+        .prepare()
+        .url
+    )
+
+    items = _list_updated_items(cache, session, url)
+    logger.info("Found %d issues and pull requests updated on GitHub", len(items))
+
+    since = cache.since
+    changed_pull_requests: set[int] = set()
+    for item in items:
+        number = item["number"]
+        labels = [label["name"] for label in item["labels"]]
+        is_open = item["state"] == "open"
+
+        if "pull_request" in item:
+            if is_open and set(LOCALIZATION_LABELS) <= set(labels):
+                changed_pull_requests.add(number)
+            else:
+                cache.pull_requests.pop(number, None)
+        elif is_open:
+            cache.issues[number] = GitHubIssue(
+                number=number,
+                title=item["title"],
+                url=item["html_url"],
+                labels=labels,
+            )
+        else:
+            cache.issues.pop(number, None)
+
+        # ISO 8601 の UTC 時刻なので文字列のまま比較できる
+        if since is None or item["updated_at"] > since:
+            since = item["updated_at"]
+
+    if changed_pull_requests:
+        fetched = {
+            pr.number: pr
+            for pr in fetch_pull_requests(
+                transport, repo_name, updated_since=cache.since
+            )
+        }
+        # 一覧の後に更新されたものは、次の同期で一覧に現れたときに反映する
+        for number in changed_pull_requests:
+            pr = fetched.get(number)
+            if pr is None:
+                # ファイルが多すぎるなどで除外されたもの
+                cache.pull_requests.pop(number, None)
+            else:
+                cache.pull_requests[number] = pr
+
+    cache.since = since
@@ -1,28 +1,127 @@
+import pickle
+import sys
+from bisect import bisect_left
 from collections import defaultdict
-from typing import NotRequired, TypedDict
+from collections.abc import Iterable
+from datetime import datetime
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, NotRequired, Self, TypedDict
 
-from models import GitCommitDict, OperationType
+from log import logger
+from models import GitCommitRecordDict, GitHistoryPositionDict, OperationType
+from utils import gc_paused
+
+HISTORY_SNAPSHOT_VERSION = 2
 
 
 class GitFileRevision(TypedDict):
     """A TypedDict representing a single Git file revision record."""
 
     hash: str
-    date: str
+    date: int  # UTC エポック秒
     author: str
     message: str
     path: str
-    insertions: int
-    deletions: int
+    insertions: int | None
+    deletions: int | None
     operation: OperationType
     old_path: NotRequired[str]
 
 
+class Commit:
+    """A Git commit, stored once and shared by the revisions of its files."""
+
+    __slots__ = ("author", "date", "hash", "message")
+
+    def __init__(self, commit_hash: str, date: int, author: str, message: str) -> None:
+        """Initialize a Commit."""
+        self.hash = commit_hash
+        self.date = date
+        self.author = author
+        self.message = message
+
+
+class FileRevision:
+    """A change to a single file in a commit.
+
+    Commit metadata is not copied but referenced through the shared Commit.
+    Use as_dict() to get a GitFileRevision for export.
+    """
+
+    __slots__ = (
+        "commit",
+        "date",
+        "deletions",
+        "insertions",
+        "old_path",
+        "operation",
+        "path",
+    )
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        commit: Commit,
+        path: str,
+        insertions: int | None,
+        deletions: int | None,
+        operation: OperationType,
+        old_path: str | None = None,
+    ) -> None:
+        """Initialize a FileRevision."""
+        self.commit = commit
+        self.date = commit.date
+        self.path = path
+        self.insertions = insertions
+        self.deletions = deletions
+        self.operation = operation
+        self.old_path = old_path
+
+    @property
+    def hash(self) -> str:
+        """The hash of the commit."""
+        return self.commit.hash
+
+    @property
+    def author(self) -> str:
+        """The author of the commit."""
+        return self.commit.author
+
+    @property
+    def message(self) -> str:
+        """The message of the commit."""
+        return self.commit.message
+
+    def as_dict(self) -> GitFileRevision:
+        """Convert the revision to a GitFileRevision dictionary.
+
+        Returns
+        -------
+            GitFileRevision: A new dictionary with the revision and commit fields.
+
+        """
+        revision = GitFileRevision(
+            hash=self.commit.hash,
+            date=self.date,
+            author=self.commit.author,
+            message=self.commit.message,
+            path=self.path,
+            insertions=self.insertions,
+            deletions=self.deletions,
+            operation=self.operation,
+        )
+        if self.old_path:
+            revision["old_path"] = self.old_path
+        return revision
+
+
 class RenameEvent:
     """A class representing a rename event in Git history."""
 
+    __slots__ = ("commit_hash", "date", "new_path", "old_path")
+
     def __init__(
-        self, commit_hash: str, date: str, old_path: str, new_path: str
+        self, commit_hash: str, date: int, old_path: str, new_path: str
     ) -> None:
         """Initialize a RenameEvent."""
         self.commit_hash = commit_hash
@@ -31,6 +130,44 @@ class RenameEvent:
         self.new_path = new_path
 
 
+def parse_git_date(date: str) -> int:
+    """Convert a Git date string to a UTC epoch timestamp in seconds.
+
+    Args:
+    ----
+        date (str): A Git date string (e.g. "2024-10-02 12:34:56 +0900").
+
+    Returns:
+    -------
+        int: The number of seconds since the epoch.
+
+    """
+    return int(datetime.fromisoformat(date).timestamp())
+
+
+class _FileHistory:
+    """Rename-aware history of a single file, sorted from newest to oldest."""
+
+    __slots__ = ("keys", "revisions")
+
+    def __init__(self, revisions: list[FileRevision], keys: list[int]) -> None:
+        """Initialize a _FileHistory.
+
+        Args:
+        ----
+            revisions (list[FileRevision]): Revisions from newest to oldest.
+            keys (list[int]): Negated timestamps of the revisions, in ascending
+                              order so that they can be searched with bisect.
+
+        """
+        self.revisions = revisions
+        self.keys = keys
+
+    def count_since(self, timestamp: int) -> int:
+        """Count the revisions committed strictly after a timestamp."""
+        return bisect_left(self.keys, -timestamp)
+
+
 class GitFileHistoryTracker:
     """A class to track the history of a file in a Git repository.
 
@@ -41,87 +178,347 @@ class GitFileHistoryTracker:
 
     def __init__(
         self,
-        commits: list[GitCommitDict],
+        commits: Iterable[GitCommitRecordDict],
         current_files: set[str],
     ) -> None:
         """Initialize the GitFileHistoryTracker and build history from commits.
 
         Args:
         ----
-            commits: List of Git commit dictionaries to build history from.
+            commits: Git commit dictionaries to build history from. Any iterable
+                     works, e.g. a generator from main.iter_json_records.
             current_files: Set of file paths that currently exist in the repository.
                           Used to determine deletion operations.
 
         """
-        self.file_changes: dict[str, list[GitFileRevision]] = defaultdict(list)
+        self.file_changes: dict[str, list[FileRevision]] = defaultdict(list)
         self.rename_events: list[RenameEvent] = []  # 時系列順のリネームイベント
+        # new_path -> rename_events のインデックス (昇順)
+        self._renamed_into: dict[str, list[int]] = defaultdict(list)
+        # old_path -> new_path (順序を問わない)
+        self._renamed_to: dict[str, set[str]] = defaultdict(set)
         self.current_files = current_files
+        # パス -> リネームを考慮した履歴 (get_history の結果をメモ化)
+        self._history_cache: dict[str, _FileHistory] = {}
+        # 履歴上のパス -> そのパスを含む _history_cache のキー
+        self._history_dependents: dict[str, set[str]] = defaultdict(set)
         self._build_from_commits(commits)
 
-    def _build_from_commits(self, commits: list[GitCommitDict]) -> None:  # noqa: C901, PLR0912
-        """Build the file history tracker from a list of Git commits.
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle, leaving out the memoized histories."""
+        state = self.__dict__.copy()
+        del state["_history_cache"]
+        del state["_history_dependents"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the tracker from a pickled state."""
+        self.__dict__.update(state)
+        self._history_cache = {}
+        self._history_dependents = defaultdict(set)
+
+    def save_snapshot(self, filepath: Path, position: GitHistoryPositionDict) -> None:
+        """Save the tracker to a file so that the next run can skip rebuilding it.
+
+        Args:
+        ----
+            filepath (Path): The path of the snapshot file.
+            position (GitHistoryPositionDict): How much of git_history.jsonl
+                                               the tracker was built from.
+
+        """
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = filepath.with_suffix(".tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(
+                (HISTORY_SNAPSHOT_VERSION, position, self),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        tmp_path.replace(filepath)
+
+    @classmethod
+    def load_snapshot(
+        cls, filepath: Path
+    ) -> tuple[Self, GitHistoryPositionDict] | None:
+        """Load a tracker saved with save_snapshot.
+
+        Args:
+        ----
+            filepath (Path): The path of the snapshot file.
+
+        Returns:
+        -------
+            tuple[GitFileHistoryTracker, GitHistoryPositionDict] | None:
+                The tracker and the position in git_history.jsonl it was built
+                up to, or None if there is no usable snapshot.
+
+        """
+        if not filepath.exists():
+            return None
+
+        try:
+            with filepath.open("rb") as f:
+                version, position, tracker = pickle.load(f)  # noqa: S301
+        except (
+            pickle.UnpicklingError,
+            EOFError,
+            AttributeError,
+            ImportError,
+            OSError,
+        ):
+            logger.exception("Failed to load history snapshot: %s", filepath)
+            return None
+
+        if version != HISTORY_SNAPSHOT_VERSION or not isinstance(tracker, cls):
+            logger.info("History snapshot version changed: %s", filepath)
+            return None
+
+        return tracker, position
+
+    def add_commits(
+        self,
+        commits: Iterable[GitCommitRecordDict],
+        current_files: set[str] | None = None,
+    ) -> set[str]:
+        """Add new commits to a tracker that has already been built.
 
         Args:
         ----
-            commits (list[GitCommitDict]): A list of Git commit dictionaries.
+            commits (Iterable[GitCommitRecordDict]): Git commits that are not yet
+                                                     tracked.
+            current_files (set[str] | None): The updated set of existing file paths,
+                                             or None to keep the current one.
+
+        Returns:
+        -------
+            set[str]: The paths changed by the new commits, including the old
+                      paths of renamed files.
 
         """
-        sorted_commits = sorted(commits, key=lambda x: x["date"])
-
-        # Pass 1: リネームイベントを時系列で収集
-        for commit in sorted_commits:
-            for file_change in commit.get("files", []):
-                if "old_path" in file_change:
-                    rename_event = RenameEvent(
-                        commit["hash"],
-                        commit["date"],
-                        file_change["old_path"],
-                        file_change["path"],
+        changed: set[str] = set()
+        if current_files is not None:
+            changed = self.current_files.symmetric_difference(current_files)
+            self.current_files = current_files
+
+        touched_paths = self._build_from_commits(commits)
+
+        # 存在有無が変わったファイルの既存リビジョンを判定し直す
+        for path in changed:
+            if path in self.file_changes:
+                self._classify_operations(path)
+
+        return touched_paths
+
+    def _build_from_commits(  # noqa: C901, PLR0912
+        self, commits: Iterable[GitCommitRecordDict]
+    ) -> set[str]:
+        """Build the file history tracker from Git commits.
+
+        Commits are consumed one at a time in the given order, so a generator
+        can be passed without loading every record into memory first. The
+        added, renamed and deleted operations are decided inline while the
+        revisions are appended, so commits in date order need a single pass.
+
+        Commits in `git log` order (newest first), as written by fetch.sh, are
+        accepted as they are: the revisions of each file are reversed by a
+        stable sort, which takes linear time on such runs, and only the
+        operations of the old and new oldest revisions are fixed afterwards.
+
+        The tracker can be built incrementally: commits passed to a later call
+        are merged into the existing history. Commit dates are parsed once here
+        and stored as UTC epoch seconds.
+
+        Args:
+        ----
+            commits (Iterable[GitCommitRecordDict]): Git commit dictionaries.
+
+        Returns:
+        -------
+            set[str]: The paths changed by the commits.
+
+        """
+        touched_paths: set[str] = set()
+        # 日付順でなくなったパスと、その時点で最古だったリビジョン
+        unsorted_paths: dict[str, FileRevision] = {}
+        rename_events: list[RenameEvent] = []
+        file_changes = self.file_changes
+        current_files = self.current_files
+        # 初回構築では既存パスの変更を記録し直す必要がない
+        incremental = bool(file_changes)
+
+        # 構築中のオブジェクトは循環参照を持たない
+        with gc_paused():
+            for commit in commits:
+                timestamp = parse_git_date(commit["date"])
+                commit_row = Commit(
+                    commit["hash"],
+                    timestamp,
+                    sys.intern(commit["author"]),
+                    commit["message"],
+                )
+                for file_change in commit.get("files", []):
+                    path = file_change["path"]
+                    old_path = file_change.get("old_path")
+                    operation: OperationType
+
+                    entries = file_changes.get(path)
+                    if entries:
+                        latest = entries[-1]
+                        # 既存のパス文字列を共有する
+                        path = latest.path
+                        if timestamp < latest.date and path not in unsorted_paths:
+                            # 既存の履歴より古いコミットが追加された
+                            unsorted_paths[path] = entries[0]
+                        if incremental:
+                            touched_paths.add(path)
+                        if old_path:
+                            operation = "renamed"
+                        elif path in current_files:
+                            operation = "modified"
+                        else:
+                            operation = "deleted"
+                    else:
+                        path = sys.intern(path)
+                        if entries is None:
+                            entries = file_changes[path] = []
+                        touched_paths.add(path)
+                        operation = "renamed" if old_path else "added"
+
+                    if old_path:
+                        old_path = sys.intern(old_path)
+                        rename_events.append(
+                            RenameEvent(commit_row.hash, timestamp, old_path, path)
+                        )
+                        touched_paths.add(old_path)
+
+                    entries.append(
+                        FileRevision(
+                            commit_row,
+                            path,
+                            file_change["insertions"],
+                            file_change["deletions"],
+                            operation,
+                            old_path,
+                        )
                     )
-                    self.rename_events.append(rename_event)
-
-        # Pass 2: ファイル変更履歴を構築
-        for commit in sorted_commits:
-            for file_change in commit.get("files", []):
-                path = file_change["path"]
-                old_path = file_change.get("old_path")
-                file_revision = {
-                    "hash": commit["hash"],
-                    "date": commit["date"],
-                    "author": commit["author"],
-                    "message": commit["message"],
-                    "path": path,
-                    "insertions": file_change["insertions"],
-                    "deletions": file_change["deletions"],
-                    "operation": "renamed" if old_path else "modified",
-                }
-
-                if old_path:
-                    file_revision["old_path"] = old_path
-
-                self.file_changes[path].append(file_revision)
-
-        # Pass 3: 各ファイルの最古のコミットをaddedに変更
-        for entries in self.file_changes.values():
-            if entries:
-                oldest_entry = min(entries, key=lambda x: x["date"])
-                if oldest_entry["operation"] == "modified":
-                    oldest_entry["operation"] = "added"
-
-        # 削除判定 - current_filesに存在しないファイルは削除されたとみなす
-        for path in self.file_changes:
-            if path not in self.current_files:
-                for entry in self.file_changes[path]:
-                    if entry["operation"] == "modified":
-                        entry["operation"] = "deleted"
-
-    def _get_path_at_date(self, current_path: str, target_date: str) -> str:
+
+        for path, previous_oldest in unsorted_paths.items():
+            entries = file_changes[path]
+            entries.sort(key=attrgetter("date"))
+            if entries[0] is not previous_oldest:
+                # 最古のリビジョンが入れ替わった分だけ判定し直す
+                previous_oldest.operation = self._operation_for(
+                    previous_oldest, oldest=False
+                )
+                entries[0].operation = self._operation_for(entries[0], oldest=True)
+
+        self._add_rename_events(rename_events)
+        self._invalidate_history(touched_paths)
+        return touched_paths
+
+    def _add_rename_events(self, rename_events: list[RenameEvent]) -> None:
+        """Register rename events, keeping rename_events in date order."""
+        for rename_event in rename_events:
+            self._renamed_to[rename_event.old_path].add(rename_event.new_path)
+
+        previous_date = self.rename_events[-1].date if self.rename_events else None
+        in_order = True
+        for rename_event in rename_events:
+            if previous_date is not None and rename_event.date < previous_date:
+                in_order = False
+                break
+            previous_date = rename_event.date
+
+        if in_order:
+            for rename_event in rename_events:
+                self._renamed_into[rename_event.new_path].append(
+                    len(self.rename_events)
+                )
+                self.rename_events.append(rename_event)
+            return
+
+        # 日付順でないイベントを含む場合は並べ直してインデックスを作り直す
+        self.rename_events = sorted(
+            [*self.rename_events, *rename_events], key=attrgetter("date")
+        )
+        self._renamed_into.clear()
+        for index, event in enumerate(self.rename_events):
+            self._renamed_into[event.new_path].append(index)
+        self._history_cache.clear()
+        self._history_dependents.clear()
+
+    def _classify_operations(self, path: str) -> None:
+        """Set the operation of every revision of a file.
+
+        The oldest revision is "added" unless it is a rename, and revisions of
+        files that no longer exist in current_files are "deleted".
+
+        Args:
+        ----
+            path (str): The path of the file to classify.
+
+        """
+        for index, entry in enumerate(self.file_changes[path]):
+            entry.operation = self._operation_for(entry, oldest=index == 0)
+
+    def _operation_for(self, entry: FileRevision, *, oldest: bool) -> OperationType:
+        """Decide the operation of a revision.
+
+        Args:
+        ----
+            entry (FileRevision): The revision to classify.
+            oldest (bool): Whether it is the oldest revision of its file.
+
+        Returns:
+        -------
+            OperationType: "renamed" for renames, "added" for the oldest
+                           revision, "deleted" for files that no longer exist in
+                           current_files, and "modified" otherwise.
+
+        """
+        if entry.old_path:
+            return "renamed"
+        if oldest:
+            return "added"
+        if entry.path not in self.current_files:
+            return "deleted"
+        return "modified"
+
+    def _invalidate_history(self, paths: set[str]) -> None:
+        """Drop memoized histories that include any of the given paths."""
+        for path in paths:
+            for key in self._history_dependents.pop(path, ()):
+                self._history_cache.pop(key, None)
+
+    def _previous_rename(self, path: str, before: int) -> int | None:
+        """Find the latest rename event into a path that precedes an index.
+
+        Args:
+        ----
+            path (str): The path the file was renamed to.
+            before (int): Only events with an index lower than this are considered.
+
+        Returns:
+        -------
+            int | None: The index of the matching event in rename_events,
+                        or None if the path was not renamed before that point.
+
+        """
+        indices = self._renamed_into.get(path)
+        if not indices:
+            return None
+
+        position = bisect_left(indices, before)
+        return indices[position - 1] if position else None
+
+    def _get_path_at_date(self, current_path: str, target_date: int) -> str:
         """Get the file path at a specific date, considering renames.
 
         Args:
         ----
             current_path (str): The current file path.
-            target_date (str): The date to check for the file path.
+            target_date (int): The epoch timestamp to check for the file path.
 
         Returns:
         -------
@@ -129,12 +526,14 @@ class GitFileHistoryTracker:
 
         """
         path = current_path
+        index = self._previous_rename(path, len(self.rename_events))
 
-        for rename_event in reversed(self.rename_events):
+        while index is not None:
+            rename_event = self.rename_events[index]
             if rename_event.date <= target_date:
                 break
-            if rename_event.new_path == path:
-                path = rename_event.old_path
+            path = rename_event.old_path
+            index = self._previous_rename(path, index)
 
         return path
 
@@ -152,35 +551,60 @@ class GitFileHistoryTracker:
         """
         paths = [current_path]
         path = current_path
+        index = self._previous_rename(path, len(self.rename_events))
 
-        for rename_event in reversed(self.rename_events):
-            if rename_event.new_path == path:
-                path = rename_event.old_path
-                paths.append(path)
+        while index is not None:
+            path = self.rename_events[index].old_path
+            paths.append(path)
+            index = self._previous_rename(path, index)
 
         return paths
 
-    def get_history(self, path: str) -> list[GitFileRevision]:
-        """Get the history of a specific file by its path.
+    def _get_file_history(self, path: str) -> _FileHistory:
+        """Get the memoized, rename-aware history of a file.
 
         Args:
         ----
-            path (str): The path of the file to retrieve history for.
+            path (str): The path of the file.
 
         Returns:
         -------
-            list[GitFileRevision]: A list of GitFileRevision for the specified file.
+            _FileHistory: The history of the file from newest to oldest.
 
         """
-        history = []
+        file_history = self._history_cache.get(path)
+        if file_history is not None:
+            return file_history
+
+        revisions: list[FileRevision] = []
         historical_paths = self._get_all_historical_paths(path)
 
         for historical_path in historical_paths:
             if historical_path in self.file_changes:
-                history.extend(self.file_changes[historical_path])
+                revisions.extend(self.file_changes[historical_path])
+            self._history_dependents[historical_path].add(path)
+
+        revisions.sort(key=lambda x: x.date, reverse=True)
+        file_history = _FileHistory(
+            revisions, [-revision.date for revision in revisions]
+        )
+        self._history_cache[path] = file_history
+        return file_history
+
+    def get_history(self, path: str) -> list[FileRevision]:
+        """Get the history of a specific file by its path.
+
+        Args:
+        ----
+            path (str): The path of the file to retrieve history for.
 
-        history.sort(key=lambda x: x["date"], reverse=True)
-        return history
+        Returns:
+        -------
+            list[FileRevision]: A list of FileRevision for the specified file,
+                                   from newest to oldest.
+
+        """
+        return list(self._get_file_history(path).revisions)
 
     def get_rename_history(self, path: str) -> list[str]:
         """Get the rename history for a file (newest to oldest).
@@ -196,6 +620,32 @@ class GitFileHistoryTracker:
         """
         return self._get_all_historical_paths(path)
 
+    def get_successor_paths(self, path: str) -> set[str]:
+        """Get every path a file was renamed to after having the given path.
+
+        Renames are followed regardless of their order in time, so the result
+        may include more paths than the file actually had.
+
+        Args:
+        ----
+            path (str): A current or historical path of the file.
+
+        Returns:
+        -------
+            set[str]: The given path and all paths it was renamed to.
+
+        """
+        successors = {path}
+        pending = [path]
+
+        while pending:
+            for new_path in self._renamed_to.get(pending.pop(), ()):
+                if new_path not in successors:
+                    successors.add(new_path)
+                    pending.append(new_path)
+
+        return successors
+
     def get_file_stats(self, path: str) -> dict[str, int]:
         """Get statistics for a file across its entire history.
 
@@ -210,22 +660,23 @@ class GitFileHistoryTracker:
                             changes, and rename count.
 
         """
-        history = self.get_history(path)
+        history = self._get_file_history(path).revisions
 
         if not history:
             return {}
 
         return {
             "total_commits": len(history),
-            "total_insertions": sum(revision["insertions"] for revision in history),
-            "total_deletions": sum(revision["deletions"] for revision in history),
+            "total_insertions": sum(revision.insertions or 0 for revision in history),
+            "total_deletions": sum(revision.deletions or 0 for revision in history),
             "total_changes": sum(
-                revision["insertions"] + revision["deletions"] for revision in history
+                (revision.insertions or 0) + (revision.deletions or 0)
+                for revision in history
             ),
             "rename_count": len(self.get_rename_history(path)) - 1,
         }
 
-    def get_latest_commit(self, path: str) -> GitFileRevision | None:
+    def get_latest_commit(self, path: str) -> FileRevision | None:
         """Get the latest commit for a specific file.
 
         Args:
@@ -234,14 +685,14 @@ class GitFileHistoryTracker:
 
         Returns:
         -------
-            GitFileRevision | None: The latest commit information for the file,
+            FileRevision | None: The latest commit information for the file,
                                or None if no history exists.
 
         """
-        history = self.get_history(path)
+        history = self._get_file_history(path).revisions
         return history[0] if history else None
 
-    def get_oldest_commit(self, path: str) -> GitFileRevision | None:
+    def get_oldest_commit(self, path: str) -> FileRevision | None:
         """Get the oldest commit for a specific file.
 
         Args:
@@ -250,28 +701,30 @@ class GitFileHistoryTracker:
 
         Returns:
         -------
-            GitFileRevision | None: The oldest commit information for the file,
+            FileRevision | None: The oldest commit information for the file,
                                or None if no history exists.
 
         """
-        history = self.get_history(path)
+        history = self._get_file_history(path).revisions
         return history[-1] if history else None
 
-    def get_commits_since(self, path: str, since_date: str) -> list[GitFileRevision]:
+    def get_commits_since(self, path: str, since_date: int) -> list[FileRevision]:
         """Get commits for a path since the specified date.
 
         Args:
         ----
             path (str): The file path to check.
-            since_date (str): The date to filter commits from.
+            since_date (int): The epoch timestamp to filter commits from.
 
         Returns:
         -------
-            list[GitFileRevision]: List of commits after the specified date.
+            list[FileRevision]: List of commits after the specified date,
+                                   from newest to oldest.
 
         """
-        history = self.get_history(path)
-        return [commit for commit in history if commit["date"] > since_date]
+        file_history = self._get_file_history(path)
+        count = file_history.count_since(since_date)
+        return file_history.revisions[:count]
 
     @property
     def all_paths(self) -> set[str]:
@@ -0,0 +1,91 @@
+from history import GitFileHistoryTracker
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class HistoryArrays:
+    """Rename-aware histories of several files laid out as flat NumPy arrays.
+
+    The revisions of the i-th file occupy starts[i]:ends[i] of each array, from
+    newest to oldest like _FileHistory. Every revision also has a search key,
+    i * span + (newest_date - date), which increases across the whole array, so
+    the revisions after a date can be found for all files with a single
+    searchsorted call.
+    """
+
+    def __init__(self, tracker: GitFileHistoryTracker, paths: list[str]) -> None:
+        """Lay out the histories of the given paths.
+
+        Args:
+        ----
+            tracker (GitFileHistoryTracker): The tracker to read histories from.
+            paths (list[str]): The paths of the files, in the order used by the
+                               arrays.
+
+        Raises:
+        ------
+            ImportError: If NumPy is not installed.
+
+        """
+        if np is None:
+            msg = "NumPy is required for HistoryArrays"
+            raise ImportError(msg)
+
+        self.paths = paths
+
+        dates: list[int] = []
+        insertions: list[int] = []
+        deletions: list[int] = []
+        lengths: list[int] = []
+        for path in paths:
+            history = tracker.get_history(path)
+            dates.extend(revision.date for revision in history)
+            insertions.extend(revision.insertions or 0 for revision in history)
+            deletions.extend(revision.deletions or 0 for revision in history)
+            lengths.append(len(history))
+
+        self.dates = np.array(dates, dtype=np.int64)
+        self.ends = np.cumsum(np.array(lengths, dtype=np.int64))
+        self.starts = self.ends - np.array(lengths, dtype=np.int64)
+
+        self.newest_date = int(self.dates.max()) if dates else 0
+        self.span = (self.newest_date - int(self.dates.min()) + 1) if dates else 1
+        file_indices = np.repeat(np.arange(len(paths), dtype=np.int64), lengths)
+        self.keys = file_indices * self.span + (self.newest_date - self.dates)
+
+        # 先頭に 0 を置いた累積和 (区間和を差で求める)
+        self.insertions_cumsum = np.concatenate(
+            ([0], np.cumsum(np.array(insertions, dtype=np.int64)))
+        )
+        self.deletions_cumsum = np.concatenate(
+            ([0], np.cumsum(np.array(deletions, dtype=np.int64)))
+        )
+
+    def changes_since(
+        self, since_dates: "np.ndarray"
+    ) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Count and sum the revisions of each file after a date.
+
+        Args:
+        ----
+            since_dates (np.ndarray): One epoch timestamp per file. Revisions
+                                      committed strictly after it are counted.
+
+        Returns:
+        -------
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The number of revisions,
+                and the insertions and deletions summed over them, per file.
+
+        """
+        offsets = np.clip(self.newest_date - since_dates, 0, self.span)
+        query = np.arange(len(self.paths), dtype=np.int64) * self.span + offsets
+        # 各ファイルの区間内で since_dates より新しいリビジョンの終端
+        stops = np.searchsorted(self.keys, query, side="left")
+
+        counts = stops - self.starts
+        insertions = self.insertions_cumsum[stops] - self.insertions_cumsum[self.starts]
+        deletions = self.deletions_cumsum[stops] - self.deletions_cumsum[self.starts]
+        return counts, insertions, deletions
@@ -1,28 +1,10 @@
-import os
 import re
 from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass
-from pathlib import Path
 
-from dotenv import load_dotenv
-from github import Auth, Github
 from log import logger
 
-
-def load_existing_paths() -> set[str]:
-    """Load existing file paths from text files.
-
-    Returns
-    -------
-        set[str]: A set of existing file paths from the JSONL file.
-
-    """
-    root_dir = Path(__file__).resolve().parent.parent.parent
-    target_file = root_dir / "data" / "master" / "all_files.csv"
-    with Path.open(target_file, "r", encoding="utf-8") as f:
-        return {line.strip() for line in f if line.strip()}
-
-
 LANGUAGE_LABELS = [
     "language/en",
     "language/ko",
@@ -67,6 +49,9 @@ LANGUAGE_ABBR_IN_TITLE = [
     # "ar", # for now, Arabic is not supported
 ]
 
+# パス中で言語を表すセグメント
+LANGUAGE_SEGMENTS = frozenset([*LANGUAGE_ABBR_IN_TITLE, "pt", "zh-cn"])
+
 
 @dataclass
 class GitHubIssue:
@@ -78,30 +63,6 @@ class GitHubIssue:
     labels: list[str]
 
 
-def _get_issues(repo_name: str = "kubernetes/website") -> list[GitHubIssue]:
-    """Fetch open issues for a GitHub repository."""
-    load_dotenv()
-
-    auth = Auth.Token(os.getenv("KUBERNETES_WEBSITE_READ_GITHUB_TOKEN"))
-    g = Github(auth=auth)
-    query = f"repo:{repo_name} is:issue is:open"
-    raw_issues = g.search_issues(query=query, sort="created", order="desc")
-
-    issues = [
-        GitHubIssue(
-            number=issue.number,
-            title=issue.title,
-            url=issue.html_url,
-            labels=[label.name for label in issue.labels],
-        )
-        for issue in raw_issues
-    ]
-
-    g.close()
-
-    return issues
-
-
 def guess_language(issue: GitHubIssue) -> str | None:
     """Guess the language and path for a GitHub issue."""
     guessed_lang = None
@@ -148,139 +109,175 @@ def extract_path_like_string(title: str) -> str | None:
     return longest_match
 
 
-def gen_path_candidates(path: str, language: str) -> list[str]:
-    """Generate a list of paths candidates based on the given path and language."""
-    path = path.strip().lower()
+def _normalize_path(path: str, language: str | None = None) -> list[str]:
+    """Split a path into the segments that are compared when matching.
 
-    language_pattern = (
-        r"\b(" + "|".join(re.escape(lang) for lang in LANGUAGE_ABBR_IN_TITLE) + r")\b"
-    )
-    path = re.sub(language_pattern, language, path)
+    The extension and a trailing index or _index are dropped, and underscores
+    are replaced with hyphens except in segments such as _posts. If language
+    is given, every language segment is replaced with it.
 
-    if path.startswith("k8s.io/"):
-        path = path.lstrip("k8s.io/")
+    Example:
+    -------
+        content/ja/docs/concepts/_index.md -> [content, ja, docs, concepts]
+        /ko/docs/setup/best_practices/, ja -> [ja, docs, setup, best-practices]
 
-    hyphenated_parts = []
-    for part in path.split("/"):
-        if not part:
+    """
+    segments = []
+    for segment in path.strip().lower().split("/"):
+        if not segment:
             continue
-        if part.startswith("_"):
-            hyphenated_parts.append(part)
+        if language and segment in LANGUAGE_SEGMENTS:
+            segments.append(language)
+        elif segment.startswith("_"):
+            segments.append(segment)
         else:
-            hyphenated_parts.append(part.replace("_", "-"))
-    hyphenated_path = "/".join(hyphenated_parts)
-
-    common_path_prefixes = [
-        "",
-        "content/",
-        f"content/{language}/",
-        f"content/{language}/docs/",
-        f"content/{language}/docs/concepts/",
-        f"content/{language}/docs/contribute/",
-        f"content/{language}/docs/doc-contributor-tools/",
-        f"content/{language}/docs/home/",
-        f"content/{language}/docs/images/",
-        f"content/{language}/docs/reference/",
-        f"content/{language}/docs/setup/",
-        f"content/{language}/docs/tasks/",
-        f"content/{language}/docs/tutorials/",
-        f"content/{language}/blog/",
-        f"content/{language}/blog/_posts/",
-        f"content/{language}/careers/",
-        f"content/{language}/case-studies/",
-        f"content/{language}/community/",
-        f"content/{language}/examples/",
-        f"content/{language}/includes/",
-        f"content/{language}/partners/",
-        f"content/{language}/releases/",
-        f"content/{language}/training/",
-    ]
+            segments.append(segment.replace("_", "-"))
+
+    if segments:
+        segments[-1] = segments[-1].removesuffix(".md").removesuffix(".html")
+        if segments[-1] in {"index", "_index"}:
+            segments.pop()
+
+    return segments
+
+
+class PathIndex:
+    """Find the existing path that a path-like string in an issue refers to.
+
+    Every existing path is indexed under each tail of its normalized segments,
+    so content/ja/docs/concepts/overview.md can be found from docs/concepts/
+    overview, concepts/overview or overview. A lookup tries the tails of the
+    string from the longest, which takes one dictionary lookup per segment.
+
+    English paths are expected to exist in each language of
+    LANGUAGE_ABBR_IN_TITLE, so they are indexed once and shared by the
+    languages. Only the pages that have no English counterpart are indexed per
+    language.
+    """
 
-    candidates = set()
-
-    # prefix + path
-    for prefix in common_path_prefixes:
-        base = str(Path(prefix).joinpath(path))
-        candidates.add(base)
-        if not base.endswith((".md", ".html")):
-            candidates.add(base + ".md")
-            candidates.add(base + "/index.md")
-            candidates.add(base + "/_index.md")
-            candidates.add(base + ".html")
-            candidates.add(base + "/index.html")
-            candidates.add(base + "/_index.html")
-
-        base2 = str(Path(prefix).joinpath(hyphenated_path))
-        candidates.add(base2)
-        if not base2.endswith((".md", ".html")):
-            candidates.add(base2 + ".md")
-            candidates.add(base2 + "/index.md")
-            candidates.add(base2 + "/_index.md")
-            candidates.add(base2 + ".html")
-            candidates.add(base2 + "/index.html")
-            candidates.add(base2 + "/_index.html")
-
-    # shorten path
-    parts = path.split("/")
-    for i in range(1, len(parts)):
-        base = "/".join(parts[i:])
-        candidates.add(base)
-        if not base.endswith((".md", ".html")):
-            candidates.add(base + ".md")
-            candidates.add(base + "/index.md")
-            candidates.add(base + "/_index.md")
-            candidates.add(base + ".html")
-            candidates.add(base + "/index.html")
-            candidates.add(base + "/_index.html")
-
-    parts2 = hyphenated_path.split("/")
-    for i in range(1, len(parts2)):
-        base = "/".join(parts2[i:])
-        candidates.add(base)
-        if not base.endswith((".md", ".html")):
-            candidates.add(base + ".md")
-            candidates.add(base + "/index.md")
-            candidates.add(base + "/_index.md")
-            candidates.add(base + ".html")
-            candidates.add(base + "/index.html")
-            candidates.add(base + "/_index.html")
-
-    return list(candidates)
-
-
-def guess_path(issue: GitHubIssue, language: str) -> str | None:
-    """Guess the path for a GitHub issue."""
+    def __init__(self, existing_paths: Iterable[str]) -> None:
+        """Index the existing paths."""
+        existing_paths = set(existing_paths)
+        self._english_tails: dict[str, str] = {}
+        self._tails: dict[str, dict[str, str]] = defaultdict(dict)
+
+        for path in existing_paths:
+            language = _path_language(path)
+            if language == "en":
+                _add_tails(self._english_tails, path)
+            elif (
+                language not in LANGUAGE_ABBR_IN_TITLE
+                or path.replace(f"content/{language}/", "content/en/", 1)
+                not in existing_paths
+            ):
+                _add_tails(self._tails[language], path)
+
+    def match(self, path_like_string: str, language: str) -> str | None:
+        """Find the existing path of a language that the string refers to.
+
+        Args:
+        ----
+            path_like_string (str): A path found in an issue title.
+            language (str): The language of the issue.
+
+        Returns:
+        -------
+            str | None: The path that shares the longest tail with the string.
+                        Among paths with the same tail, the shallowest and then
+                        alphabetically first one is returned.
+
+        """
+        tails = self._tails.get(language, {})
+        english_tails = (
+            self._english_tails if language in LANGUAGE_ABBR_IN_TITLE else {}
+        )
+
+        segments = _normalize_path(path_like_string, language)
+        english_segments = _normalize_path(path_like_string, "en")
+        for i in range(len(segments)):
+            candidates = []
+            path = tails.get("/".join(segments[i:]))
+            if path is not None:
+                candidates.append(path)
+            english_path = english_tails.get("/".join(english_segments[i:]))
+            if english_path is not None:
+                candidates.append(
+                    english_path.replace("content/en/", f"content/{language}/")
+                )
+            if candidates:
+                return min(candidates, key=_path_rank)
+
+        return None
+
+
+def _path_language(path: str) -> str | None:
+    """Get the language directory of a path such as content/ja/docs/home.md."""
+    parts = path.split("/", 2)
+    return parts[1] if len(parts) == 3 and parts[0] == "content" else None
+
+
+def _add_tails(tails: dict[str, str], path: str) -> None:
+    """Index a path under every tail of its normalized segments."""
+    segments = _normalize_path(path)
+    for i in range(len(segments)):
+        tail = "/".join(segments[i:])
+        current = tails.get(tail)
+        if current is None or _path_rank(path) < _path_rank(current):
+            tails[tail] = path
+
+
+def _path_rank(path: str) -> tuple[int, str]:
+    """Order paths sharing a tail: shallower paths first, then by name."""
+    return path.count("/"), path
+
+
+def guess_path(issue: GitHubIssue, language: str, path_index: PathIndex) -> str | None:
+    """Guess the path for a GitHub issue.
+
+    Args:
+    ----
+        issue (GitHubIssue): The issue whose title mentions the path.
+        language (str): The language guessed for the issue.
+        path_index (PathIndex): The index of the existing paths.
+
+    Returns:
+    -------
+        str | None: The existing path that the title refers to, if any.
+
+    """
     path_like_string = extract_path_like_string(issue.title)
-    all_paths = {
-        path.replace("content/en/", f"content/{lang}/")
-        for lang in LANGUAGE_ABBR_IN_TITLE
-        for path in load_existing_paths()
-    }
 
     if not path_like_string:
         return None
 
-    guessed_path = None
-    path_candidates = gen_path_candidates(path_like_string, language)
-    for candidate in path_candidates:
-        if candidate in all_paths:
-            guessed_path = candidate
-            break
-
-    return guessed_path
+    return path_index.match(path_like_string, language)
 
 
-def get_issues_by_file(
-    repo_name: str = "kubernetes/website",
+def group_issues_by_file(
+    issues: Iterable[GitHubIssue], existing_paths: Iterable[str]
 ) -> dict[str, list[GitHubIssue]]:
-    """Get issues by file from a GitHub repository."""
-    logger.info(f"Fetching issues from {repo_name}...")
+    """Group issues by the file their title refers to.
+
+    Args:
+    ----
+        issues (Iterable[GitHubIssue]): The open issues.
+        existing_paths (Iterable[str]): The paths in all_files.csv.
 
+    Returns:
+    -------
+        dict[str, list[GitHubIssue]]: The issues keyed by the guessed path.
+
+    """
     issues_by_file: dict[str, list[GitHubIssue]] = defaultdict(list)
-    issues = _get_issues(repo_name=repo_name)
+    # 既存パスの索引は全 issue で共有する
+    path_index = PathIndex(existing_paths)
     for issue in issues:
         guessed_language = guess_language(issue)
-        guessed_path = guess_path(issue, guessed_language) if guessed_language else None
+        guessed_path = (
+            guess_path(issue, guessed_language, path_index)
+            if guessed_language
+            else None
+        )
 
         logger.info(f"Issue #{issue.number}: {issue.title}")
         logger.info(f"Guessed path for issue #{issue.number}: {guessed_path}")
@@ -291,7 +288,3 @@ def get_issues_by_file(
     logger.info(f"Found {len(issues_by_file)} files with issues.")
 
     return dict(issues_by_file)
-
-
-if __name__ == "__main__":
-    get_issues_by_file()
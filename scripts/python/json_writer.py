@@ -0,0 +1,176 @@
+import json
+from collections.abc import Iterable
+from typing import Any, TextIO
+
+from utils import serialize_datetime
+
+
+def _snake_to_camel(key: str) -> str:
+    """Convert a single snake_case key to camelCase."""
+    return "".join(
+        word.capitalize() if i > 0 else word for i, word in enumerate(key.split("_"))
+    )
+
+
+# 出力する辞書のキー。パスなど動的なキーは初回に変換して追加する
+CAMEL_CASE_KEYS: dict[str, str] = {
+    key: _snake_to_camel(key)
+    for key in (
+        "articles",
+        "author",
+        "average_session_duration",
+        "categories",
+        "category",
+        "commit",
+        "commits",
+        "commits_behind",
+        "date",
+        "days_behind",
+        "deletions",
+        "deletions_behind_lines",
+        "english_latest_date",
+        "english_path",
+        "english_url",
+        "files",
+        "hash",
+        "insertions",
+        "insertions_behind_lines",
+        "issues",
+        "labels",
+        "language_shards",
+        "languages",
+        "last_updated",
+        "message",
+        "missing_commits",
+        "new_users",
+        "number",
+        "old_path",
+        "operation",
+        "path",
+        "prs",
+        "severity",
+        "shard_size",
+        "shards",
+        "status",
+        "target_latest_date",
+        "target_path",
+        "title",
+        "total_change_lines",
+        "translation_url",
+        "translations",
+        "url",
+        "views",
+    )
+}
+
+
+def camel_case_key(key: str) -> str:
+    """Convert a snake_case key to camelCase like convert_keys_to_camel_case."""
+    try:
+        return CAMEL_CASE_KEYS[key]
+    except KeyError:
+        camel_key = _snake_to_camel(key)
+        CAMEL_CASE_KEYS[key] = camel_key
+        return camel_key
+
+
+def _camel_case(obj: object) -> object:
+    """Convert the keys of one entry to camelCase through CAMEL_CASE_KEYS."""
+    if isinstance(obj, dict):
+        return {camel_case_key(key): _camel_case(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_camel_case(item) for item in obj]
+    return obj
+
+
+class JSONStreamWriter:
+    """Write JSON with camelCase keys one entry at a time.
+
+    The outer objects and arrays, down to stream_depth, are written as they
+    are iterated, and only the entries below them are converted and encoded
+    as a whole. The output is the same as json.dump of
+    convert_keys_to_camel_case(obj) with indent=2, or with no whitespace at
+    all in compact mode.
+    """
+
+    def __init__(self, f: TextIO, *, compact: bool = False) -> None:
+        """Initialize the writer for a text file."""
+        self.f = f
+        self.indent = None if compact else 2
+        self.separators = (",", ":") if compact else (",", ": ")
+
+    def write(self, obj: object, stream_depth: int = 0, level: int = 0) -> None:
+        """Write a value, streaming its outer stream_depth levels.
+
+        Args:
+        ----
+            obj (object): The value to write.
+            stream_depth (int): The number of nesting levels to write one entry
+                                at a time.
+            level (int): The nesting level of obj, for indentation.
+
+        """
+        if stream_depth > 0 and isinstance(obj, dict):
+            self.write_object(obj.items(), stream_depth, level)
+        elif stream_depth > 0 and isinstance(obj, list):
+            self._write_container("[", "]", obj, stream_depth, level, keyed=False)
+        else:
+            text = json.dumps(
+                _camel_case(obj),
+                indent=self.indent,
+                separators=self.separators,
+                default=serialize_datetime,
+            )
+            if self.indent is not None and level:
+                text = text.replace("\n", self._newline(level))
+            self.f.write(text)
+
+    def write_object(
+        self,
+        items: Iterable[tuple[str, Any]],
+        stream_depth: int = 1,
+        level: int = 0,
+    ) -> None:
+        """Write an object from its items, which may be generated lazily.
+
+        Args:
+        ----
+            items (Iterable[tuple[str, Any]]): The keys and values of the object.
+            stream_depth (int): The number of nesting levels, including this
+                                object, to write one entry at a time.
+            level (int): The nesting level of the object, for indentation.
+
+        """
+        self._write_container("{", "}", items, stream_depth, level, keyed=True)
+
+    def _write_container(  # noqa: PLR0913
+        self,
+        start: str,
+        end: str,
+        entries: Iterable[Any],
+        stream_depth: int,
+        level: int,
+        *,
+        keyed: bool,
+    ) -> None:
+        item_separator, key_separator = self.separators
+        empty = True
+        for entry in entries:
+            self.f.write(start if empty else item_separator)
+            self.f.write(self._newline(level + 1))
+            empty = False
+            if keyed:
+                key, entry = entry  # noqa: PLW2901
+                self.f.write(json.dumps(camel_case_key(key)))
+                self.f.write(key_separator)
+            self.write(entry, stream_depth - 1, level + 1)
+
+        if empty:
+            self.f.write(start + end)
+        else:
+            self.f.write(self._newline(level) + end)
+
+    def _newline(self, level: int) -> str:
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * level)
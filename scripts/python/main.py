@@ -1,19 +1,66 @@
+import argparse
 import json
+import os
+import pickle
 import re
-import xml.etree.ElementTree as ET
+import time
+from collections.abc import Callable, Iterator
+from functools import partial
 from pathlib import Path
 
 import requests
 from const import LANGUAGE_CODES
+from dotenv import load_dotenv
 from exporter import process_translation_results
+from github_cache import load_github_cache, save_github_cache, sync_github_cache
 from history import GitFileHistoryTracker
+from issue import GitHubIssue, group_issues_by_file
 from log import logger
-from models import GitCommitDict
-from translation_status import TranslationStatusTracker
+from models import GitCommitRecordDict, GitHistoryPositionDict
+from page_view import PageView, aggregate_page_views, map_page_views
+from pipeline import (
+    Stage,
+    run_stages,
+    run_stages_in_main_thread,
+    start_stages_in_process,
+)
+from publish import staged_output
+from pull_requests import (
+    GitHubGraphQLTransport,
+    GitHubPullRequest,
+    GraphQLError,
+    group_prs_by_file,
+)
+from sitemap import load_sitemap_urls
+from translation_status import (
+    AnalysisSnapshot,
+    TranslationStatusResult,
+    TranslationStatusTracker,
+)
+from utils import get_peak_rss_mib
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 INPUT_FILE = ROOT_DIR / "data" / "master" / "git_history.jsonl"
 OUTPUT_DIR = ROOT_DIR / "data" / "output"
+CACHE_DIR = ROOT_DIR / "data" / "cache"
+HISTORY_SNAPSHOT_FILE = CACHE_DIR / "git_history.pickle"
+ANALYSIS_SNAPSHOT_FILE = CACHE_DIR / "translation_status.pickle"
+SITEMAP_CACHE_DIR = CACHE_DIR / "sitemaps"
+GITHUB_CACHE_FILE = CACHE_DIR / "github.json"
+PAGE_VIEW_FILE = ROOT_DIR / "data" / "master" / "page_view.csv"
+ANALYSIS_SNAPSHOT_VERSION = 2
+
+SANITIZE_PATTERN = re.compile(r'\\(?![\\bfnrt"/])')
 
 
 def sanitize(line: str) -> str:
@@ -28,59 +75,217 @@ def sanitize(line: str) -> str:
         str: The sanitized string with backslashes replaced.
 
     """
-    return re.compile(r'\\(?![\\bfnrt"/])').sub(r"\\\\", line)
+    return SANITIZE_PATTERN.sub(r"\\\\", line)
 
 
-def load_json_records(filepath: Path | str) -> list[GitCommitDict]:
-    """Load JSON records from a file, handling potential formatting issues.
+def get_json_decoder() -> Callable[[bytes], GitCommitRecordDict]:
+    """Get the fastest available decoder for git_history.jsonl lines.
+
+    msgspec decodes only the fields used for analysis, orjson is used if
+    msgspec is not installed, and the standard json module otherwise.
+
+    Returns
+    -------
+        Callable[[bytes], GitCommitRecordDict]: A function that decodes a line.
+            It raises ValueError if the line is not valid JSON.
+
+    """
+    if msgspec is not None:
+        return msgspec.json.Decoder(GitCommitRecordDict).decode
+    if orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+def decode_record(
+    raw_line: bytes,
+    line_no: int,
+    decode: Callable[[bytes], GitCommitRecordDict],
+) -> GitCommitRecordDict | None:
+    """Decode a line of git_history.jsonl, fixing unescaped backslashes.
 
     Args:
     ----
-        filepath (Path | str): The path to the JSONL file.
+        raw_line (bytes): The line to decode.
+        line_no (int): The line number, used in logs.
+        decode (Callable[[bytes], GitCommitRecordDict]): The fast decoder.
 
     Returns:
     -------
-        list[dict[str, Any]]: A list of JSON objects loaded from the file.
+        GitCommitRecordDict | None: The record, or None if the line is not
+                                    valid JSON even after the fix.
+
+    """
+    try:
+        return decode(raw_line)
+    except ValueError:
+        original = raw_line.decode("utf-8").strip()
+        fixed = sanitize(original)
+        try:
+            logger.warning(
+                "Fixed line %d - Original: %s => Fixed: %s",
+                line_no,
+                original,
+                fixed,
+            )
+            return json.loads(fixed)
+        except json.JSONDecodeError:
+            logger.exception("Failed to decode line %d", line_no)
+            return None
+
+
+def iter_json_records(
+    filepath: Path | str,
+    position: GitHistoryPositionDict | None = None,
+) -> Iterator[GitCommitRecordDict]:
+    """Iterate over JSON records in a file, handling potential formatting issues.
+
+    Records are read one line at a time, so they can be consumed without
+    holding the whole file in memory. Fields not used for analysis (summary)
+    are dropped. A last line without a newline is read if it is valid JSON;
+    otherwise it is taken to be still being written, and it is left for the
+    next read without advancing the position.
+
+    Args:
+    ----
+        filepath (Path | str): The path to the JSONL file.
+        position (GitHistoryPositionDict | None): If given, reading starts at
+            position["offset"] and the position is advanced past the records read.
+
+    Yields:
+    ------
+        GitCommitRecordDict: The JSON objects loaded from the file.
 
     Raises:
     ------
         FileNotFoundError: If the file doesn't exist.
 
     """
-    records: list[GitCommitDict] = []
     path = Path(filepath)
 
     if not path.exists():
         msg = f"File not found: {path}"
         raise FileNotFoundError(msg)
 
-    logger.info("Start Loading JSON records from: %s", path)
+    if position is None:
+        position = new_position()
 
-    with path.open(encoding="utf-8") as f:
-        for line_no, line in enumerate(f, 1):
-            original = line.strip()
-            if not original:
+    logger.info(
+        "Start Loading JSON records from: %s (offset %d)", path, position["offset"]
+    )
+    started_at = time.perf_counter()
+    decode = get_json_decoder()
+    record_count = 0
+
+    with path.open("rb") as f:
+        f.seek(position["offset"])
+        line_no = position["record_count"]
+        for raw_line in iter(f.readline, b""):
+            line_offset = position["offset"]
+            if raw_line.isspace():
+                position["offset"] += len(raw_line)
                 continue
-            try:
-                obj = json.loads(original)
-            except json.JSONDecodeError:
-                fixed = sanitize(original)
+
+            if raw_line.endswith(b"\n"):
+                obj = decode_record(raw_line, line_no + 1, decode)
+            else:
                 try:
+                    obj = decode(raw_line)
+                except ValueError:
+                    # 改行のない最終行が読めなければ書き込み途中とみなし、
+                    # 位置を進めずに次回読み込む
                     logger.warning(
-                        "Fixed line %d - Original: %s => Fixed: %s",
-                        line_no,
-                        original,
-                        fixed,
+                        "Stopped at an incomplete last line at offset %d of %s",
+                        line_offset,
+                        path,
                     )
-                    obj = json.loads(fixed)
-                except json.JSONDecodeError:
-                    logger.exception("Failed to decode line %d", line_no)
-                    continue
+                    break
+
+            position["offset"] += len(raw_line)
+            line_no += 1
+            position["record_count"] = line_no
+            if obj is None:
+                continue
+
+            obj.pop("summary", None)
+            position["last_record_offset"] = line_offset
+            position["last_commit_hash"] = obj["hash"]
+            record_count += 1
+            yield obj
+
+    logger.info(
+        "Successfully loaded %d records from %s in %.2fs (peak RSS: %.1f MiB)",
+        record_count,
+        path,
+        time.perf_counter() - started_at,
+        get_peak_rss_mib(),
+    )
+
+
+def load_json_records(
+    filepath: Path | str,
+    position: GitHistoryPositionDict | None = None,
+) -> list[GitCommitRecordDict]:
+    """Load JSON records from a file, handling potential formatting issues.
+
+    Args:
+    ----
+        filepath (Path | str): The path to the JSONL file.
+        position (GitHistoryPositionDict | None): If given, reading starts at
+            position["offset"] and the position is advanced past the records read.
+
+    Returns:
+    -------
+        list[GitCommitRecordDict]: A list of JSON objects loaded from the file.
+
+    Raises:
+    ------
+        FileNotFoundError: If the file doesn't exist.
+
+    """
+    return list(iter_json_records(filepath, position))
+
 
-            records.append(obj)
+def new_position() -> GitHistoryPositionDict:
+    """Create a position pointing to the beginning of git_history.jsonl."""
+    return GitHistoryPositionDict(
+        offset=0,
+        record_count=0,
+        last_record_offset=0,
+        last_commit_hash=None,
+    )
+
+
+def is_valid_position(filepath: Path, position: GitHistoryPositionDict) -> bool:
+    """Check that git_history.jsonl still starts with the records read before.
 
-    logger.info("Successfully loaded %d records from %s", len(records), INPUT_FILE)
-    return records
+    git_history.jsonl is only appended to, so the last record read before must
+    still end exactly at the saved offset.
+
+    Args:
+    ----
+        filepath (Path): The path to the JSONL file.
+        position (GitHistoryPositionDict): The position saved by a previous run.
+
+    Returns:
+    -------
+        bool: True if reading can continue from the position.
+
+    """
+    if not filepath.exists() or filepath.stat().st_size < position["offset"]:
+        return False
+
+    if position["last_commit_hash"] is None:
+        return position["offset"] == 0
+
+    with filepath.open("rb") as f:
+        f.seek(position["last_record_offset"])
+        line = f.readline()
+
+    return (
+        position["last_record_offset"] + len(line) == position["offset"]
+        and position["last_commit_hash"].encode() in line
+    )
 
 
 def load_existing_paths() -> set[str]:
@@ -105,56 +310,371 @@ def load_existing_urls() -> set[str]:
 
     Comments:
     --------
-        This function fetches sitemap.xml files for each language and extracts URLs.
-        It handles both all localized sitemaps.
+        This function fetches sitemap.xml files for each language concurrently
+        and extracts URLs. Unchanged sitemaps are read from SITEMAP_CACHE_DIR.
         If a sitemap cannot be loaded, it logs an error but continues processing others.
 
     """
-    urls: set[str] = set()
+    return load_sitemap_urls(LANGUAGE_CODES, SITEMAP_CACHE_DIR)
 
-    for lang in LANGUAGE_CODES:
-        sitemap_url = f"https://kubernetes.io/{lang}/sitemap.xml"
-        try:
-            response = requests.get(sitemap_url, timeout=10)
-            response.raise_for_status()
 
-            root = ET.fromstring(response.text)  # noqa: S314
-            for url_elem in root.findall(
-                ".//{http://www.sitemaps.org/schemas/sitemap/0.9}loc"
-            ):
-                urls.add(url_elem.text.strip())
+def load_github_mappings(
+    existing_paths: set[str],
+) -> tuple[dict[str, list[GitHubIssue]], dict[str, list[GitHubPullRequest]]]:
+    """Sync the GitHub cache and group the open issues and PRs by file.
 
-        except Exception:
-            logger.exception("Error loading sitemap for %s", lang)
+    Args:
+    ----
+        existing_paths (set[str]): The paths in all_files.csv.
 
-    return urls
+    Returns:
+    -------
+        tuple[dict[str, list[GitHubIssue]], dict[str, list[GitHubPullRequest]]]:
+            The issues and the pull requests keyed by file path.
+
+    Comments:
+    --------
+        Only the issues and PRs updated since the last run are downloaded. If
+        the sync fails, it logs an error and the cached ones are used.
 
+    """
+    cache = load_github_cache(GITHUB_CACHE_FILE)
 
-def main() -> None:
-    """Load JSONL file and save translation results to output directory."""
+    load_dotenv()
+    transport = GitHubGraphQLTransport(
+        os.getenv("KUBERNETES_WEBSITE_READ_GITHUB_TOKEN")
+    )
     try:
-        records = load_json_records(INPUT_FILE)
+        sync_github_cache(cache, transport.session, transport)
+    except (requests.RequestException, GraphQLError):
+        logger.exception("Error syncing issues and pull requests from GitHub")
+    else:
+        save_github_cache(cache, GITHUB_CACHE_FILE)
+    finally:
+        transport.close()
+
+    return (
+        group_issues_by_file(cache.open_issues(), existing_paths),
+        group_prs_by_file(cache.open_pull_requests()),
+    )
+
+
+def load_file_history_tracker(
+    current_files: set[str],
+    position: GitHistoryPositionDict,
+    *,
+    full: bool = False,
+) -> tuple[GitFileHistoryTracker, GitHistoryPositionDict | None, set[str]]:
+    """Load the file history tracker, reusing the snapshot of the previous run.
+
+    Args:
+    ----
+        current_files (set[str]): Set of file paths that currently exist.
+        position (GitHistoryPositionDict): Updated in place to the position in
+            git_history.jsonl the returned tracker is built up to.
+        full (bool): Ignore the snapshot and build the tracker from scratch.
+
+    Returns:
+    -------
+        tuple[GitFileHistoryTracker, GitHistoryPositionDict | None, set[str]]:
+            The tracker, the position the snapshot was built up to (None if the
+            tracker was built from scratch), and the paths changed since then.
+
+    """
+    snapshot = (
+        None if full else GitFileHistoryTracker.load_snapshot(HISTORY_SNAPSHOT_FILE)
+    )
+
+    if snapshot is not None and is_valid_position(INPUT_FILE, snapshot[1]):
+        file_history_tracker, saved_position = snapshot
+        position.update(saved_position)
+        records = load_json_records(INPUT_FILE, position)
+        changed_paths = file_history_tracker.add_commits(
+            records, current_files=current_files
+        )
+        logger.info(
+            "Loaded history snapshot: %d new commits changed %d paths",
+            len(records),
+            len(changed_paths),
+        )
+        return file_history_tracker, saved_position, changed_paths
+
+    if snapshot is not None:
+        logger.info("git_history.jsonl was rewritten. Rebuilding history.")
+
+    file_history_tracker = GitFileHistoryTracker(
+        commits=iter_json_records(INPUT_FILE, position), current_files=current_files
+    )
+    return file_history_tracker, None, set()
+
+
+def load_analysis_snapshot(
+    position: GitHistoryPositionDict,
+    filepath: Path,
+) -> AnalysisSnapshot | None:
+    """Load the results of the previous analysis if they match the position.
+
+    Args:
+    ----
+        position (GitHistoryPositionDict): The position in git_history.jsonl the
+                                           history snapshot was built up to.
+        filepath (Path): The path of the snapshot file.
+
+    Returns:
+    -------
+        AnalysisSnapshot | None: The previous results, or None if there is no
+                                 usable snapshot and a full analysis is needed.
+
+    """
+    if not filepath.exists():
+        return None
+
+    try:
+        with filepath.open("rb") as f:
+            version, snapshot = pickle.load(f)  # noqa: S301
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, OSError):
+        logger.exception("Failed to load analysis snapshot: %s", filepath)
+        return None
+
+    if version != ANALYSIS_SNAPSHOT_VERSION:
+        logger.info("Analysis snapshot version changed. Running full analysis.")
+        return None
+
+    if snapshot.position != position:
+        logger.info("Analysis snapshot is out of date. Running full analysis.")
+        return None
+
+    return snapshot
+
+
+def save_analysis_snapshot(
+    snapshot: AnalysisSnapshot,
+    filepath: Path,
+) -> None:
+    """Save analysis results for the next incremental run.
+
+    Args:
+    ----
+        snapshot (AnalysisSnapshot): The results to save.
+        filepath (Path): The path of the snapshot file.
+
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = filepath.with_suffix(".tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(
+            (ANALYSIS_SNAPSHOT_VERSION, snapshot), f, protocol=pickle.HIGHEST_PROTOCOL
+        )
+    tmp_path.replace(filepath)
+
+
+def analyze_translation_status(
+    existing_paths: set[str], *, full: bool = False, workers: int | None = None
+) -> dict[str, TranslationStatusResult] | None:
+    """Build the file histories and analyze the translation status.
+
+    Args:
+    ----
+        existing_paths (set[str]): The paths in all_files.csv.
+        full (bool): Analyze every file pair even if the results of the previous
+                     run are available.
+        workers (int | None): The number of worker processes for a full analysis.
+                              None analyzes in this process.
+
+    Returns:
+    -------
+        dict[str, TranslationStatusResult] | None: The results, or None if the
+                                                   history could not be loaded.
+
+    """
+    position = new_position()
+
+    try:
+        file_history_tracker, snapshot_position, changed_paths = (
+            load_file_history_tracker(existing_paths, position, full=full)
+        )
     except FileNotFoundError:
         logger.exception("File not found: %s")
-        return []
+        return None
     except Exception:
         logger.exception("An unexpected error occurred: %s")
-        return []
+        return None
+
+    snapshot = None
+    if snapshot_position is not None:
+        snapshot = load_analysis_snapshot(snapshot_position, ANALYSIS_SNAPSHOT_FILE)
 
-    existing_paths = load_existing_paths()
-    existing_urls = load_existing_urls()
-    file_history_tracker = GitFileHistoryTracker(
-        commits=records, current_files=existing_paths
-    )
     translation_tracker = TranslationStatusTracker(
         file_history_tracker=file_history_tracker,
         existing_paths=existing_paths,
     )
-    status_result = translation_tracker.analyze()
-    process_translation_results(status_result, existing_urls, output_dir=OUTPUT_DIR)
+    if snapshot is None:
+        status_result = translation_tracker.analyze(workers=workers)
+    else:
+        status_result = translation_tracker.analyze_incremental(
+            snapshot.results, changed_paths
+        )
+
+    file_history_tracker.save_snapshot(HISTORY_SNAPSHOT_FILE, position)
+    save_analysis_snapshot(
+        AnalysisSnapshot(position=position, results=status_result),
+        ANALYSIS_SNAPSHOT_FILE,
+    )
+
+    return status_result
+
+
+def export_translation_status(  # noqa: PLR0913
+    status_result: dict[str, TranslationStatusResult] | None,
+    existing_urls: set[str],
+    github_mappings: tuple[
+        dict[str, list[GitHubIssue]], dict[str, list[GitHubPullRequest]]
+    ],
+    page_views: dict[str, PageView],
+    *,
+    compact: bool = False,
+    commit_table: bool = False,
+    matrix_shard_size: int | None = None,
+) -> None:
+    """Save the results with their URLs, issues, PRs and page views."""
+    if status_result is None:
+        return
+
+    issues_by_file, prs_by_file = github_mappings
+    # 書き終えてから出力ディレクトリを差し替える
+    with staged_output(OUTPUT_DIR) as staging_dir:
+        process_translation_results(
+            status_result,
+            existing_urls,
+            issues_by_file,
+            prs_by_file,
+            page_views,
+            output_dir=staging_dir,
+            compact=compact,
+            commit_table=commit_table,
+            matrix_shard_size=matrix_shard_size,
+        )
+
+
+def main(  # noqa: PLR0913
+    *,
+    full: bool = False,
+    workers: int | None = None,
+    compact: bool = False,
+    commit_table: bool = False,
+    matrix_shard_size: int | None = None,
+    page_view_files: list[Path] | None = None,
+) -> None:
+    """Load JSONL file and save translation results to output directory.
+
+    The downloads of the sitemaps, issues and PRs and the page view CSV load
+    run in threads while the history is built and analyzed. With workers,
+    they run in the threads of a child process instead, and the analysis runs
+    in the main thread, so that the worker processes can be forked while no
+    other thread is running and share the history without copying it.
+
+    Args:
+    ----
+        full (bool): Analyze every file pair even if the results of the previous
+                     run are available.
+        workers (int | None): The number of worker processes for a full analysis.
+                              None analyzes in this process.
+        compact (bool): Write the JSON files without indentation.
+        commit_table (bool): Write the missing commits of the detail files to a
+                             commit table per language.
+        matrix_shard_size (int | None): If given, save the matrix split into
+                                        shards of this many articles instead
+                                        of one file per category.
+        page_view_files (list[Path] | None): The page view CSV exports to add
+                                             up. None reads PAGE_VIEW_FILE.
+
+    """
+    if page_view_files is None:
+        page_view_files = [PAGE_VIEW_FILE]
+
+    existing_paths_stage = Stage("existing_paths", load_existing_paths)
+    analysis_stage = Stage(
+        "translation_status",
+        partial(analyze_translation_status, full=full, workers=workers),
+        ("existing_paths",),
+    )
+    network_stages = [
+        Stage("existing_urls", load_existing_urls),
+        # CSV はサイトマップを待たずに集計し、最後に URL に対応付ける
+        Stage("page_view_totals", partial(aggregate_page_views, page_view_files)),
+        Stage("page_views", map_page_views, ("page_view_totals", "existing_urls")),
+        Stage("github", load_github_mappings, ("existing_paths",)),
+    ]
+    export_stage = Stage(
+        "export",
+        partial(
+            export_translation_status,
+            compact=compact,
+            commit_table=commit_table,
+            matrix_shard_size=matrix_shard_size,
+        ),
+        ("translation_status", "existing_urls", "github", "page_views"),
+    )
 
-    return None
+    if workers is not None and workers > 1:
+        # ワーカーが fork で履歴を共有できるよう、このプロセスではスレッドを
+        # 起動せず、ダウンロードと CSV の集計は子プロセスで並行して行う
+        results = run_stages_in_main_thread([existing_paths_stage])
+        with start_stages_in_process(network_stages, results) as network:
+            results = run_stages_in_main_thread([analysis_stage], results)
+            results.update(network.result())
+        run_stages_in_main_thread([export_stage], results)
+    else:
+        run_stages(
+            [existing_paths_stage, analysis_stage, *network_stages, export_stage]
+        )
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Analyze the translation status of the Kubernetes website."
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore the previous results and analyze every file pair",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="analyze the languages in this many worker processes",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="write the JSON files without indentation",
+    )
+    parser.add_argument(
+        "--commit-table",
+        action="store_true",
+        help="write each commit once per language and refer to it from details",
+    )
+    parser.add_argument(
+        "--matrix-shard-size",
+        type=int,
+        default=200,
+        help="write the matrix in shards of this many articles with an index, "
+        "which the web app loads (default: 200)",
+    )
+    parser.add_argument(
+        "--page-views",
+        type=Path,
+        nargs="+",
+        default=None,
+        help="page view CSV exports to add up (default: data/master/page_view.csv)",
+    )
+    args = parser.parse_args()
+    main(
+        full=args.full,
+        workers=args.workers,
+        compact=args.compact,
+        commit_table=args.commit_table,
+        matrix_shard_size=args.matrix_shard_size,
+        page_view_files=args.page_views,
+    )
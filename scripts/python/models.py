@@ -7,8 +7,8 @@ class GitFileChangeDict(TypedDict):
     """A TypedDict representing a Git file record."""
 
     path: str
-    insertions: int
-    deletions: int
+    insertions: int | None  # バイナリファイルは None
+    deletions: int | None
     old_path: NotRequired[str]
 
 
@@ -30,3 +30,22 @@ class GitCommitDict(TypedDict):
     message: str
     files: list[GitFileChangeDict]
     summary: GitFileChangeSummaryDict
+
+
+class GitCommitRecordDict(TypedDict):
+    """A TypedDict representing the fields of a Git commit used for analysis."""
+
+    hash: str
+    author: str
+    date: str
+    message: str
+    files: list[GitFileChangeDict]
+
+
+class GitHistoryPositionDict(TypedDict):
+    """A TypedDict representing how much of git_history.jsonl has been read."""
+
+    offset: int  # 読み込んだバイト数
+    record_count: int
+    last_record_offset: int  # 最後に読み込んだレコードの開始位置
+    last_commit_hash: str | None
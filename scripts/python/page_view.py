@@ -1,8 +1,14 @@
 import csv
-from collections import defaultdict
+from array import array
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
+from log import logger
+
+# 正規化したパスの変換結果を覚えておく上限。超えたら捨てて作り直す
+PATH_CACHE_SIZE = 1 << 16
+
 
 @dataclass
 class PageView:
@@ -13,64 +19,188 @@ class PageView:
     average_session_duration: float = 0.0  # seconds
 
 
-def build_url(
-    path: str,
-    existing_urls: set[str],
-    base_url: str = "https://kubernetes.io",
-) -> str | None:
-    """Build URL from page view path.
+def normalize_page_path(path: str, base_url: str = "https://kubernetes.io") -> str:
+    """Normalize a page path or URL for matching.
 
-    Args:
-    ----
-        path (str): The page view path to build the URL from.
-        existing_urls (set[str]): Set of existing URLs to check against.
-        base_url (str): Base URL for the site.
+    The host, query string and fragment are dropped, the path is lowercased
+    and a trailing index.html and trailing slashes are removed.
 
-    Returns:
+    Example:
     -------
-        str | None: The constructed URL or None if the path is invalid or not found.
+        /ja/docs/Home/?q=1#top -> /ja/docs/home
+        https://kubernetes.io/ja/docs/home/ -> /ja/docs/home
+        /ja/docs/home/index.html -> /ja/docs/home
 
     """
-    path = f"{base_url}{path}"
+    path = path.strip().removeprefix(base_url)
+    for separator in ("#", "?"):
+        path = path.split(separator, 1)[0]
+    return path.lower().removesuffix("/index.html").rstrip("/") or "/"
 
-    if path not in existing_urls:
-        return None
 
-    return path
+class PageViewAggregator:
+    """Sum page views over any number of CSV exports by normalized path.
 
+    The rows are added up by normalized path as they are read, so the
+    exports can be read before the existing URLs are known. The totals are
+    kept in arrays indexed by path, so the memory used depends on the number
+    of distinct pages, not on the number of rows read. page_views maps the
+    totals to the existing URLs at the end.
 
-def summarize_view(csv_file: str, existing_urls: set[str]) -> dict[str, PageView]:
-    """Summarize page view data from a CSV file.
+    The average session duration of a row is weighted by its views, so the
+    average of a page is the mean over all of its views. The exports are
+    expected to cover disjoint date windows.
+    """
+
+    def __init__(self, base_url: str = "https://kubernetes.io") -> None:
+        """Start with no rows."""
+        self.base_url = base_url
+        self.paths: list[str] = []
+        self._index_by_path: dict[str, int] = {}
+        self.views = array("q")
+        self.new_users = array("q")
+        self.session_seconds = array("d")
+        self._path_cache: dict[str, int] = {}
+
+    def add_csv(self, csv_file: str | Path) -> None:
+        """Add the rows of a page view CSV export, one row at a time.
+
+        Args:
+        ----
+            csv_file (str | Path): A CSV file with Page path, Views and New users
+                                   columns, and optionally Average session
+                                   duration in seconds.
+
+        """
+        with Path(csv_file).open("r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+
+            path_column = header.index("Page path")
+            views_column = header.index("Views")
+            new_users_column = header.index("New users")
+            duration_column = (
+                header.index("Average session duration")
+                if "Average session duration" in header
+                else None
+            )
+
+            for row in reader:
+                index = self._lookup(row[path_column])
+                views = int(row[views_column])
+                self.views[index] += views
+                self.new_users[index] += int(row[new_users_column])
+                if duration_column is not None:
+                    self.session_seconds[index] += views * float(row[duration_column])
+
+    def page_views(self, existing_urls: Iterable[str]) -> dict[str, PageView]:
+        """Get the totals of the existing URLs that were viewed, keyed by URL.
+
+        Several existing URLs can normalize to the same path, e.g. with and
+        without a trailing slash. Each of them gets the totals of the path, so
+        the views are found under whichever one the URL builder returns.
+        """
+        page_views = {}
+        for url in existing_urls:
+            if not url.startswith(self.base_url):
+                continue
+            index = self._index_by_path.get(normalize_page_path(url, self.base_url))
+            if index is None or not self.views[index]:
+                continue
+            page_views[url] = PageView(
+                views=self.views[index],
+                new_users=self.new_users[index],
+                average_session_duration=self.session_seconds[index]
+                / self.views[index],
+            )
+        return page_views
+
+    def _lookup(self, path: str) -> int:
+        """Get the index of a raw page path, adding it if it is new."""
+        try:
+            return self._path_cache[path]
+        except KeyError:
+            if len(self._path_cache) >= PATH_CACHE_SIZE:
+                self._path_cache.clear()
+            normalized = normalize_page_path(path, self.base_url)
+            index = self._index_by_path.get(normalized)
+            if index is None:
+                index = len(self.paths)
+                self._index_by_path[normalized] = index
+                self.paths.append(normalized)
+                self.views.append(0)
+                self.new_users.append(0)
+                self.session_seconds.append(0.0)
+            self._path_cache[path] = index
+            return index
+
+
+def aggregate_page_views(
+    csv_files: Iterable[str | Path],
+    base_url: str = "https://kubernetes.io",
+) -> PageViewAggregator:
+    """Add up the page views of CSV exports by normalized path.
 
     Args:
     ----
-        csv_file (str): Path to the CSV file containing page view data.
-        existing_urls (set[str]): Set of existing URLs to check against.
+        csv_files (Iterable[str | Path]): The CSV exports to add up, such as
+                                          one per date window.
+        base_url (str): Base URL for the site.
 
     Returns:
     -------
-        dict[str, PageView]: A dictionary summarizing the page view data.
+        PageViewAggregator: The totals, to be mapped to the existing URLs.
 
     """
-    data = defaultdict(lambda: PageView(views=0, new_users=0))
+    aggregator = PageViewAggregator(base_url)
+    for csv_file in csv_files:
+        aggregator.add_csv(csv_file)
+    return aggregator
 
-    with Path(csv_file).open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
 
-        for row in reader:
-            path = row["Page path"]
+def map_page_views(
+    aggregator: PageViewAggregator, existing_urls: Iterable[str]
+) -> dict[str, PageView]:
+    """Map the page view totals to the existing URLs and log how many matched.
 
-            view = int(row["Views"])
-            new_users = int(row["New users"])
-            average_session_duration = float(row.get("Average session duration", 0.0))
+    Args:
+    ----
+        aggregator (PageViewAggregator): The totals by normalized path.
+        existing_urls (Iterable[str]): The URLs that exist on the site.
 
-            url = build_url(path, existing_urls)
+    Returns:
+    -------
+        dict[str, PageView]: The page views keyed by existing URL.
 
-            if not url:
-                continue
+    """
+    page_views = aggregator.page_views(existing_urls)
+    logger.info(
+        "Summarized page views of %d URLs from %d distinct paths",
+        len(page_views),
+        len(aggregator.paths),
+    )
+    return page_views
+
+
+def summarize_view(
+    csv_files: Iterable[str | Path],
+    existing_urls: Iterable[str],
+    base_url: str = "https://kubernetes.io",
+) -> dict[str, PageView]:
+    """Summarize page view data from CSV exports.
 
-            data[url].views += view
-            data[url].new_users += new_users
-            data[url].average_session_duration += average_session_duration
+    Args:
+    ----
+        csv_files (Iterable[str | Path]): The CSV exports to add up, such as
+                                          one per date window.
+        existing_urls (Iterable[str]): The URLs that exist on the site.
+        base_url (str): Base URL for the site.
+
+    Returns:
+    -------
+        dict[str, PageView]: The page views keyed by existing URL.
 
-    return data
+    """
+    return map_page_views(aggregate_page_views(csv_files, base_url), existing_urls)
@@ -0,0 +1,231 @@
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from types import TracebackType
+from typing import Any, Self
+
+from log import logger
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A step of the pipeline.
+
+    Attributes
+    ----------
+        name (str): The name of the stage, used for its result and in logs.
+        func (Callable[..., Any]): Runs the stage. It receives the results of
+                                   depends_on as positional arguments.
+        depends_on (tuple[str, ...]): The stages that must finish first.
+
+    """
+
+    name: str
+    func: Callable[..., Any]
+    depends_on: tuple[str, ...] = ()
+
+
+def _run_stage(stage: Stage, *args: object) -> object:
+    """Run a stage and log when it starts and ends."""
+    logger.info("Stage %s started", stage.name)
+    started_at = time.perf_counter()
+    try:
+        return stage.func(*args)
+    finally:
+        logger.info(
+            "Stage %s finished in %.2f s", stage.name, time.perf_counter() - started_at
+        )
+
+
+def _check_dependencies(stages: list[Stage], finished: set[str]) -> None:
+    """Check that every stage only depends on finished or earlier stages."""
+    known = set(finished)
+    for stage in stages:
+        unknown = set(stage.depends_on) - known
+        if unknown:
+            msg = f"Stage {stage.name} depends on unknown stages: {sorted(unknown)}"
+            raise ValueError(msg)
+        known.add(stage.name)
+
+
+def run_stages_in_main_thread(
+    stages: list[Stage], results: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Run the stages one after another in the calling thread.
+
+    This is for stages that start worker processes with fork, which is only
+    safe before any other thread is started.
+
+    Args:
+    ----
+        stages (list[Stage]): The stages, in an order that satisfies their
+                              dependencies.
+        results (dict[str, Any] | None): The results of stages that already ran.
+
+    Returns:
+    -------
+        dict[str, Any]: The given results and the result of each stage by name.
+
+    """
+    results = dict(results or {})
+    _check_dependencies(stages, set(results))
+    for stage in stages:
+        args = [results[name] for name in stage.depends_on]
+        results[stage.name] = _run_stage(stage, *args)
+    return results
+
+
+def run_stages(
+    stages: list[Stage], results: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Run the stages in threads, each as soon as its dependencies finish.
+
+    Stages that do not depend on each other run at the same time, so network
+    downloads overlap with the CPU-bound analysis.
+
+    Args:
+    ----
+        stages (list[Stage]): The stages. A stage may only depend on the stages
+                              listed before it and on the given results.
+        results (dict[str, Any] | None): The results of stages that already ran,
+                                         e.g. by run_stages_in_main_thread.
+
+    Returns:
+    -------
+        dict[str, Any]: The given results and the result of each stage by name.
+
+    """
+    results = dict(results or {})
+    _check_dependencies(stages, set(results))
+
+    pending = list(stages)
+    running: dict[Future, Stage] = {}
+
+    with ThreadPoolExecutor(max_workers=max(len(stages), 1)) as executor:
+        while pending or running:
+            for stage in [s for s in pending if results.keys() >= set(s.depends_on)]:
+                pending.remove(stage)
+                args = [results[name] for name in stage.depends_on]
+                running[executor.submit(_run_stage, stage, *args)] = stage
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                # 失敗したら後続を始めず、実行中のものが終わるのを待って送出する
+                if future.exception() is not None:
+                    pending.clear()
+                    wait(running)
+                    raise future.exception()
+                results[stage.name] = future.result()
+
+    return results
+
+
+def _run_stages_in_child(
+    stages: list[Stage], results: dict[str, Any], sender: Connection
+) -> None:
+    """Run the stages in threads and send their results to the parent."""
+    try:
+        stage_results = run_stages(stages, results)
+        sender.send(("ok", {stage.name: stage_results[stage.name] for stage in stages}))
+    except Exception as e:  # noqa: BLE001
+        sender.send(("error", e))
+    finally:
+        sender.close()
+
+
+class StageProcess:
+    """Stages running in the threads of a child process.
+
+    The parent process starts no thread, so it can still fork worker
+    processes while the stages run. The results are pickled back to the
+    parent when the stages finish.
+    """
+
+    def __init__(self, stages: list[Stage], results: dict[str, Any]) -> None:
+        """Start the child process.
+
+        Args:
+        ----
+            stages (list[Stage]): The stages. A stage may only depend on the
+                                  stages listed before it and on results.
+            results (dict[str, Any]): The results of stages that already ran.
+
+        """
+        _check_dependencies(stages, set(results))
+        self._receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_run_stages_in_child,
+            args=(stages, results, sender),
+            name="stages",
+        )
+        self._process.start()
+        # 子プロセスが終了したら受信側で EOF になるよう、送信側を閉じる
+        sender.close()
+
+    def result(self) -> dict[str, Any]:
+        """Wait for the stages to finish.
+
+        Returns
+        -------
+            dict[str, Any]: The result of each stage by name.
+
+        Raises
+        ------
+            Exception: The exception of the stage that failed.
+            RuntimeError: If the child process exited without results.
+
+        """
+        try:
+            status, payload = self._receiver.recv()
+        except EOFError:
+            self._process.join()
+            msg = f"Stage process exited with code {self._process.exitcode}"
+            raise RuntimeError(msg) from None
+
+        self._process.join()
+        if status == "error":
+            raise payload
+        return payload
+
+    def __enter__(self) -> Self:
+        """Return the running stages."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the child process if its results were not received."""
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join()
+        self._receiver.close()
+
+
+def start_stages_in_process(
+    stages: list[Stage], results: dict[str, Any] | None = None
+) -> StageProcess:
+    """Start running the stages with run_stages in a child process.
+
+    This lets network stages overlap with stages that fork worker processes
+    in the calling process, which is only safe while no other thread runs.
+
+    Args:
+    ----
+        stages (list[Stage]): The stages. They and the results must be
+                              picklable unless the child is forked.
+        results (dict[str, Any] | None): The results of stages that already ran.
+
+    Returns:
+    -------
+        StageProcess: The running stages. Use it as a context manager so the
+                      child process is stopped if the caller fails.
+
+    """
+    return StageProcess(stages, dict(results or {}))
@@ -0,0 +1,58 @@
+import shutil
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from log import logger
+
+
+def _swap_directory(staging_dir: Path, output_dir: Path) -> None:
+    """Replace output_dir with the staging directory.
+
+    The previous output is moved aside and the staging directory renamed into
+    its place, so output_dir is only missing between the two renames. If the
+    second rename fails, the previous output is moved back.
+    """
+    if not output_dir.exists():
+        staging_dir.rename(output_dir)
+        return
+
+    old_dir = output_dir.with_name(f".{output_dir.name}.old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    output_dir.rename(old_dir)
+    try:
+        staging_dir.rename(output_dir)
+    except OSError:
+        old_dir.rename(output_dir)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+@contextmanager
+def staged_output(output_dir: Path) -> Iterator[Path]:
+    """Write output to a staging directory and publish it as a whole.
+
+    The block writes every output file into the yielded directory, which
+    replaces output_dir when the block finishes, so output_dir never holds a
+    partly written file. If the block raises, the staging directory is
+    removed and output_dir is left as it was.
+
+    Args:
+    ----
+        output_dir (Path): The directory to publish to.
+
+    Yields:
+    ------
+        Path: The empty staging directory to write into.
+
+    """
+    staging_dir = output_dir.with_name(f".{output_dir.name}.staging")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True)
+
+    try:
+        yield staging_dir
+        _swap_directory(staging_dir, output_dir)
+        logger.info("Published output to %s", output_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
@@ -1,14 +1,62 @@
 import os
 from collections import defaultdict
+from collections.abc import Callable, Iterable
 from dataclasses import asdict, dataclass
+from typing import Any
 
+import requests
 from dotenv import load_dotenv
-from github import Auth, Github
 from log import logger
 
 TOO_MANY_FILES_CHANGED = 1000
 TOO_MANY_COMMITS = 1000
 
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+LOCALIZATION_LABELS = ("area/localization", "cncf-cla: yes")
+PAGE_SIZE = 50
+FILES_PAGE_SIZE = 100
+
+# GraphQL のクエリと変数を受け取り、レスポンスの data を返す
+GraphQLTransport = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+PULL_REQUESTS_QUERY = """
+query ($query: String!, $first: Int!, $after: String, $files: Int!) {
+  search(type: ISSUE, query: $query, first: $first, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on PullRequest {
+        number
+        title
+        url
+        changedFiles
+        commits { totalCount }
+        files(first: $files) {
+          pageInfo { hasNextPage endCursor }
+          nodes { path }
+        }
+      }
+    }
+  }
+}
+"""
+
+PULL_REQUEST_FILES_QUERY = """
+query ($owner: String!, $name: String!, $number: Int!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      files(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { path }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(RuntimeError):
+    """The GitHub GraphQL API answered a query with errors."""
+
 
 @dataclass
 class GitHubPullRequest:
@@ -20,67 +68,196 @@ class GitHubPullRequest:
     files: list[str]
 
 
-def _get_prs(repo_name: str = "kubernetes/website") -> list[GitHubPullRequest]:
-    """Get open pull requests for a GitHub repository."""
-    load_dotenv()
+class GitHubGraphQLTransport:
+    """Send GraphQL queries to the GitHub API."""
 
-    auth = Auth.Token(os.getenv("KUBERNETES_WEBSITE_READ_GITHUB_TOKEN"))
-    g = Github(auth=auth)
-    repository = g.get_repo(repo_name)
+    def __init__(
+        self, token: str | None, url: str = GITHUB_GRAPHQL_URL, timeout: float = 30
+    ) -> None:
+        """Initialize the transport with a token and a pooled session."""
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {token}"
 
-    logger.info("Start fetching pull requests from %s", repo_name)
+    def __call__(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Run a query and return its data.
+
+        Args:
+        ----
+            query (str): The GraphQL query.
+            variables (dict[str, Any]): The variables of the query.
+
+        Returns:
+        -------
+            dict[str, Any]: The data field of the response.
+
+        """
+        response = self.session.post(
+            self.url,
+            json={"query": query, "variables": variables},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            msg = f"GraphQL query failed: {payload['errors']}"
+            raise GraphQLError(msg)
+        return payload["data"]
+
+    def close(self) -> None:
+        """Close the session."""
+        self.session.close()
+
+
+def _get_remaining_files(
+    transport: GraphQLTransport,
+    repo_name: str,
+    number: int,
+    files: dict[str, Any],
+) -> list[str]:
+    """Get the files of a pull request that did not fit in the search page."""
+    owner, name = repo_name.split("/", 1)
+    paths: list[str] = []
+    page_info = files["pageInfo"]
+    while page_info["hasNextPage"]:
+        data = transport(
+            PULL_REQUEST_FILES_QUERY,
+            {
+                "owner": owner,
+                "name": name,
+                "number": number,
+                "first": FILES_PAGE_SIZE,
+                "after": page_info["endCursor"],
+            },
+        )
+        files = data["repository"]["pullRequest"]["files"]
+        paths.extend(node["path"] for node in files["nodes"])
+        page_info = files["pageInfo"]
+    return paths
+
+
+def fetch_pull_requests(
+    transport: GraphQLTransport,
+    repo_name: str = "kubernetes/website",
+    page_size: int = PAGE_SIZE,
+    updated_since: str | None = None,
+) -> list[GitHubPullRequest]:
+    """Fetch the open localization pull requests and their files in batches.
+
+    The labels are filtered by the search query, so only the pull requests
+    labeled with LOCALIZATION_LABELS are returned. Each page of the search
+    holds page_size pull requests with their first FILES_PAGE_SIZE files.
+
+    Args:
+    ----
+        transport (GraphQLTransport): Runs a GraphQL query and returns its data.
+        repo_name (str): The repository to search.
+        page_size (int): The number of pull requests per request.
+        updated_since (str | None): Only fetch the pull requests updated at or
+                                    after this ISO 8601 time.
+
+    Returns:
+    -------
+        list[GitHubPullRequest]: The pull requests, newest first.
 
-    raw_pull_requests = repository.get_pulls(
-        state="open", sort="created", direction="desc"
-    )
+    """
+    labels = " ".join(f'label:"{label}"' for label in LOCALIZATION_LABELS)
+    search_query = f"repo:{repo_name} is:pr is:open {labels} sort:created-desc"
+    if updated_since:
+        search_query += f" updated:>={updated_since}"
 
     pull_requests: list[GitHubPullRequest] = []
+    after = None
+    while True:
+        data = transport(
+            PULL_REQUESTS_QUERY,
+            {
+                "query": search_query,
+                "first": page_size,
+                "after": after,
+                "files": FILES_PAGE_SIZE,
+            },
+        )
+        search = data["search"]
+
+        for node in search["nodes"]:
+            number = node["number"]
+            file_changes = node["changedFiles"]
+            commits = node["commits"]["totalCount"]
+
+            # We suppose wrong PR if it has too many files changed
+            if file_changes >= TOO_MANY_FILES_CHANGED or commits >= TOO_MANY_COMMITS:
+                logger.warning(
+                    "Skipping PR #%d - Too many files changed: %d, commits: %d",
+                    number,
+                    file_changes,
+                    commits,
+                )
+                continue
 
-    for pr in raw_pull_requests:
-        number = pr.number
-        title = pr.title
-        url = pr.html_url
-        label_names = [label.name for label in pr.labels]
-        files = pr.get_files()
-        commits = pr.commits
-
-        if "area/localization" not in label_names or "cncf-cla: yes" not in label_names:
-            continue
-
-        file_changes = files.totalCount
-
-        # We suppose wrong PR if it has too many files changed
-        if file_changes >= TOO_MANY_FILES_CHANGED or commits >= TOO_MANY_COMMITS:
-            logger.warning(
-                "Skipping PR #%d - Too many files changed: %d, commits: %d",
-                number,
-                file_changes,
-                commits,
+            files = [file["path"] for file in node["files"]["nodes"]]
+            files.extend(
+                _get_remaining_files(transport, repo_name, number, node["files"])
             )
-            continue
-
-        pull_requests.append(
-            GitHubPullRequest(
-                number=number,
-                title=title,
-                url=url,
-                files=[f.filename for f in files],
+            pull_requests.append(
+                GitHubPullRequest(
+                    number=number,
+                    title=node["title"],
+                    url=node["url"],
+                    files=files,
+                )
             )
+
+        if not search["pageInfo"]["hasNextPage"]:
+            break
+        after = search["pageInfo"]["endCursor"]
+
+    return pull_requests
+
+
+def _get_prs(
+    repo_name: str = "kubernetes/website",
+    transport: GraphQLTransport | None = None,
+) -> list[GitHubPullRequest]:
+    """Get open localization pull requests for a GitHub repository.
+
+    Args:
+    ----
+        repo_name (str): The repository to fetch the pull requests from.
+        transport (GraphQLTransport | None): The transport to query with.
+                                             None queries the GitHub API.
+
+    Returns:
+    -------
+        list[GitHubPullRequest]: The pull requests.
+
+    """
+    logger.info("Start fetching pull requests from %s", repo_name)
+
+    if transport is None:
+        load_dotenv()
+        github_transport = GitHubGraphQLTransport(
+            os.getenv("KUBERNETES_WEBSITE_READ_GITHUB_TOKEN")
         )
+        try:
+            pull_requests = fetch_pull_requests(github_transport, repo_name)
+        finally:
+            github_transport.close()
+    else:
+        pull_requests = fetch_pull_requests(transport, repo_name)
 
-    g.close()
     logger.info("Finished fetching pull requests from %s", repo_name)
 
     return pull_requests
 
 
-def get_prs_by_file(
-    repo_name: str = "kubernetes/website",
+def group_prs_by_file(
+    prs: Iterable[GitHubPullRequest],
 ) -> dict[str, list[GitHubPullRequest]]:
     """Group PRs by the files they modify."""
     file_to_prs: dict[str, list[GitHubPullRequest]] = defaultdict(list)
 
-    prs = _get_prs(repo_name)
     for pr in prs:
         for file_path in pr.files:
             file_to_prs[file_path].append(asdict(pr))
@@ -88,5 +265,13 @@ def get_prs_by_file(
     return dict(file_to_prs)
 
 
+def get_prs_by_file(
+    repo_name: str = "kubernetes/website",
+    transport: GraphQLTransport | None = None,
+) -> dict[str, list[GitHubPullRequest]]:
+    """Fetch the open localization PRs and group them by the files they modify."""
+    return group_prs_by_file(_get_prs(repo_name, transport))
+
+
 if __name__ == "__main__":
     print(get_prs_by_file())
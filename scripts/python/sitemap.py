@@ -0,0 +1,148 @@
+import json
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from log import logger
+from requests.adapters import HTTPAdapter
+
+SITEMAP_LOC_TAG = "{http://www.sitemaps.org/schemas/sitemap/0.9}loc"
+
+
+def parse_sitemap(filepath: Path) -> set[str]:
+    """Parse the URLs of a sitemap.xml file.
+
+    The file is streamed with iterparse, and each element is cleared once it
+    has been read, so the whole document is never held in memory.
+
+    Args:
+    ----
+        filepath (Path): The sitemap.xml file.
+
+    Returns:
+    -------
+        set[str]: The URLs in the <loc> elements.
+
+    """
+    urls: set[str] = set()
+    for _, elem in ET.iterparse(filepath, events=("end",)):  # noqa: S314
+        if elem.tag == SITEMAP_LOC_TAG and elem.text:
+            urls.add(elem.text.strip())
+        elem.clear()
+    return urls
+
+
+def fetch_sitemap(
+    session: requests.Session,
+    sitemap_url: str,
+    cache_file: Path,
+    timeout: float = 10,
+) -> set[str]:
+    """Fetch a sitemap, reusing the cached body if it has not changed.
+
+    The ETag and Last-Modified headers of the cached response are sent back as
+    If-None-Match and If-Modified-Since, so an unchanged sitemap is answered
+    with 304 Not Modified and read from cache_file.
+
+    Args:
+    ----
+        session (requests.Session): The session to send the request with.
+        sitemap_url (str): The URL of the sitemap.xml.
+        cache_file (Path): Where the body is cached. The validators are kept
+                           next to it in a .json file.
+        timeout (float): The timeout of the request in seconds.
+
+    Returns:
+    -------
+        set[str]: The URLs in the sitemap.
+
+    """
+    meta_file = cache_file.with_suffix(".json")
+    headers = {}
+    if cache_file.exists() and meta_file.exists():
+        validators = json.loads(meta_file.read_text(encoding="utf-8"))
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    with session.get(
+        sitemap_url, headers=headers, timeout=timeout, stream=True
+    ) as response:
+        if response.status_code == requests.codes.not_modified:
+            logger.info("Sitemap not modified: %s", sitemap_url)
+            return parse_sitemap(cache_file)
+
+        response.raise_for_status()
+
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with tmp_file.open("wb") as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+        tmp_file.replace(cache_file)
+
+        meta_file.write_text(
+            json.dumps(
+                {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    return parse_sitemap(cache_file)
+
+
+def load_sitemap_urls(
+    languages: Iterable[str],
+    cache_dir: Path,
+    base_url: str = "https://kubernetes.io",
+    max_workers: int = 8,
+    timeout: float = 10,
+) -> set[str]:
+    """Fetch the sitemap of every language concurrently and collect the URLs.
+
+    Args:
+    ----
+        languages (Iterable[str]): The language codes whose sitemaps to fetch.
+        cache_dir (Path): The directory where the sitemap bodies are cached.
+        base_url (str): Base URL for the site.
+        max_workers (int): The number of sitemaps fetched at the same time.
+        timeout (float): The timeout of each request in seconds.
+
+    Returns:
+    -------
+        set[str]: The URLs of all sitemaps. A sitemap that cannot be loaded is
+                  logged and skipped.
+
+    """
+    languages = list(languages)
+    urls: set[str] = set()
+
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        def load(lang: str) -> set[str]:
+            return fetch_sitemap(
+                session,
+                f"{base_url}/{lang}/sitemap.xml",
+                cache_dir / f"{lang}.xml",
+                timeout,
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {lang: executor.submit(load, lang) for lang in languages}
+
+        for lang, future in futures.items():
+            try:
+                urls |= future.result()
+            except (requests.RequestException, ET.ParseError, OSError, ValueError):
+                logger.exception("Error loading sitemap for %s", lang)
+
+    return urls
@@ -1,11 +1,24 @@
+import multiprocessing
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from enum import Enum
-from typing import Literal, TypedDict
+from typing import Any, Literal, TypedDict
 
 from const import LANGUAGE_CODES
-from history import GitFileHistoryTracker, GitFileRevision
+from history import FileRevision, GitFileHistoryTracker
+from history_arrays import HistoryArrays
+from log import logger
+from models import GitHistoryPositionDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SECONDS_PER_DAY = 24 * 60 * 60
 
 type LANGUAGE_CODE = Literal[
     "bn",
@@ -46,13 +59,18 @@ class OutdatedSeverity(str, Enum):
     CRITICAL = "critical"
 
 
+# _calculate_severity の閾値を np.digitize の境界にしたもの
+SEVERITY_BINS = (1, 51, 201, 501)
+SEVERITY_LEVELS = list(OutdatedSeverity)
+
+
 class TranslationStatusResult(TypedDict):
     """A TypedDict representing the translation status of a file."""
 
     target_path: str
     english_path: str
-    target_latest_date: datetime | None
-    english_latest_date: datetime | None
+    target_latest_date: int | None  # UTC エポック秒
+    english_latest_date: int | None  # UTC エポック秒
     language: LANGUAGE_CODE
     category: str
     days_behind: int
@@ -62,7 +80,7 @@ class TranslationStatusResult(TypedDict):
     deletions_behind_lines: int
     status: TranslationStatus
     severity: OutdatedSeverity
-    missing_commits: list[GitFileRevision]
+    missing_commits: list[FileRevision]
 
 
 @dataclass
@@ -97,6 +115,22 @@ class LanguagePath:
         return self.language_code is not None and self.language_code != "en"
 
 
+@dataclass
+class AnalysisSnapshot:
+    """Translation status results saved for the next incremental analysis.
+
+    Attributes
+    ----------
+        position (GitHistoryPositionDict): How much of git_history.jsonl the
+                                           results were computed from.
+        results (dict[str, TranslationStatusResult]): The analysis results.
+
+    """
+
+    position: GitHistoryPositionDict
+    results: dict[str, TranslationStatusResult]
+
+
 class TranslationStatusTracker:
     """A class to track the translation status of files in a repository."""
 
@@ -112,49 +146,417 @@ class TranslationStatusTracker:
     def analyze(
         self,
         target_languages: list[LANGUAGE_CODE] | None = None,
+        *,
+        workers: int | None = None,
+        vectorized: bool | None = None,
     ) -> dict[str, TranslationStatusResult]:
-        """Analyze the translation status for all translated files."""
+        """Analyze the translation status for all translated files.
+
+        Each language is analyzed independently once the latest commits of the
+        English files are known, so the languages can be split across worker
+        processes. The merged results are the same, in the same order, as the
+        results of a serial analysis.
+
+        With vectorized, the English histories are laid out as NumPy arrays and
+        the counts, sums and severities of all pairs of a language are computed
+        at once. The results are the same as those of the pair-by-pair path.
+
+        Args:
+        ----
+            target_languages (list[LANGUAGE_CODE] | None): Languages to analyze.
+            workers (int | None): The number of worker processes. None or 1
+                                  analyzes every language in this process.
+            vectorized (bool | None): Whether to use the NumPy batch path. None
+                                      uses it if NumPy is installed.
+
+        Returns:
+        -------
+            dict[str, TranslationStatusResult]: The results keyed by translated
+                                                path.
+
+        """
         if target_languages is None:
             target_languages = LANGUAGE_CODES
 
-        results = {}
-
-        english_paths = [
-            path
-            for path in self.file_history_tracker.all_paths
-            if path.startswith("content/en/") and path in self.existing_paths
-        ]
+        now = int(time.time())
 
         english_latest_cache = self._build_english_latest_cache()
 
-        for english_path in english_paths:
-            english_latest_commit = english_latest_cache.get(english_path)
+        if vectorized is None:
+            vectorized = np is not None
+        english_arrays = (
+            HistoryArrays(self.file_history_tracker, list(english_latest_cache))
+            if vectorized
+            else None
+        )
 
-            if not english_latest_commit:
-                continue
+        if workers is not None and workers > 1 and len(target_languages) > 1:
+            language_results = self._analyze_languages_in_pool(
+                english_latest_cache, english_arrays, target_languages, now, workers
+            )
+        else:
+            language_results = {
+                lang_code: self._analyze_language(
+                    english_latest_cache, english_arrays, lang_code, now
+                )
+                for lang_code in target_languages
+            }
 
+        # 英語パス、言語の順に並べて直列実行と同じ順序にする
+        results = {}
+        for english_path in english_latest_cache:
             for lang_code in target_languages:
                 translated_path = self._get_translated_path(english_path, lang_code)
-                result = self._analyze_translation_pair(
-                    english_path, english_latest_commit, translated_path
-                )
+                result = language_results[lang_code].get(translated_path)
 
                 if result:
                     results[translated_path] = result
 
         return results
 
-    def _build_english_latest_cache(self) -> dict[str, GitFileRevision]:
-        """Build cache of latest commits for all English files."""
-        cache: dict[str, GitFileRevision] = {}
+    def _analyze_language(
+        self,
+        english_latest_cache: dict[str, FileRevision],
+        english_arrays: HistoryArrays | None,
+        lang_code: LANGUAGE_CODE,
+        now: int,
+    ) -> dict[str, TranslationStatusResult]:
+        """Analyze the translations of every English file into one language.
+
+        Args:
+        ----
+            english_latest_cache (dict[str, FileRevision]): The latest commits of
+                                                            the English files.
+            english_arrays (HistoryArrays | None): The English histories for the
+                                                   batch path, or None to
+                                                   analyze pair by pair.
+            lang_code (LANGUAGE_CODE): The language to analyze.
+            now (int): The current epoch timestamp.
 
-        english_paths = [
+        Returns:
+        -------
+            dict[str, TranslationStatusResult]: The results keyed by translated
+                                                path.
+
+        """
+        if english_arrays is not None:
+            return self._analyze_language_batch(
+                english_latest_cache, english_arrays, lang_code, now
+            )
+
+        results = {}
+        for english_path, english_latest_commit in english_latest_cache.items():
+            translated_path = self._get_translated_path(english_path, lang_code)
+            result = self._analyze_translation_pair(
+                english_path, english_latest_commit, translated_path, now
+            )
+
+            if result:
+                results[translated_path] = result
+
+        return results
+
+    def _analyze_language_batch(
+        self,
+        english_latest_cache: dict[str, FileRevision],
+        english_arrays: HistoryArrays,
+        lang_code: LANGUAGE_CODE,
+        now: int,
+    ) -> dict[str, TranslationStatusResult]:
+        """Analyze one language with NumPy instead of pair by pair.
+
+        Only the latest commit of each translated file is looked up one at a
+        time. The commits behind, the changed lines, days_behind and the
+        severity are computed for all files of the language at once.
+
+        Args:
+        ----
+            english_latest_cache (dict[str, FileRevision]): The latest commits of
+                                                            the English files.
+            english_arrays (HistoryArrays): The histories of the same English
+                                            files, in the same order.
+            lang_code (LANGUAGE_CODE): The language to analyze.
+            now (int): The current epoch timestamp.
+
+        Returns:
+        -------
+            dict[str, TranslationStatusResult]: The same results as
+                                                _analyze_language without
+                                                english_arrays.
+
+        """
+        english_paths = english_arrays.paths
+        # 翻訳先のパスはすべて content/<lang_code>/ で始まる
+        language_code = LanguagePath.from_path(
+            self._get_translated_path("content/en/", lang_code)
+        ).language_code
+        translated_paths = [
+            self._get_translated_path(english_path, lang_code)
+            for english_path in english_paths
+        ]
+        translated_latest = [
+            self.file_history_tracker.get_latest_commit(translated_path)
+            for translated_path in translated_paths
+        ]
+
+        is_translated = np.array(
+            [latest is not None for latest in translated_latest], dtype=bool
+        )
+        target_dates = np.array(
+            [latest.date if latest else 0 for latest in translated_latest],
+            dtype=np.int64,
+        )
+        english_dates = np.array(
+            [english_latest_cache[path].date for path in english_paths],
+            dtype=np.int64,
+        )
+
+        # 未翻訳のファイルは英語の全履歴を対象にする
+        since_dates = np.where(
+            is_translated,
+            target_dates,
+            english_arrays.newest_date - english_arrays.span,
+        )
+        commits_behind, insertions, deletions = english_arrays.changes_since(
+            since_dates
+        )
+        total_change_lines = insertions + deletions
+        severity_levels = np.digitize(total_change_lines, SEVERITY_BINS)
+        days_behind = np.where(
+            is_translated,
+            np.maximum((english_dates - target_dates) // SECONDS_PER_DAY, 0),
+            (now - english_dates) // SECONDS_PER_DAY,
+        )
+
+        results = {}
+        for (
+            english_path,
+            translated_path,
+            target_latest,
+            english_date,
+            days,
+            commits,
+            total,
+            insertion_lines,
+            deletion_lines,
+            severity_level,
+        ) in zip(
+            english_paths,
+            translated_paths,
+            translated_latest,
+            english_dates.tolist(),
+            days_behind.tolist(),
+            commits_behind.tolist(),
+            total_change_lines.tolist(),
+            insertions.tolist(),
+            deletions.tolist(),
+            severity_levels.tolist(),
+            strict=True,
+        ):
+            if target_latest is None:
+                target_date = None
+                status = TranslationStatus.NOT_TRANSLATED
+                missing_commits = self.file_history_tracker.get_history(english_path)
+            else:
+                target_date = target_latest.date
+                status = (
+                    TranslationStatus.UP_TO_DATE
+                    if days == 0
+                    else TranslationStatus.OUTDATED
+                )
+                missing_commits = self._get_commits_since(english_path, target_date)
+
+            results[translated_path] = TranslationStatusResult(
+                target_path=translated_path,
+                english_path=english_path,
+                target_latest_date=target_date,
+                english_latest_date=english_date,
+                language=language_code,
+                category=self._extract_category(translated_path),
+                days_behind=days,
+                commits_behind=commits,
+                total_change_lines=total,
+                insertions_behind_lines=insertion_lines,
+                deletions_behind_lines=deletion_lines,
+                status=status,
+                severity=SEVERITY_LEVELS[severity_level],
+                missing_commits=missing_commits,
+            )
+
+        return results
+
+    def _analyze_languages_in_pool(
+        self,
+        english_latest_cache: dict[str, FileRevision],
+        english_arrays: HistoryArrays | None,
+        target_languages: list[LANGUAGE_CODE],
+        now: int,
+        workers: int,
+    ) -> dict[LANGUAGE_CODE, dict[str, TranslationStatusResult]]:
+        """Analyze each language in a pool of worker processes.
+
+        The workers inherit the tracker through fork where it is available and
+        no other thread is running, and receive a pickled copy of it otherwise.
+        The missing commits are not sent back; they are sliced again from the
+        tracker of this process, so the results refer to the same FileRevision
+        objects as a serial analysis.
+
+        Args:
+        ----
+            english_latest_cache (dict[str, FileRevision]): The latest commits of
+                                                            the English files.
+            english_arrays (HistoryArrays | None): The English histories for the
+                                                   batch path, or None.
+            target_languages (list[LANGUAGE_CODE]): Languages to analyze.
+            now (int): The current epoch timestamp.
+            workers (int): The maximum number of worker processes.
+
+        Returns:
+        -------
+            dict[LANGUAGE_CODE, dict[str, TranslationStatusResult]]: The results
+                of each language keyed by translated path.
+
+        """
+        # ロックを持つスレッドごと複製しないよう、fork は単一スレッドの時だけ使う
+        start_methods = multiprocessing.get_all_start_methods()
+        if "fork" in start_methods and threading.active_count() == 1:
+            mp_context = multiprocessing.get_context("fork")
+        elif "forkserver" in start_methods:
+            mp_context = multiprocessing.get_context("forkserver")
+        else:
+            mp_context = None
+        logger.info(
+            "Analyzing %d languages in %d worker processes (%s)",
+            len(target_languages),
+            min(workers, len(target_languages)),
+            (mp_context or multiprocessing).get_start_method(),
+        )
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(target_languages)),
+            mp_context=mp_context,
+            initializer=_init_analysis_worker,
+            initargs=(self, english_latest_cache, english_arrays, now),
+        ) as executor:
+            language_results = dict(
+                zip(
+                    target_languages,
+                    executor.map(_analyze_language_in_worker, target_languages),
+                    strict=True,
+                )
+            )
+
+        for results in language_results.values():
+            for result in results.values():
+                if result["target_latest_date"] is None:
+                    result["missing_commits"] = self.file_history_tracker.get_history(
+                        result["english_path"]
+                    )
+                else:
+                    result["missing_commits"] = self._get_commits_since(
+                        result["english_path"], result["target_latest_date"]
+                    )
+
+        return language_results
+
+    def analyze_incremental(
+        self,
+        previous_results: dict[str, TranslationStatusResult],
+        changed_paths: set[str],
+        target_languages: list[LANGUAGE_CODE] | None = None,
+    ) -> dict[str, TranslationStatusResult]:
+        """Update previous analysis results after new commits were added.
+
+        Only file pairs whose English or translated path (or a path they were
+        renamed from) is in changed_paths are analyzed again. The other pairs
+        reuse their previous result, with days_behind of NOT_TRANSLATED pairs
+        refreshed to the current time.
+
+        Args:
+        ----
+            previous_results (dict[str, TranslationStatusResult]): Results of the
+                previous analysis, keyed by translated path.
+            changed_paths (set[str]): Paths changed by the new commits.
+            target_languages (list[LANGUAGE_CODE] | None): Languages to analyze.
+
+        Returns:
+        -------
+            dict[str, TranslationStatusResult]: The same results as analyze().
+
+        """
+        if target_languages is None:
+            target_languages = LANGUAGE_CODES
+
+        results = {}
+        now = int(time.time())
+
+        affected_paths: set[str] = set()
+        for path in changed_paths:
+            affected_paths |= self.file_history_tracker.get_successor_paths(path)
+
+        for english_path in self._get_english_paths():
+            english_changed = english_path in affected_paths
+
+            for lang_code in target_languages:
+                translated_path = self._get_translated_path(english_path, lang_code)
+                previous = previous_results.get(translated_path)
+
+                if (
+                    previous is not None
+                    and not english_changed
+                    and translated_path not in affected_paths
+                ):
+                    results[translated_path] = self._refresh_result(previous, now)
+                    continue
+
+                english_latest_commit = self.file_history_tracker.get_latest_commit(
+                    english_path
+                )
+                if not english_latest_commit:
+                    break
+
+                results[translated_path] = self._analyze_translation_pair(
+                    english_path, english_latest_commit, translated_path, now
+                )
+
+        return results
+
+    def _get_english_paths(self) -> list[str]:
+        """Get the English paths that exist in the repository."""
+        return [
             path
             for path in self.file_history_tracker.all_paths
             if path.startswith("content/en/") and path in self.existing_paths
         ]
 
-        for path in english_paths:
+    def _refresh_result(
+        self, result: TranslationStatusResult, now: int
+    ) -> TranslationStatusResult:
+        """Update the time-dependent fields of an unchanged result.
+
+        Args:
+        ----
+            result (TranslationStatusResult): A result of a previous analysis.
+            now (int): The current epoch timestamp.
+
+        Returns:
+        -------
+            TranslationStatusResult: The result as of now.
+
+        """
+        if result["status"] != TranslationStatus.NOT_TRANSLATED:
+            return result
+
+        refreshed = result.copy()
+        refreshed["days_behind"] = (
+            now - result["english_latest_date"]
+        ) // SECONDS_PER_DAY
+        return refreshed
+
+    def _build_english_latest_cache(self) -> dict[str, FileRevision]:
+        """Build cache of latest commits for all English files."""
+        cache: dict[str, FileRevision] = {}
+
+        for path in self._get_english_paths():
             latest = self.file_history_tracker.get_latest_commit(path)
             if latest:
                 cache[path] = latest
@@ -183,8 +585,9 @@ class TranslationStatusTracker:
     def _analyze_translation_pair(
         self,
         english_path: str,
-        english_latest: GitFileRevision,
+        english_latest: FileRevision,
         translated_path: str,
+        now: int,
     ) -> TranslationStatusResult | None:
         """Analyze translation status for an English-translation file pair."""
         translated_latest = self.file_history_tracker.get_latest_commit(translated_path)
@@ -197,15 +600,16 @@ class TranslationStatusTracker:
                 english_latest,
                 translated_path,
                 category,
+                now,
             )
 
-        translated_date = self._parse_date(translated_latest["date"])
-        english_date = self._parse_date(english_latest["date"])
+        translated_date = translated_latest.date
+        english_date = english_latest.date
 
         missing_commits = self._get_commits_since(english_path, translated_date)
         change_stats = self._calculate_change_stats(missing_commits)
 
-        days_behind = (english_date - translated_date).days
+        days_behind = (english_date - translated_date) // SECONDS_PER_DAY
         status = (
             TranslationStatus.UP_TO_DATE
             if days_behind <= 0
@@ -233,29 +637,31 @@ class TranslationStatusTracker:
     def _create_missing_translation_result(
         self,
         english_path: str,
-        english_latest: GitFileRevision,
+        english_latest: FileRevision,
         translated_path: str,
         category: str,
+        now: int,
     ) -> TranslationStatusResult:
         """Create result for missing translation files.
 
         Args:
         ----
             english_path (str): The path of the English file.
-            english_latest (GitFileRevision): The latest commit for the English file.
+            english_latest (FileRevision): The latest commit for the English file.
             translated_path (str): The path of the translated file.
             category (str): The category of the translation.
+            now (int): The current epoch timestamp.
 
         Returns:
         -------
             TranslationStatusResult: The result indicating no translation exists.
 
         """
-        english_date = self._parse_date(english_latest["date"])
+        english_date = english_latest.date
 
         file_history = self.file_history_tracker.get_history(english_path)
         total_english_changes = sum(
-            (commit.get("insertions", 0) or 0) + (commit.get("deletions", 0) or 0)
+            (commit.insertions or 0) + (commit.deletions or 0)
             for commit in file_history
         )
 
@@ -266,62 +672,37 @@ class TranslationStatusTracker:
             english_latest_date=english_date,
             language=LanguagePath.from_path(translated_path).language_code,
             category=category,
-            days_behind=(datetime.now(tz=timezone.utc) - english_date).days,  # noqa: UP017
+            days_behind=(now - english_date) // SECONDS_PER_DAY,
             commits_behind=len(file_history),
             total_change_lines=total_english_changes,
-            insertions_behind_lines=sum(
-                c.get("insertions", 0) or 0 for c in file_history
-            ),
-            deletions_behind_lines=sum(
-                c.get("deletions", 0) or 0 for c in file_history
-            ),
+            insertions_behind_lines=sum(c.insertions or 0 for c in file_history),
+            deletions_behind_lines=sum(c.deletions or 0 for c in file_history),
             status=TranslationStatus.NOT_TRANSLATED,
             severity=self._calculate_severity(total_english_changes),
             missing_commits=file_history,
         )
 
-    def _get_commits_since(
-        self, path: str, since_date: datetime
-    ) -> list[GitFileRevision]:
+    def _get_commits_since(self, path: str, since_date: int) -> list[FileRevision]:
         """Get commits for a path since the specified date.
 
         Args:
         ----
             path (str): The file path to check.
-            since_date (datetime): The date to filter commits.
-
-        Returns:
-        -------
-            list[GitFileRevision]: List of commits after the specified date.
-
-        """
-        file_history = self.file_history_tracker.get_history(path)
-        return [
-            commit
-            for commit in file_history
-            if self._parse_date(commit["date"]) > since_date
-        ]
-
-    def _parse_date(self, date_str: str) -> datetime:
-        """Parse Git date string to datetime.
-
-        Args:
-        ----
-            date_str (str): The date string from a Git commit.
+            since_date (int): The epoch timestamp to filter commits.
 
         Returns:
         -------
-            datetime: Parsed datetime object.
+            list[FileRevision]: List of commits after the specified date.
 
         """
-        return datetime.fromisoformat(date_str.replace(" ", "T"))
+        return self.file_history_tracker.get_commits_since(path, since_date)
 
-    def _calculate_change_stats(self, commits: list[GitFileRevision]) -> dict[str, int]:
+    def _calculate_change_stats(self, commits: list[FileRevision]) -> dict[str, int]:
         """Calculate change statistics from commits.
 
         Args:
         ----
-            commits (list[GitFileRevision]): List of commit history for a file.
+            commits (list[FileRevision]): List of commit history for a file.
 
         Returns:
         -------
@@ -329,8 +710,8 @@ class TranslationStatusTracker:
                             deletions, and total changes.
 
         """
-        total_insertion_lines = sum(c.get("insertions", 0) or 0 for c in commits)
-        total_deletion_lines = sum(c.get("deletions", 0) or 0 for c in commits)
+        total_insertion_lines = sum(c.insertions or 0 for c in commits)
+        total_deletion_lines = sum(c.deletions or 0 for c in commits)
 
         return {
             "insertion_lines": total_insertion_lines,
@@ -381,3 +762,47 @@ class TranslationStatusTracker:
             return "overall"
 
         return "unknown"
+
+
+# ワーカープロセスごとの解析対象 (fork 時は親プロセスから引き継ぐ)
+_worker_context: dict[str, Any] = {}
+
+
+def _init_analysis_worker(
+    tracker: TranslationStatusTracker,
+    english_latest_cache: dict[str, FileRevision],
+    english_arrays: HistoryArrays | None,
+    now: int,
+) -> None:
+    """Store the analysis inputs in a worker process."""
+    _worker_context["tracker"] = tracker
+    _worker_context["english_latest_cache"] = english_latest_cache
+    _worker_context["english_arrays"] = english_arrays
+    _worker_context["now"] = now
+
+
+def _analyze_language_in_worker(
+    lang_code: LANGUAGE_CODE,
+) -> dict[str, TranslationStatusResult]:
+    """Analyze one language in a worker process.
+
+    Args:
+    ----
+        lang_code (LANGUAGE_CODE): The language to analyze.
+
+    Returns:
+    -------
+        dict[str, TranslationStatusResult]: The results keyed by translated path,
+                                            without their missing commits.
+
+    """
+    tracker: TranslationStatusTracker = _worker_context["tracker"]
+    results = tracker._analyze_language(  # noqa: SLF001
+        _worker_context["english_latest_cache"],
+        _worker_context["english_arrays"],
+        lang_code,
+        _worker_context["now"],
+    )
+    for result in results.values():
+        result["missing_commits"] = []
+    return results
@@ -1,37 +1,188 @@
 import re
+from dataclasses import dataclass
 from pathlib import Path, PurePosixPath
+from typing import Any
 
 import yaml
 
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 KUBERNETES_DIR = ROOT_DIR / "k8s-repo" / "website"
 
+FRONT_MATTER_PATTERN = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+FRONT_MATTER_FIELD_PATTERNS = {
+    field: re.compile(rf'^{field}:\s*["\']?([^"\n]*?)["\']?\s*$', re.MULTILINE)
+    for field in ("url", "slug", "date", "title")
+}
 
-def build_url(  # noqa: PLR0911, C901
-    english_path: str,
-    language: str,
-    existing_urls: set[str],
-    base_url: str = "https://kubernetes.io",
-) -> str | None:
-    """Build URL for a given English path based on language and existing paths.
+
+@dataclass(frozen=True)
+class FrontMatter:
+    """Front matter fields of a content file that decide its URL.
+
+    Attributes
+    ----------
+        exists (bool): Whether the file could be read.
+        build (dict[str, Any] | None): The parsed _build settings.
+        url (str | None): The url field.
+        slug (str | None): The slug field.
+        date (str | None): The date field.
+        title (str | None): The title field.
+        full_link (str | None): The full_link field of glossary entries.
+
+    """
+
+    exists: bool
+    build: dict[str, Any] | None = None
+    url: str | None = None
+    slug: str | None = None
+    date: str | None = None
+    title: str | None = None
+    full_link: str | None = None
+
+    @property
+    def is_public(self) -> bool:
+        """Whether Hugo renders the file, i.e. _build.render is not never."""
+        if not self.exists:
+            return False
+        if self.build is not None:
+            return self.build.get("render") not in ("never", False)
+        return True
+
+
+MISSING_FRONT_MATTER = FrontMatter(exists=False)
+
+
+def parse_front_matter(content: str) -> FrontMatter:
+    """Parse the front matter fields used to build URLs.
+
+    _build and full_link are read with YAML. url, slug, date and title are read
+    line by line, since some blog posts have front matter that YAML rejects.
 
     Args:
     ----
-        english_path (str): Path to the English markdown file.
-        language (str): Language code (e.g., 'en', 'fr').
+        content (str): The content of a markdown or HTML file.
+
+    Returns:
+    -------
+        FrontMatter: The parsed fields.
+
+    """
+    build = None
+    full_link = None
+    match = FRONT_MATTER_PATTERN.match(content)
+    if match:
+        try:
+            parsed = yaml.safe_load(match.group(1))
+        except yaml.YAMLError:
+            parsed = None
+        if isinstance(parsed, dict):
+            build_settings = parsed.get("_build", {})
+            if isinstance(build_settings, dict):
+                build = build_settings
+            if parsed.get("full_link"):
+                full_link = str(parsed["full_link"]).strip()
+
+    # some file has leading blank lines
+    # e.g., content/en/blog/_posts/2019-08-30-announcing-etcd-3.4.md
+    fields: dict[str, str] = {}
+    match = FRONT_MATTER_PATTERN.match(content.lstrip("\n\r\t "))
+    if match:
+        for field, pattern in FRONT_MATTER_FIELD_PATTERNS.items():
+            field_match = pattern.search(match.group(1))
+            if field_match:
+                fields[field] = field_match.group(1).strip()
+
+    return FrontMatter(exists=True, build=build, full_link=full_link, **fields)
+
+
+class FrontMatterIndex:
+    """Front matter of the content files, parsed once per file.
+
+    Entries are keyed by path and remember the modification time of the file,
+    so a file is parsed again only if it has changed since it was indexed.
+    """
+
+    def __init__(self, root_dir: Path) -> None:
+        """Initialize a FrontMatterIndex for the files under a directory."""
+        self.root_dir = root_dir
+        self._entries: dict[str, tuple[int, FrontMatter]] = {}
+
+    def get(self, file_path: str) -> FrontMatter:
+        """Get the front matter of a file.
+
+        Args:
+        ----
+            file_path (str): The path of the file relative to root_dir.
+
+        Returns:
+        -------
+            FrontMatter: The front matter, or MISSING_FRONT_MATTER if the file
+                         cannot be read.
+
+        """
+        path = self.root_dir / file_path
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return MISSING_FRONT_MATTER
+
+        entry = self._entries.get(file_path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        try:
+            front_matter = parse_front_matter(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            front_matter = MISSING_FRONT_MATTER
+
+        self._entries[file_path] = (mtime, front_matter)
+        return front_matter
+
+
+FRONT_MATTER_INDEX = FrontMatterIndex(KUBERNETES_DIR)
+
+
+def match_existing_url(url: str, existing_urls: set[str]) -> str | None:
+    """Find a URL in existing_urls, falling back to its lowercase form.
+
+    Args:
+    ----
+        url (str): The URL to look up.
         existing_urls (set[str]): Set of existing urls to check against.
-        base_url (str): Base URL for the site.
 
     Returns:
     -------
-        str | None: The constructed URL or None if the path is invalid or not found.
+        str | None: url or its lowercase form if it exists, otherwise None.
+
+    """
+    if url in existing_urls:
+        return url
+    lowercase_url = url.lower()
+    if lowercase_url in existing_urls:
+        return lowercase_url
+    return None
+
+
+def split_english_path(english_path: str) -> tuple[str, ...] | None:
+    """Split a public English content path into its URL parts.
+
+    The parts do not depend on the language, so they can be computed once and
+    passed to build_url_from_parts for every language.
+
+    Args:
+    ----
+        english_path (str): Path to the English markdown file.
+
+    Returns:
+    -------
+        tuple[str, ...] | None: The parts of the path below content/en, without
+                                a trailing _index file, or None if the path
+                                has no public URL.
 
     Example:
     -------
-        content/en/docs/api/reference.md -> https://kubernetes.io/docs/api/reference/
-        content/en/docs/api/reference.md -> https://kubernetes.io/ja/docs/api/reference/
-        content/en/blog/_posts/2024-10-02-xxxx.md -> https://kubernetes.io/blog/2024/10/02/xxxx/
-        content/en/blog/concepts/_index.md -> https://kubernetes.io/blog/concepts/
+        content/en/docs/api/reference.md -> ("docs", "api", "reference.md")
+        content/en/blog/concepts/_index.md -> ("blog", "concepts")
 
     """
     path = PurePosixPath(english_path)
@@ -54,6 +205,65 @@ def build_url(  # noqa: PLR0911, C901
     if parts[-1] in ("_index.md", "_index.html"):
         parts = parts[:-1]
 
+    return parts
+
+
+def build_url(
+    english_path: str,
+    language: str,
+    existing_urls: set[str],
+    base_url: str = "https://kubernetes.io",
+) -> str | None:
+    """Build URL for a given English path based on language and existing paths.
+
+    Args:
+    ----
+        english_path (str): Path to the English markdown file.
+        language (str): Language code (e.g., 'en', 'fr').
+        existing_urls (set[str]): Set of existing urls to check against.
+        base_url (str): Base URL for the site.
+
+    Returns:
+    -------
+        str | None: The constructed URL or None if the path is invalid or not found.
+
+    Example:
+    -------
+        content/en/docs/api/reference.md -> https://kubernetes.io/docs/api/reference/
+        content/en/docs/api/reference.md -> https://kubernetes.io/ja/docs/api/reference/
+        content/en/blog/_posts/2024-10-02-xxxx.md -> https://kubernetes.io/blog/2024/10/02/xxxx/
+        content/en/blog/concepts/_index.md -> https://kubernetes.io/blog/concepts/
+
+    """
+    parts = split_english_path(english_path)
+    if parts is None:
+        return None
+
+    return build_url_from_parts(english_path, parts, language, existing_urls, base_url)
+
+
+def build_url_from_parts(  # noqa: PLR0911
+    english_path: str,
+    parts: tuple[str, ...],
+    language: str,
+    existing_urls: set[str],
+    base_url: str = "https://kubernetes.io",
+) -> str | None:
+    """Build URL for a language from the parts of an English path.
+
+    Args:
+    ----
+        english_path (str): Path to the English markdown file.
+        parts (tuple[str, ...]): The parts returned by split_english_path.
+        language (str): Language code (e.g., 'en', 'fr').
+        existing_urls (set[str]): Set of existing urls to check against.
+        base_url (str): Base URL for the site.
+
+    Returns:
+    -------
+        str | None: The constructed URL or None if it is not found.
+
+    """
     lang_prefix = "" if language == "en" else f"{language}/"
     category = parts[0]
 
@@ -67,11 +277,7 @@ def build_url(  # noqa: PLR0911, C901
 
         doc_path = "/".join(parts[1:]).removesuffix(".md")
         url = f"{base_url}/{lang_prefix}docs/{doc_path}/"
-        if url in existing_urls:
-            return url
-        elif url.lower() in existing_urls:
-            return url.lower()
-        return None
+        return match_existing_url(url, existing_urls)
 
     elif category == "blog":
         return _build_blog_url(
@@ -87,21 +293,12 @@ def build_url(  # noqa: PLR0911, C901
 
         case_study_path = "/".join(parts[1:-1])
         url = f"{base_url}/{lang_prefix}case-studies/{case_study_path}/"
-        if url in existing_urls:
-            return url
-        elif url.lower() in existing_urls:
-            return url.lower()
-        return None
+        return match_existing_url(url, existing_urls)
 
     # Other categories
     other_path = "/".join(parts).removesuffix(".md")
     url = f"{base_url}/{lang_prefix}{other_path}/"
-    if url in existing_urls:
-        return url
-    elif url.lower() in existing_urls:
-        return url.lower()
-
-    return None
+    return match_existing_url(url, existing_urls)
 
 
 def _build_contribute_blog_url(
@@ -129,11 +326,11 @@ def _build_contribute_blog_url(
         return f"{base_url}/{lang_prefix}docs/contribute/blog/"
 
     # Try to get front matter
-    front_matter = _parse_front_matter(file_path)
+    front_matter = FRONT_MATTER_INDEX.get(file_path)
 
     # Priority 1: slug
-    if front_matter and "slug" in front_matter:
-        slug = front_matter["slug"]
+    if front_matter.slug is not None:
+        slug = front_matter.slug
         return f"{base_url}/{lang_prefix}docs/contribute/blog/{slug}/"
 
     doc_path = "/".join(parts[1:]).removesuffix(".md")
@@ -155,34 +352,7 @@ def _build_glossary_url(file_path: str, lang_prefix: str, base_url: str) -> str
         str | None: The URL or None if no valid URL found.
 
     """
-
-    def parse_full_link(file_path: str) -> str | None:
-        """Parse the full link from the file path."""
-        try:
-            content = Path(KUBERNETES_DIR / file_path).read_text(encoding="utf-8")
-            match = re.match(r"^---\s*\n(.*?)\n---\s*\n", content, re.DOTALL)
-            if not match:
-                return None
-
-            fm_content = match.group(1)
-
-            try:
-                parsed = yaml.safe_load(fm_content)
-                if not isinstance(parsed, dict):
-                    return None
-            except yaml.YAMLError:
-                return None
-
-            url = parsed.get("full_link")
-            if url:
-                return str(url).strip()
-
-            return None
-
-        except (FileNotFoundError, UnicodeDecodeError):
-            return None
-
-    full_link = parse_full_link(file_path)
+    full_link = FRONT_MATTER_INDEX.get(file_path).full_link
 
     if not full_link:
         return None
@@ -216,7 +386,7 @@ def _text_to_slug(text: str) -> str:
     return re.sub(r"^-+|-+$", "", normalized)
 
 
-def _build_blog_url(  # noqa: PLR0911, PLR0912, C901
+def _build_blog_url(  # noqa: PLR0912, C901
     file_path: str,
     parts: tuple,
     existing_urls: set,
@@ -239,30 +409,28 @@ def _build_blog_url(  # noqa: PLR0911, PLR0912, C901
 
     """
     # Try to get front matter
-    front_matter = _parse_front_matter(file_path)
+    front_matter = FRONT_MATTER_INDEX.get(file_path)
 
     # Priority 1: slug + date
-    if front_matter and "slug" in front_matter and "date" in front_matter:
-        slug = front_matter["slug"]
-        date_match = re.match(r"(\d{4})-(\d{2})-(\d{2})", front_matter["date"])
+    if front_matter.slug is not None and front_matter.date is not None:
+        slug = front_matter.slug
+        date_match = re.match(r"(\d{4})-(\d{2})-(\d{2})", front_matter.date)
         if date_match:
             year, month, day = date_match.groups()
             if day == "00":
                 url = f"{base_url}/{lang_prefix}blog/{year}/{month}/{slug}/"
             else:
                 url = f"{base_url}/{lang_prefix}blog/{year}/{month}/{day}/{slug}/"
-            if url in existing_urls:
-                return url
-            elif url.lower() in existing_urls:
-                return url.lower()
+            matched_url = match_existing_url(url, existing_urls)
+            if matched_url:
+                return matched_url
 
     # Priority 2: explicit url
-    if front_matter and "url" in front_matter:
-        url = f"{base_url}/{lang_prefix}{front_matter['url'].strip('/')}/"
-        if url in existing_urls:
-            return url
-        elif url.lower() in existing_urls:
-            return url.lower()
+    if front_matter.url is not None:
+        url = f"{base_url}/{lang_prefix}{front_matter.url.strip('/')}/"
+        matched_url = match_existing_url(url, existing_urls)
+        if matched_url:
+            return matched_url
 
     # Priority 3: filename
     if len(parts) >= 3 and parts[1] == "_posts":
@@ -276,27 +444,24 @@ def _build_blog_url(  # noqa: PLR0911, PLR0912, C901
                 url = f"{base_url}/{lang_prefix}blog/{year}/{month}/{day}/{title}/"
         else:
             url = f"{base_url}/{lang_prefix}blog/{filename}/"
-        if url in existing_urls:
-            return url
-        elif url.lower() in existing_urls:
-            return url.lower()
+        matched_url = match_existing_url(url, existing_urls)
+        if matched_url:
+            return matched_url
 
     # Priority 4: blog title with date
-    if front_matter and "title" in front_matter and "date" in front_matter:
-        title = front_matter["title"]
-        title = _text_to_slug(title)
+    if front_matter.title is not None and front_matter.date is not None:
+        title = _text_to_slug(front_matter.title)
 
-        date_match = re.match(r"(\d{4})-(\d{2})-(\d{2})", front_matter["date"])
+        date_match = re.match(r"(\d{4})-(\d{2})-(\d{2})", front_matter.date)
         if date_match:
             year, month, day = date_match.groups()
             if day == "00":
                 url = f"{base_url}/{lang_prefix}blog/{year}/{month}/{title}/"
             else:
                 url = f"{base_url}/{lang_prefix}blog/{year}/{month}/{day}/{title}/"
-            if url in existing_urls:
-                return url
-            elif url.lower() in existing_urls:
-                return url.lower()
+            matched_url = match_existing_url(url, existing_urls)
+            if matched_url:
+                return matched_url
     # Blog category
     blog_path = "/".join(parts[1:]).removesuffix(".md")
     url = (
@@ -304,38 +469,7 @@ def _build_blog_url(  # noqa: PLR0911, PLR0912, C901
         if blog_path
         else f"{base_url}/{lang_prefix}blog/"
     )
-    if url in existing_urls:
-        return url
-    elif url.lower() in existing_urls:
-        return url.lower()
-
-    return None
-
-
-def _parse_front_matter(file_path: str) -> dict | None:
-    """Parse front matter fields: url, slug, date."""
-    try:
-        content = Path(KUBERNETES_DIR / file_path).read_text(encoding="utf-8")
-        # some file has leading blank lines
-        # e.g., content/en/blog/_posts/2019-08-30-announcing-etcd-3.4.md
-        content = content.lstrip("\n\r\t ")
-        match = re.match(r"^---\s*\n(.*?)\n---\s*\n", content, re.DOTALL)
-        if not match:
-            return None
-
-        fm_content = match.group(1)
-        result = {}
-
-        for field in ["url", "slug", "date", "title"]:
-            field_match = re.search(
-                rf'^{field}:\s*["\']?([^"\n]*?)["\']?\s*$', fm_content, re.MULTILINE
-            )
-            if field_match:
-                result[field] = field_match.group(1).strip()
-
-        return result if result else None
-    except (FileNotFoundError, UnicodeDecodeError):
-        return None
+    return match_existing_url(url, existing_urls)
 
 
 def is_public_url(file_path: str) -> bool:
@@ -351,28 +485,4 @@ def is_public_url(file_path: str) -> bool:
         bool: True if the page will be publicly accessible, False otherwise
 
     """
-    try:
-        content = Path(KUBERNETES_DIR / file_path).read_text(encoding="utf-8")
-        match = re.match(r"^---\s*\n(.*?)\n---\s*\n", content, re.DOTALL)
-        if not match:
-            return True
-
-        fm_content = match.group(1)
-
-        try:
-            parsed = yaml.safe_load(fm_content)
-            if not isinstance(parsed, dict):
-                return True
-        except yaml.YAMLError:
-            return True
-
-        build_settings = parsed.get("_build", {})
-        if isinstance(build_settings, dict):
-            render_value = build_settings.get("render")
-            if render_value in ("never", False):
-                return False
-
-        return True
-
-    except (FileNotFoundError, UnicodeDecodeError):
-        return False
+    return FRONT_MATTER_INDEX.get(file_path).is_public
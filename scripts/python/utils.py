@@ -1,4 +1,9 @@
-from datetime import datetime
+import gc
+import resource
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
 
 
 def convert_keys_to_camel_case(obj: object) -> object:
@@ -49,3 +54,56 @@ def serialize_datetime(obj: object) -> str:
 
     msg = f"Object of type {type(obj)} is not JSON serializable"
     raise TypeError(msg)
+
+
+def timestamp_to_datetime(timestamp: int | None) -> datetime | None:
+    """Convert a UTC epoch timestamp to an aware datetime for export.
+
+    Args:
+    ----
+        timestamp (int | None): Seconds since the epoch, or None.
+
+    Returns:
+    -------
+        datetime | None: The datetime in UTC, or None if timestamp is None.
+
+    """
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)  # noqa: UP017
+
+
+def get_peak_rss_mib() -> float:
+    """Get the peak resident set size of the current process.
+
+    Returns
+    -------
+        float: The peak resident set size in MiB.
+
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS はバイト単位、Linux は KiB 単位
+    if sys.platform == "darwin":
+        return max_rss / 1024 / 1024
+    return max_rss / 1024
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector while many objects are created.
+
+    The objects built in bulk do not form reference cycles, so the repeated
+    collections triggered by the allocations only cost time.
+
+    Yields
+    ------
+        None
+
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -28,11 +28,10 @@ ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
 REPO_PATH="${ROOT_DIR}/k8s-repo/website"
 OUTPUT_DIR="${ROOT_DIR}/data/master"
 OUTPUT_FILE="${OUTPUT_DIR}/git_history.jsonl"
-CACHE_DIR="${ROOT_DIR}/data/cache"
-LAST_COMMIT_FILE="${CACHE_DIR}/last_commit.txt"
+# 追記先の git_history.jsonl と同じ場所に置き、解析のキャッシュとは分ける
+LAST_COMMIT_FILE="${OUTPUT_DIR}/last_commit.txt"
 
 mkdir -p "${OUTPUT_DIR}"
-mkdir -p "${CACHE_DIR}"
 
 fetch_history_jsonl() {
   local start_commit=$1
@@ -259,10 +258,13 @@ if [ -f "$LAST_COMMIT_FILE" ]; then
     fetch_history_jsonl "$LAST_COMMIT" "$CURRENT_HEAD" "$OUTPUT_FILE"
   else
     log_warn "Previous commit not found in history. Fetching full history."
+    : > "$OUTPUT_FILE"
     fetch_history_jsonl "" "" "$OUTPUT_FILE"
   fi
 else
   log_info "First run or no previous commit information. Fetching full history."
+  # 全履歴を取り直すときは追記せずに書き直す
+  : > "$OUTPUT_FILE"
   fetch_history_jsonl "" "" "$OUTPUT_FILE"
 fi
 
@@ -1,42 +1,103 @@
-import blogArticles from '@/data/output/matrix/blog.json';
-import caseStudiesArticles from '@/data/output/matrix/case-studies.json';
-import communityArticles from '@/data/output/matrix/community.json';
-import docsConceptsArticles from '@/data/output/matrix/docs_concepts.json';
-import docsContributionArticles from '@/data/output/matrix/docs_contribute.json';
-import docsReferenceArticles from '@/data/output/matrix/docs_reference.json';
-import docsSetupArticles from '@/data/output/matrix/docs_setup.json';
-import docsTasksArticles from '@/data/output/matrix/docs_tasks.json';
-import docsTutorialsArticles from '@/data/output/matrix/docs_tutorials.json';
-import examplesArticles from '@/data/output/matrix/examples.json';
-import includesArticles from '@/data/output/matrix/includes.json';
-import partnerArticles from '@/data/output/matrix/partners.json';
-import releaseArticles from '@/data/output/matrix/releases.json';
-import trainingArticles from '@/data/output/matrix/training.json';
+import { useEffect, useState } from 'react';
+import matrixIndex from '@/data/output/matrix/index.json';
 import {
   ArticleCategory,
   ArticleTranslation,
   TranslationStatusReport,
 } from '@/features/translations';
 
-const articles = {
-  blog: blogArticles,
-  caseStudy: caseStudiesArticles,
-  community: communityArticles,
-  examples: examplesArticles,
-  docsConcept: docsConceptsArticles,
-  docsContribute: docsContributionArticles,
-  docsTask: docsTasksArticles,
-  docsReference: docsReferenceArticles,
-  docsSetup: docsSetupArticles,
-  docsTutorial: docsTutorialsArticles,
-  includes: includesArticles,
-  partner: partnerArticles,
-  release: releaseArticles,
-  training: trainingArticles,
-} as Record<ArticleCategory, TranslationStatusReport>;
+interface MatrixIndex {
+  shardSize: number;
+  categories: {
+    category: string;
+    articles: number;
+    shards: string[];
+  }[];
+}
+
+const categoryFileNames: Record<ArticleCategory, string> = {
+  blog: 'blog',
+  caseStudy: 'case-studies',
+  community: 'community',
+  examples: 'examples',
+  docsConcept: 'docs_concepts',
+  docsContribute: 'docs_contribute',
+  docsTask: 'docs_tasks',
+  docsReference: 'docs_reference',
+  docsSetup: 'docs_setup',
+  docsTutorial: 'docs_tutorials',
+  includes: 'includes',
+  partner: 'partners',
+  release: 'releases',
+  training: 'training',
+};
+
+// Each shard is bundled as its own chunk and only downloaded when its category is shown.
+const shardModules = import.meta.glob<TranslationStatusReport>('@/data/output/matrix/*/*.json', {
+  import: 'default',
+});
+
+// Key the loaders by the shard paths listed in the index, e.g. matrix/blog/000.json
+const shardLoaders = new Map(
+  Object.entries(shardModules).map(([modulePath, load]) => [
+    modulePath.slice(modulePath.lastIndexOf('/output/') + '/output/'.length),
+    load,
+  ])
+);
+
+const loadedArticles = new Map<ArticleCategory, ArticleTranslation[]>();
+
+const getShardLoaders = (articleCategory: ArticleCategory) => {
+  const categoryIndex = (matrixIndex as MatrixIndex).categories.find(
+    ({ category }) => category === categoryFileNames[articleCategory]
+  );
+  return (categoryIndex?.shards ?? []).flatMap((shard) => {
+    const load = shardLoaders.get(shard);
+    return load ? [load] : [];
+  });
+};
 
 export const useFetchTranslationArticles = (
   articleCategory: ArticleCategory
 ): ArticleTranslation[] => {
-  return articles[articleCategory].articles;
+  const [articles, setArticles] = useState<ArticleTranslation[]>(
+    () => loadedArticles.get(articleCategory) ?? []
+  );
+
+  useEffect(() => {
+    const cached = loadedArticles.get(articleCategory);
+    if (cached) {
+      setArticles(cached);
+      return undefined;
+    }
+
+    let cancelled = false;
+    setArticles([]);
+
+    // Show the articles of the leading shards as soon as they arrive, keeping the shard order
+    const loaders = getShardLoaders(articleCategory);
+    const shardArticles: (ArticleTranslation[] | undefined)[] = loaders.map(() => undefined);
+    loaders.forEach((load, shardNumber) => {
+      load().then((report) => {
+        shardArticles[shardNumber] = report.articles;
+        const pending = shardArticles.indexOf(undefined);
+        const ready = (
+          pending === -1 ? shardArticles : shardArticles.slice(0, pending)
+        ) as ArticleTranslation[][];
+        const readyArticles = ready.flat();
+        if (pending === -1) {
+          loadedArticles.set(articleCategory, readyArticles);
+        }
+        if (!cancelled) {
+          setArticles(readyArticles);
+        }
+      });
+    });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [articleCategory]);
+
+  return articles;
 };